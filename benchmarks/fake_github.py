@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the parts of the GitHub REST and GraphQL APIs that
+create_github_project_mvp.py uses, for benchmarking without touching GitHub.
+
+State lives in memory. Latency, failures and rate limits are configurable,
+so the seeding pipeline can be measured under realistic and hostile
+conditions. Run it standalone or start it in-process with FakeGitHub.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+def _timestamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+class FakeGitHubConfig:
+    """Knobs for a FakeGitHub server.
+
+    latency / jitter: seconds added to every request (uniform +/- jitter).
+    item_error_rate: chance that one aliased GraphQL mutation fails.
+    server_error_rate: chance that a whole request answers 502.
+    lost_response_rate: chance that a write is applied but still answers 502, as when
+        GitHub times out after doing the work.
+    secondary_rate: chance that a write answers 403 with Retry-After (secondary limit).
+    rate_limit: requests allowed per rate_window seconds per resource (0: unlimited).
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, item_error_rate: float = 0.0,
+                 server_error_rate: float = 0.0, secondary_rate: float = 0.0,
+                 rate_limit: int = 0, rate_window: float = 60.0, seed: Optional[int] = None,
+                 lost_response_rate: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.item_error_rate = item_error_rate
+        self.server_error_rate = server_error_rate
+        self.secondary_rate = secondary_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.seed = seed
+        self.lost_response_rate = lost_response_rate
+
+
+class FakeGitHub:
+    """In-memory GitHub with labels (per repository), issues, sub-issues, dependencies and projects.
+
+    Issues of every repository share one numbering, which keeps node IDs unique.
+    """
+
+    def __init__(self, config: Optional[FakeGitHubConfig] = None, port: int = 0):
+        self.config = config or FakeGitHubConfig()
+        self.random = random.Random(self.config.seed)
+        self.lock = threading.Lock()
+        self.labels: Dict[str, Dict[str, str]] = {}  # repository -> label name -> node ID
+        self.issues: Dict[int, Dict] = {}
+        self.next_number = 1  # deleted issues keep their numbers, as on GitHub
+        self.milestones: Dict[int, Dict] = {}
+        self.projects: List[Dict] = []
+        self.items: Dict[str, str] = {}
+        self.values: Dict[Tuple[str, str], Any] = {}
+        self.calls: Dict[str, int] = {}
+        self.windows: Dict[str, Tuple[float, int]] = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self) -> "FakeGitHub":
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "calls": dict(self.calls),
+                "requests": sum(self.calls.values()),
+                "issues": len(self.issues),
+                "open_issues": sum(1 for issue in self.issues.values() if issue["state"] == "open"),
+                "sub_issues": sum(1 for issue in self.issues.values() if issue.get("parent")),
+                "blocked_by": sum(len(issue["blocked_by"]) for issue in self.issues.values()),
+                "milestones": len(self.milestones),
+                "project_items": len(self.items),
+                "project_values": len(self.values),
+            }
+
+    # Rate limits and faults
+
+    def _rate_headers(self, resource: str) -> Tuple[Dict[str, str], bool]:
+        """Count a request against its resource window; return headers and whether it is over the limit."""
+        limit = self.config.rate_limit or 5000
+        now = time.time()
+        with self.lock:
+            start, used = self.windows.get(resource, (now, 0))
+            if now - start >= self.config.rate_window:
+                start, used = now, 0
+            used += 1
+            self.windows[resource] = (start, used)
+        remaining = max(limit - used, 0)
+        headers = {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(int(start + self.config.rate_window) + 1),
+            "X-RateLimit-Resource": resource,
+        }
+        return headers, bool(self.config.rate_limit) and used > limit
+
+    def _roll(self, rate: float) -> bool:
+        with self.lock:
+            return rate > 0 and self.random.random() < rate
+
+    # REST
+
+    def _new_issue(self, title: str, body: Optional[str], labels: List[str], milestone: Optional[int] = None) -> Dict:
+        with self.lock:
+            number = self.next_number
+            self.next_number += 1
+            issue = {
+                "number": number,
+                "node_id": f"I_{number}",
+                "html_url": f"https://github.com/o/r/issues/{number}",
+                "title": title,
+                "body": body or "",
+                "state": "open",
+                "state_reason": None,
+                "labels": [{"name": label} for label in labels],
+                "milestone": milestone,
+                "parent": None,
+                "blocked_by": [],
+                "created_at": _timestamp(),
+                "updated_at": _timestamp(),
+            }
+            self.issues[number] = issue
+        return issue
+
+    def rest(self, method: str, path: str, query: Dict[str, List[str]], payload: Any) -> Tuple[int, Any, Dict[str, str]]:
+        parts = path.strip("/").split("/")
+        if parts[:1] == ["user"]:
+            return 200, {"login": "viewer"}, {}
+        if len(parts) < 4 or parts[0] != "repos":
+            return 404, {"message": "Not Found"}, {}
+        collection = parts[3]
+        repo_labels = self.labels.setdefault(f"{parts[1]}/{parts[2]}", {})
+        if collection == "labels" and method == "GET":
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("per_page", ["30"])[0])
+            with self.lock:
+                labels = [{"name": name, "node_id": node} for name, node in repo_labels.items()]
+            chunk = labels[(page - 1) * per_page:page * per_page]
+            headers = {}
+            if page * per_page < len(labels):
+                headers["Link"] = f'<{self.url}{path}?per_page={per_page}&page={page + 1}>; rel="next"'
+            return 200, chunk, headers
+        if collection == "labels" and method == "POST":
+            with self.lock:
+                if payload["name"] in repo_labels:
+                    return 422, {"message": "Validation Failed", "errors": [{"code": "already_exists"}]}, {}
+                repo_labels[payload["name"]] = f"LA_{payload['name']}"
+            return 201, {"name": payload["name"], "node_id": f"LA_{payload['name']}"}, {}
+        if collection == "labels" and method == "DELETE" and len(parts) == 5:
+            with self.lock:
+                repo_labels.pop(parts[4], None)
+            return 204, None, {}
+        if collection == "milestones" and method == "GET":
+            with self.lock:
+                milestones = list(self.milestones.values())
+            return 200, milestones, {}
+        if collection == "milestones" and method == "POST":
+            with self.lock:
+                number = max(self.milestones, default=0) + 1
+                milestone = {"number": number, "node_id": f"MI_{number}", "title": payload["title"],
+                             "description": payload.get("description", ""), "due_on": payload.get("due_on"),
+                             "state": payload.get("state", "open")}
+                self.milestones[number] = milestone
+            return 201, milestone, {}
+        if collection == "milestones" and method == "DELETE" and len(parts) == 5:
+            with self.lock:
+                self.milestones.pop(int(parts[4]), None)
+            return 204, None, {}
+        if collection == "issues" and method == "GET" and len(parts) == 4:
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("per_page", ["30"])[0])
+            state = query.get("state", ["open"])[0]
+            since = query.get("since", [""])[0]
+            with self.lock:
+                issues = [
+                    dict(issue) for _, issue in sorted(self.issues.items())
+                    if state in ("all", issue["state"]) and issue["updated_at"] >= since
+                ]
+            # Issue numbers follow creation order, so sort=created only needs the direction
+            if query.get("direction", ["asc"])[0] == "desc":
+                issues.reverse()
+            headers = {}
+            if page * per_page < len(issues):
+                params = {key: values[0] for key, values in query.items()}
+                params.update(per_page=per_page, page=page + 1)
+                headers["Link"] = f'<{self.url}{path}?{urlencode(params)}>; rel="next"'
+            return 200, issues[(page - 1) * per_page:page * per_page], headers
+        if collection == "issues" and method == "GET" and len(parts) == 5:
+            with self.lock:
+                issue = self.issues.get(int(parts[4]))
+            if issue is None:
+                return 404, {"message": "Not Found"}, {}
+            return 200, dict(issue), {}
+        if collection == "issues" and method == "POST" and len(parts) == 4:
+            labels = payload.get("labels") or []
+            issue = self._new_issue(payload["title"], payload.get("body"), labels, payload.get("milestone"))
+            return 201, issue, {}
+        if collection == "issues" and method == "PATCH" and len(parts) == 5:
+            with self.lock:
+                issue = self.issues.get(int(parts[4]))
+                if issue is None:
+                    return 404, {"message": "Not Found"}, {}
+                for key in ("title", "body", "state", "state_reason", "milestone"):
+                    if key in payload:
+                        issue[key] = payload[key]
+                if "labels" in payload:
+                    issue["labels"] = [{"name": label} for label in payload["labels"]]
+                issue["updated_at"] = _timestamp()
+            return 200, issue, {}
+        return 404, {"message": "Not Found"}, {}
+
+    # GraphQL
+
+    def _issue_node(self, issue: Dict) -> Dict:
+        return {
+            "id": issue["node_id"],
+            "number": issue["number"],
+            "url": issue["html_url"],
+            "title": issue["title"],
+            "body": issue["body"],
+            "state": issue["state"].upper(),
+            "stateReason": (issue["state_reason"] or "").upper() or None,
+            "labels": {"nodes": list(issue["labels"])},
+            "parent": {"id": issue["parent"]} if issue["parent"] else None,
+            "blockedBy": {"nodes": [{"id": blocker} for blocker in issue["blocked_by"]]},
+            "milestone": ({"number": issue["milestone"]} if issue.get("milestone") else None),
+        }
+
+    def _issue_by_id(self, node_id: str) -> Dict:
+        issue = self.issues.get(int(node_id[2:])) if node_id.startswith("I_") and node_id[2:].isdigit() else None
+        if issue is None:
+            raise ValueError(f"Could not resolve to a node with the global id of '{node_id}'")
+        return issue
+
+    def _project_node(self, project: Dict) -> Dict:
+        return {**project, "fields": {"nodes": project["fields"]}}
+
+    def _mutation(self, field: str, data: Dict) -> Dict:
+        """Apply one mutation field; raises ValueError with a GraphQL error message."""
+        with self.lock:
+            if field == "createIssue":
+                labels = [label_id[3:] for label_id in data.get("labelIds") or []]
+                milestone = data.get("milestoneId")
+                milestone = int(milestone[3:]) if milestone else None
+            elif field == "addSubIssue":
+                if set(data) - {"issueId", "subIssueId", "replaceParent", "clientMutationId"}:
+                    raise ValueError(f"AddSubIssueInput doesn't accept {sorted(set(data) - {'issueId', 'subIssueId'})}")
+                child = self._issue_by_id(data["subIssueId"])
+                self._issue_by_id(data["issueId"])
+                if child["parent"] and child["parent"] != data["issueId"] and not data.get("replaceParent"):
+                    raise ValueError("Sub issue may only have one parent")
+                child["parent"] = data["issueId"]
+                return {"clientMutationId": None, "issue": {"id": data["issueId"]}}
+            elif field == "addBlockedBy":
+                issue = self._issue_by_id(data["issueId"])
+                self._issue_by_id(data["blockingIssueId"])
+                if data["blockingIssueId"] not in issue["blocked_by"]:
+                    issue["blocked_by"].append(data["blockingIssueId"])
+                return {"clientMutationId": None, "issue": {"id": data["issueId"]}}
+            elif field in ("closeIssue", "deleteIssue"):
+                issue = self._issue_by_id(data["issueId"])
+                if field == "deleteIssue":
+                    del self.issues[issue["number"]]
+                else:
+                    issue["state"] = "closed"
+                    issue["state_reason"] = data.get("stateReason", "COMPLETED").lower()
+                return {"clientMutationId": None}
+            elif field == "addProjectV2ItemById":
+                item = self.items.setdefault(data["contentId"], f"PVTI_{data['contentId']}")
+                return {"clientMutationId": None, "item": {"id": item}}
+            elif field == "updateProjectV2ItemFieldValue":
+                self.values[(data["itemId"], data["fieldId"])] = data["value"]
+                return {"clientMutationId": None, "projectV2Item": {"id": data["itemId"]}}
+            elif field == "deleteProjectV2":
+                self.projects = [project for project in self.projects if project["id"] != data["projectId"]]
+                return {"clientMutationId": None}
+            else:
+                raise ValueError(f"Field '{field}' doesn't exist on type 'Mutation'")
+        issue = self._new_issue(data["title"], data.get("body"), labels, milestone)
+        return {"issue": {"id": issue["node_id"], "number": issue["number"], "url": issue["html_url"]}}
+
+    def graphql(self, query: str, variables: Dict) -> Dict:
+        data: Dict[str, Any] = {}
+        errors: List[Dict] = []
+        aliased = re.findall(r"(\w+): (\w+)\(input: \$(\w+)\)", query)
+        if aliased:
+            for alias, field, variable in aliased:
+                if self._roll(self.config.item_error_rate):
+                    data[alias] = None
+                    errors.append({"path": [alias], "message": "was submitted too quickly"})
+                    continue
+                try:
+                    data[alias] = self._mutation(field, variables[variable])
+                except ValueError as e:
+                    data[alias] = None
+                    errors.append({"path": [alias], "message": str(e)})
+        elif query.lstrip().startswith("mutation"):
+            match = re.search(r"\{\s*(\w+)\(input: \$(\w+)\)", query)
+            field, variable = match.group(1), match.group(2)
+            data[field] = self._project_mutation(field, variables[variable])
+        elif "__type(" in query:
+            fields = ["issueId", "subIssueId", "subIssueUrl", "replaceParent"]
+            data["__type"] = {"inputFields": [{"name": name} for name in fields]}
+        elif "repositoryOwner(" in query:
+            with self.lock:
+                nodes = [self._project_node(p) for p in self.projects if p["title"] == variables.get("title")]
+            data["repositoryOwner"] = {"id": "U_1", "projectsV2": {"nodes": nodes}}
+        elif "viewer" in query:
+            data["viewer"] = {"login": "viewer"}
+        elif "issues(first:" in query:
+            with self.lock:
+                issues = [self._issue_node(issue) for _, issue in sorted(self.issues.items())]
+            start = int(variables.get("after") or 0)
+            chunk = issues[start:start + variables["first"]]
+            end = start + len(chunk)
+            data["repository"] = {"issues": {
+                "pageInfo": {"hasNextPage": end < len(issues), "endCursor": str(end)}, "nodes": chunk
+            }}
+        elif "labels(first:" in query:
+            with self.lock:
+                labels = [{"name": name, "id": node} for name, node in
+                          self.labels.get(f"{variables['owner']}/{variables['name']}", {}).items()]
+            start = int(variables.get("after") or 0)
+            chunk = labels[start:start + 100]
+            end = start + len(chunk)
+            data["repository"] = {"labels": {
+                "pageInfo": {"hasNextPage": end < len(labels), "endCursor": str(end)}, "nodes": chunk
+            }}
+        elif re.search(r"i\d+: issue\(number:", query):
+            with self.lock:
+                data["repository"] = {
+                    alias: ({"id": f"I_{number}"} if int(number) in self.issues else None)
+                    for alias, number in re.findall(r"(i\d+): issue\(number: (\d+)\)", query)
+                }
+        elif "repository(" in query:
+            data["repository"] = {"id": "R_1"}
+        else:
+            errors.append({"message": f"unsupported query: {query[:80]}"})
+        if "rateLimit" in query:
+            data["rateLimit"] = {"cost": 1, "remaining": 4999, "resetAt": "2099-01-01T00:00:00Z"}
+        response: Dict[str, Any] = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return response
+
+    def _project_mutation(self, field: str, data: Dict) -> Optional[Dict]:
+        with self.lock:
+            if field == "createProjectV2":
+                number = len(self.projects) + 1
+                project = {
+                    "id": f"PVT_{number}", "number": number, "title": data["title"], "closed": False,
+                    "url": f"https://github.com/users/o/projects/{number}",
+                    "fields": [{"id": f"PVTF_{number}_Title", "name": "Title", "dataType": "TITLE"}],
+                }
+                self.projects.append(project)
+                return {"projectV2": self._project_node(project)}
+            if field == "createProjectV2Field":
+                project = next(p for p in self.projects if p["id"] == data["projectId"])
+                new = {"id": f"PVTF_{data['name']}", "name": data["name"], "dataType": data["dataType"]}
+                if data.get("singleSelectOptions"):
+                    new["options"] = [{"id": f"OPT_{o['name']}", "name": o["name"]} for o in data["singleSelectOptions"]]
+                if data.get("iterationConfiguration"):
+                    iterations = data["iterationConfiguration"]["iterations"]
+                    new["configuration"] = {"iterations": [
+                        {"id": f"IT_{i}", "title": it["title"], "startDate": it["startDate"]}
+                        for i, it in enumerate(iterations)
+                    ]}
+                project["fields"].append(new)
+                return {"projectV2Field": new}
+        return None
+
+    # HTTP plumbing
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, payload: Any, headers: Dict[str, str]):
+                body = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _serve(self, method: str):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"null")
+                is_graphql = url.path == "/graphql"
+                if is_graphql:
+                    field = re.search(r"(?:\w+: |\{\s*)(\w+)\(input:", payload["query"])
+                    operation = f"graphql {field.group(1) if field else 'query'}"
+                else:
+                    operation = f"{method} {re.sub(r'/[0-9]+', '/N', url.path)}"
+                with fake.lock:
+                    fake.calls[operation] = fake.calls.get(operation, 0) + 1
+
+                config = fake.config
+                if config.latency or config.jitter:
+                    with fake.lock:
+                        delay = config.latency + fake.random.uniform(-config.jitter, config.jitter)
+                    time.sleep(max(delay, 0.0))
+
+                headers, over_limit = fake._rate_headers("graphql" if is_graphql else "core")
+                if over_limit:
+                    return self._reply(403, {"message": "API rate limit exceeded"}, {**headers, "X-RateLimit-Remaining": "0"})
+                writes = method != "GET" and (not is_graphql or payload["query"].lstrip().startswith("mutation"))
+                if writes and fake._roll(config.secondary_rate):
+                    return self._reply(403, {"message": "You have exceeded a secondary rate limit."},
+                                       {**headers, "Retry-After": "1"})
+                if fake._roll(config.server_error_rate):
+                    return self._reply(502, {"message": "Server Error"}, headers)
+                lost = writes and fake._roll(config.lost_response_rate)
+
+                if is_graphql:
+                    response = fake.graphql(payload["query"], payload.get("variables") or {})
+                    if "rateLimit" in (response.get("data") or {}):
+                        response["data"]["rateLimit"]["remaining"] = int(headers["X-RateLimit-Remaining"])
+                    status, body, extra = 200, response, {}
+                else:
+                    status, body, extra = fake.rest(method, url.path, parse_qs(url.query), payload)
+                if lost:
+                    return self._reply(502, {"message": "Server Error"}, headers)
+                self._reply(status, body, {**headers, **extra})
+
+            def do_GET(self):
+                if self.path == "/__stats":
+                    return self._reply(200, fake.stats(), {})
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def do_PATCH(self):
+                self._serve("PATCH")
+
+            def do_DELETE(self):
+                self._serve("DELETE")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake GitHub API server for benchmarks.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--item-error-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--secondary-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0)
+    parser.add_argument("--lost-response-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    config = FakeGitHubConfig(args.latency_ms / 1000, args.jitter_ms / 1000, args.item_error_rate,
+                              args.server_error_rate, args.secondary_rate, args.rate_limit,
+                              lost_response_rate=args.lost_response_rate)
+    fake = FakeGitHub(config, args.port)
+    print(f"Fake GitHub listening on {fake.url}")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
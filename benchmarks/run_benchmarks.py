@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark the seeding pipeline against a local fake GitHub.
+
+Each scenario runs a full `seed` of the plan (issues, links, blocked-by
+relations and the project board) in its own process against a fresh
+FakeGitHub, with the fake gh CLI from benchmarks/bin first on PATH. It
+reports issues/sec, API calls per issue and p50/p95 latency per operation,
+taken from the script's own run report (--metrics-json).
+
+Usage:
+    python benchmarks/run_benchmarks.py                       # full matrix
+    python benchmarks/run_benchmarks.py -s http-batched --latency-ms 80 --jitter-ms 20
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json --tolerance 0.2
+
+With --baseline the run fails (exit status 1) when a scenario's issues/sec
+drops more than --tolerance below the baseline, or its calls per issue grow.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_github import FakeGitHub, FakeGitHubConfig  # noqa: E402
+
+# Flags shared by every scenario: no resume state, no cache, no pacing beyond the fake's limits
+COMMON_ARGS = ["seed", "--repo", "o/r", "--no-journal", "--no-plan-cache",
+               "--write-rate", "60000", "--sprint-start", "2030-01-07"]
+
+SCENARIOS = {
+    "gh-sequential": ["--transport", "gh", "--workers", "1"],
+    "gh-batched": ["--transport", "gh", "--workers", "8", "--batch-size", "20"],
+    "http-rest": ["--transport", "http", "--workers", "8"],
+    "http-batched": ["--transport", "http", "--workers", "8", "--batch-size", "20"],
+    "gh-async": ["--transport", "gh", "--workers", "8", "--batch-size", "20", "--async"],
+    "http-async": ["--transport", "http", "--workers", "8", "--batch-size", "20", "--async"],
+}
+
+
+def run_scenario(name: str, extra: List[str], config: FakeGitHubConfig, verbose: bool) -> Dict:
+    """Seed a fresh fake GitHub with one scenario and summarize its run report."""
+    fake = FakeGitHub(config).start()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            report_file = os.path.join(workdir, "metrics.json")
+            plan_file = os.path.join(REPO_DIR, "docs", "MVP_Sprint_Plan_with_Review.md")
+            command = [sys.executable, os.path.join(REPO_DIR, "create_github_project_mvp.py")] + COMMON_ARGS + [
+                "--plan-file", plan_file, "--metrics-json", report_file,
+                "--metrics-textfile", os.path.join(workdir, "metrics.prom"),
+            ] + extra
+            env = dict(os.environ, FAKE_GITHUB_URL=fake.url, GITHUB_API_URL=fake.url, GH_TOKEN="fake-token",
+                       PATH=os.path.join(BENCH_DIR, "bin") + os.pathsep + os.environ.get("PATH", ""))
+            result = subprocess.run(command, cwd=workdir, env=env, capture_output=not verbose, text=True)
+            if not os.path.exists(report_file):
+                raise RuntimeError(f"scenario {name} failed:\n{(result.stdout or '')[-2000:]}{result.stderr or ''}")
+            with open(report_file, encoding="utf-8") as f:
+                report = json.load(f)
+    finally:
+        fake.stop()
+
+    stats = fake.stats()
+    issues = stats["issues"]
+    elapsed = report["run"]["elapsed"]
+    calls = sum(report["counters"]["calls"].values())
+    return {
+        "scenario": name,
+        "args": extra,
+        "status": report["run"]["status"],
+        "elapsed": round(elapsed, 3),
+        "issues": issues,
+        "issues_per_sec": round(issues / elapsed, 2) if elapsed else 0.0,
+        "calls": calls,
+        "requests": stats["requests"],
+        "calls_per_issue": round(calls / issues, 3) if issues else 0.0,
+        "counters": report["counters"],
+        "server": stats,
+        "operations": {
+            operation: {
+                "count": histogram["count"],
+                "p50_ms": round(histogram["p50"] * 1000, 2),
+                "p95_ms": round(histogram["p95"] * 1000, 2),
+            }
+            for operation, histogram in report["operations"].items()
+        },
+    }
+
+
+def print_result(result: Dict):
+    print(f"\n{result['scenario']}: {result['issues']} issues in {result['elapsed']:.2f}s "
+          f"({result['issues_per_sec']:.1f} issues/s, {result['calls_per_issue']:.2f} calls/issue, "
+          f"{result['requests']} HTTP requests)")
+    print(f"  {'Operation':<14} {'Calls':>6} {'p50 ms':>9} {'p95 ms':>9}")
+    for operation, row in result["operations"].items():
+        print(f"  {operation:<14} {row['count']:>6} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f}")
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Return the regressions of results against a saved baseline run."""
+    previous = {result["scenario"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result["scenario"])
+        if not before:
+            continue
+        if result["issues_per_sec"] < before["issues_per_sec"] * (1 - tolerance):
+            regressions.append(f"{result['scenario']}: {result['issues_per_sec']:.1f} issues/s, "
+                               f"baseline {before['issues_per_sec']:.1f}")
+        if result["calls_per_issue"] > before["calls_per_issue"] + 0.01:
+            regressions.append(f"{result['scenario']}: {result['calls_per_issue']:.2f} calls/issue, "
+                               f"baseline {before['calls_per_issue']:.2f}")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark seeding against a local fake GitHub.")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run; repeat for several (default: all)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--item-error-rate", type=float, default=0.0,
+                        help="Chance that one aliased GraphQL mutation fails")
+    parser.add_argument("--server-error-rate", type=float, default=0.0, help="Chance of a 502 response")
+    parser.add_argument("--lost-response-rate", type=float, default=0.0,
+                        help="Chance that a write is applied but answers 502 anyway")
+    parser.add_argument("--secondary-rate", type=float, default=0.0,
+                        help="Chance that a write is refused by the secondary rate limit")
+    parser.add_argument("--rate-limit", type=int, default=0, metavar="N",
+                        help="Primary rate limit per resource per minute (default: unlimited)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the fake's faults")
+    parser.add_argument("--output", metavar="PATH", help="Write the results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed issues/sec drop against the baseline (default: 0.2)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show the script's output")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    config = FakeGitHubConfig(
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, item_error_rate=args.item_error_rate,
+        server_error_rate=args.server_error_rate, secondary_rate=args.secondary_rate,
+        rate_limit=args.rate_limit, seed=args.seed, lost_response_rate=args.lost_response_rate,
+    )
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        result = run_scenario(name, SCENARIOS[name], config, args.verbose)
+        print_result(result)
+        results.append(result)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "fake": {key: value for key, value in vars(config).items()},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("fake") != report["fake"]:
+            print("Warning: the baseline was recorded with different fake GitHub settings")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,35 @@ Create GitHub Project MVP with EPICs, User Stories, Sprints, and Tasks
 Uses GitHub CLI (gh) and GraphQL API to create issues with proper parent-child relationships.
 """
 
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import hashlib
+import os
+import queue
+import random
+import re
 import subprocess
 import json
 import time
 import sys
-from typing import Dict, List, Optional
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+from urllib.parse import quote
+
+try:
+    import requests
+except ImportError:  # only needed for --transport http
+    requests = None
+
+try:
+    import httpx
+except ImportError:  # only needed for --transport http --async
+    httpx = None
 
 # Color codes for output
 GREEN = '\033[92m'
@@ -17,1066 +41,3703 @@ RED = '\033[91m'
 BLUE = '\033[94m'
 RESET = '\033[0m'
 
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+
+DEFAULT_JOURNAL = ".github_project_journal.jsonl"
+PROJECT_TITLE = "Online Food Ordering System MVP"
+RELATION_BATCH_SIZE = 25  # aliased relation mutations (blocked-by, sub-issue) per GraphQL document
+PIPELINE_LINGER = 0.05  # seconds a pipeline stage waits for more items to fill a batch
+
+LABEL_COLORS = {
+    "epic": "3e4b9e",
+    "user-story": "0e8a16",
+    "sprint": "fbca04",
+    "task": "c5def5",
+    "P0": "b60205",
+    "P1": "d93f0b",
+}
+
+class CreatedIssue(NamedTuple):
+    """An issue as returned by the create call."""
+    number: int
+    id: str
+    url: str
+
+
+class Milestone(NamedTuple):
+    """A repository milestone: its number (REST) and node ID (GraphQL)."""
+    number: int
+    id: str
+
+
+class IssueSpec(NamedTuple):
+    """An issue to create: its plan key plus the fields sent to GitHub."""
+    key: str
+    title: str
+    body: str
+    labels: List[str]
+    milestone: Optional[Milestone] = None
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_METRICS_JSON = ".github_project_metrics.json"
+DEFAULT_METRICS_TEXTFILE = ".github_project_metrics.prom"
+METRICS_PREFIX = "github_project_seed"
+
+# Counter name -> (Prometheus help text, label name)
+METRIC_COUNTERS = {
+    "spawns": ("Processes spawned", "command"),
+    "calls": ("GitHub API calls sent", "api"),
+    "retries": ("Calls or items sent again", "reason"),
+    "rate_limit_waits": ("Times a call waited on the rate governor", "reason"),
+    "rate_limit_wait_seconds": ("Seconds spent waiting on the rate governor", "reason"),
+    "outcomes": ("Calls by final outcome", "outcome"),
+    "circuit_breaker": ("Circuit breaker state changes", "transition"),
+    "routes": ("Operations routed to REST or GraphQL", "route"),
+}
+
+# Upper bounds (seconds) of the operation latency histogram buckets
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class RunMetrics:
+    """Counters and per-operation latency histograms for one run.
+
+    Every process spawn, API call, retry and rate-limit wait is counted, and
+    API helpers time their operations (create, resolve, link, label, ...)
+    into fixed-bucket histograms, so memory does not grow with the run.
+    Thread-safe; one module-level instance, METRICS, is shared by the run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        # Run details included in the report (command, repository, transport, ...)
+        self.run: Dict[str, Any] = {}
+        # name -> label value -> amount
+        self.counters: Dict[str, Dict[str, float]] = {name: {} for name in METRIC_COUNTERS}
+        # operation -> {"buckets": [count per bucket, last is +Inf], "sum": s, "count": n, "max": s}
+        self.histograms: Dict[str, Dict[str, Any]] = {}
+
+    def count(self, name: str, label: str = "", amount: float = 1):
+        with self._lock:
+            values = self.counters[name]
+            values[label] = values.get(label, 0) + amount
+
+    def observe(self, operation: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.setdefault(
+                operation, {"buckets": [0] * (len(LATENCY_BUCKETS) + 1), "sum": 0.0, "count": 0, "max": 0.0}
+            )
+            bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+            histogram["buckets"][bucket] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+            histogram["max"] = max(histogram["max"], seconds)
+
+    @contextlib.contextmanager
+    def timer(self, operation: str):
+        """Time the enclosed block as one operation, whether or not it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(operation, time.perf_counter() - started)
+
+    def quantile(self, operation: str, q: float) -> float:
+        """Estimate a latency quantile from the histogram, interpolating within its bucket."""
+        histogram = self.histograms[operation]
+        rank = q * histogram["count"]
+        seen = 0
+        for i, count in enumerate(histogram["buckets"]):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+                upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else histogram["max"]
+                return min(lower + (upper - lower) * (rank - seen) / count, histogram["max"])
+            seen += count
+        return histogram["max"]
+
+    def report(self) -> Dict[str, Any]:
+        """The run report: run details, counters and a summary of every operation histogram."""
+        with self._lock:
+            counters = {name: dict(values) for name, values in self.counters.items()}
+            operations = {name: dict(histogram, buckets=list(histogram["buckets"]))
+                          for name, histogram in sorted(self.histograms.items())}
+        for name, histogram in operations.items():
+            histogram["p50"] = self.quantile(name, 0.50)
+            histogram["p95"] = self.quantile(name, 0.95)
+        return {
+            "run": dict(self.run, started=datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+                        elapsed=time.time() - self.started),
+            "counters": counters,
+            "operations": operations,
+            "bucket_bounds": list(LATENCY_BUCKETS),
+        }
+
+    def write_json(self, path: str, report: Dict[str, Any]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    def write_textfile(self, path: str, report: Dict[str, Any]):
+        """Write the report in Prometheus text format, e.g. for node_exporter's textfile collector.
+
+        The file is replaced atomically so a scrape never sees a partial report.
+        """
+        lines = [
+            f"# HELP {METRICS_PREFIX}_elapsed_seconds Wall time of the run",
+            f"# TYPE {METRICS_PREFIX}_elapsed_seconds gauge",
+            f"{METRICS_PREFIX}_elapsed_seconds {report['run']['elapsed']:.3f}",
+        ]
+        for name, (help_text, label) in METRIC_COUNTERS.items():
+            metric = f"{METRICS_PREFIX}_{name}" + ("" if name.endswith("_seconds") else "_total")
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for value, amount in sorted(report["counters"][name].items()):
+                lines.append(f'{metric}{{{label}="{value}"}} {amount:g}')
+        metric = f"{METRICS_PREFIX}_operation_seconds"
+        lines += [f"# HELP {metric} Latency of GitHub API operations", f"# TYPE {metric} histogram"]
+        for operation, histogram in report["operations"].items():
+            cumulative = 0
+            for bound, count in zip(list(LATENCY_BUCKETS) + ["+Inf"], histogram["buckets"]):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{operation="{operation}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{operation="{operation}"}} {histogram["sum"]:.6f}')
+            lines.append(f'{metric}_count{{operation="{operation}"}} {histogram["count"]}')
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temporary, path)
+
+
+METRICS = RunMetrics()
+
+
+def print_metrics(report: Dict[str, Any]):
+    """Print the --stats breakdown of a run report."""
+    run = report["run"]
+    print(f"\n{BLUE}Run statistics ({format_duration(run['elapsed'])}, status: {run.get('status', '?')}){RESET}")
+    for name, (help_text, _) in METRIC_COUNTERS.items():
+        values = report["counters"][name]
+        if values:
+            total = sum(values.values())
+            detail = ", ".join(f"{label}: {round(amount, 2):g}" for label, amount in sorted(values.items()))
+            print(f"  {help_text + ':':<45} {round(total, 2):>8g}  ({detail})")
+    if report["operations"]:
+        print(f"\n  {'Operation':<14} {'Calls':>6} {'Total':>9} {'p50':>8} {'p95':>8} {'Max':>8}")
+        for name, histogram in report["operations"].items():
+            print(f"  {name:<14} {histogram['count']:>6} {histogram['sum']:>8.1f}s "
+                  f"{histogram['p50'] * 1000:>6.0f}ms {histogram['p95'] * 1000:>6.0f}ms {histogram['max'] * 1000:>6.0f}ms")
+
+
+def _spawned(cmd: List[str]) -> str:
+    """Count a process spawn; returns its label (the gh subcommand, or the program)."""
+    label = cmd[1].lstrip("-") if cmd[0] == "gh" and len(cmd) > 1 else os.path.basename(cmd[0])
+    METRICS.count("spawns", label)
+    return label
+
+
+def run_command(cmd: List[str], check: bool = True, input: Optional[str] = None) -> subprocess.CompletedProcess:
+    """Run a shell command and return the result."""
+    try:
+        with METRICS.timer(f"spawn:{_spawned(cmd)}"):
+            result = subprocess.run(cmd, capture_output=True, text=True, check=check, input=input)
+        return result
+    except subprocess.CalledProcessError as e:
+        print(f"{RED}Error running command: {' '.join(cmd)}{RESET}")
+        print(f"{RED}Error: {e.stderr}{RESET}")
+        raise
+
+
+class GitHubError(Exception):
+    """A GitHub API call failed; uncertain when GitHub may have applied it anyway (a 5xx or lost response)."""
+
+    def __init__(self, message: str, status: Optional[int] = None, uncertain: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.uncertain = uncertain
+
+
+def get_auth_token() -> str:
+    """Return the GitHub token from GH_TOKEN/GITHUB_TOKEN, falling back to `gh auth token`."""
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+    return run_command(["gh", "auth", "token"]).stdout.strip()
+
+
+# Size assumed for a budget no response has reported yet (GitHub's hourly limit for a user token)
+ASSUMED_BUDGET = 5000
+
+
+class RateGovernor:
+    """Central throttle that every GitHub API call goes through.
+
+    Tracks the REST ("core") and GraphQL budgets from X-RateLimit-* headers
+    and the GraphQL rateLimit field, waits out exhausted budgets and
+    Retry-After periods, and paces writes with a token bucket so content
+    creation stays under GitHub's secondary rate limits. route() uses the
+    same budgets to pick REST or GraphQL for operations both can serve.
+    cancel() stops the run: every waiting or later call raises
+    KeyboardInterrupt in its own thread.
+    """
+
+    def __init__(self, writes_per_minute: float = 80.0, burst: int = 10, reserve: int = 50):
+        self._lock = threading.Lock()
+        self.rate = writes_per_minute / 60.0
+        self.burst = burst
+        self.reserve = reserve
+        self.tokens = float(burst)
+        self._refilled = time.monotonic()
+        self.blocked_until = 0.0
+        # resource -> {"remaining": int, "reset": epoch seconds, "limit": int}
+        self.budgets: Dict[str, Dict[str, float]] = {}
+        self.graphql_cost = 0
+        self.waited = 0.0
+        self._announced = 0.0
+        self._cancelled = threading.Event()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def cancel(self):
+        """Refuse every call from now on, waking the ones that wait."""
+        self._cancelled.set()
+
+    def sleep(self, seconds: float):
+        """Wait like time.sleep(), raising KeyboardInterrupt as soon as the run is cancelled."""
+        if self._cancelled.wait(seconds):
+            raise KeyboardInterrupt
+
+    def acquire(self, resource: str, writes: int = 0):
+        """Block until a call against resource (and its writes) may go out."""
+        waited, first_reason = 0.0, None
+        while True:
+            if self._cancelled.is_set():
+                raise KeyboardInterrupt
+            with self._lock:
+                now = time.time()
+                wait, reason = self.blocked_until - now, "retry-after"
+                budget = self.budgets.get(resource)
+                if wait <= 0 and budget and budget["remaining"] <= self.reserve and budget["reset"] > now:
+                    wait, reason = budget["reset"] - now, f"{resource} budget exhausted"
+                if wait <= 0 and writes:
+                    self._refill()
+                    needed = min(writes, self.burst)
+                    if self.tokens < needed:
+                        wait, reason = (needed - self.tokens) / self.rate, None
+                if wait <= 0:
+                    self.tokens -= writes
+                    if budget:
+                        budget["remaining"] -= 1
+                    break
+                self.waited += wait
+                waited += wait
+                first_reason = first_reason or reason or "write pacing"
+                # Announce each distinct wait once, not once per worker
+                announce = reason and abs(now + wait - self._announced) > 1.0
+                if announce:
+                    self._announced = now + wait
+            if announce:
+                print(f"{YELLOW}⏳ Rate limit ({reason}): waiting {wait:.1f}s{RESET}")
+            self.sleep(wait)
+        if waited:
+            METRICS.count("rate_limit_waits", first_reason)
+            METRICS.count("rate_limit_wait_seconds", first_reason, waited)
+
+    def headroom(self, resource: str) -> float:
+        """Calls (core) or points (graphql) left in resource's budget above the reserve."""
+        with self._lock:
+            budget = self.budgets.get(resource)
+            if not budget or "remaining" not in budget:
+                return float(ASSUMED_BUDGET - self.reserve)
+            if budget["reset"] <= time.time():
+                return float((budget.get("limit") or ASSUMED_BUDGET) - self.reserve)
+            return float(budget["remaining"] - self.reserve)
+    
+    def route(self, costs: Dict[str, float]) -> str:
+        """Pick the resource to spend an operation on, from costs: resource -> what it costs there.
+
+        The resource whose headroom the operation would drain least, as a
+        share, wins, so both its cost and the budget left count. A resource
+        that cannot afford the operation is only picked when none can; ties
+        go to the first resource listed.
+        """
+        def score(resource: str) -> Tuple[bool, float]:
+            room = self.headroom(resource)
+            if room < costs[resource]:
+                return True, -room
+            return False, costs[resource] / room
+        
+        return min(costs, key=score)
+    
+    def block(self, seconds: float):
+        """Hold back every call for the given number of seconds."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+    def observe(self, headers: Dict[str, str], status: int = 200, body: str = "") -> float:
+        """Record a response's rate-limit headers.
+
+        Returns how long to wait before retrying when the response was
+        rejected by a rate limit, otherwise 0.
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
+        now = time.time()
+        if "x-ratelimit-remaining" in headers:
+            resource = headers.get("x-ratelimit-resource", "core")
+            with self._lock:
+                self.budgets[resource] = {
+                    "remaining": int(headers["x-ratelimit-remaining"]),
+                    "reset": float(headers.get("x-ratelimit-reset", now)),
+                    "limit": int(headers.get("x-ratelimit-limit", 0)),
+                }
+        if status not in (403, 429):
+            return 0.0
+        if "retry-after" in headers:
+            retry = float(headers["retry-after"])
+        elif headers.get("x-ratelimit-remaining") == "0":
+            retry = max(float(headers.get("x-ratelimit-reset", now)) - now, 1.0)
+        elif status == 429 or "rate limit" in body.lower():
+            retry = 60.0  # secondary limit without Retry-After: wait at least a minute
+        else:
+            return 0.0
+        self.block(retry)
+        return retry
+
+    def observe_graphql(self, rate_limit: Dict):
+        """Record the rateLimit { cost remaining resetAt } block of a GraphQL response."""
+        reset = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+        with self._lock:
+            self.graphql_cost += rate_limit.get("cost", 0)
+            budget = self.budgets.setdefault("graphql", {"limit": 0})
+            budget.update({"remaining": rate_limit["remaining"], "reset": reset})
+
+
+RATE_LIMIT_RETRIES = 3
+
+# Responses and failures worth sending again: GitHub's transient server errors and network trouble
+RETRYABLE_STATUSES = {500, 502, 503, 504}
+NETWORK_ERROR = re.compile(r"network error|timed? ?out|timeout|connection|reset by peer|EOF|temporar", re.IGNORECASE)
+# Network failures that happen before a request reaches GitHub, so even a create can be sent again
+NOT_SENT_ERROR = re.compile(
+    r"connection refused|failed to establish|name resolution|no such host|connect ?timeout|connecterror",
+    re.IGNORECASE
+)
+NETWORK_EXCEPTIONS = (OSError,) + tuple(
+    error for error in (requests and requests.RequestException, httpx and httpx.TransportError) if error
+)
+
+
+class RetryPolicy:
+    """Central retry layer around every GitHub API call.
+
+    Each failed attempt is classified: rate limits are waited out by the
+    governor, transient failures (5xx, network errors) are retried after a
+    capped exponential backoff with full jitter, and anything else (4xx) is
+    fatal and returned at once. Calls that are not idempotent (creating an
+    issue) are only retried when they cannot have reached GitHub: a 5xx or
+    a lost response may hide a write that happened, so it is returned at
+    once for the caller to check. A circuit breaker watches the last window
+    calls; when at least threshold of them failed it opens and every call
+    waits cooldown seconds, then a single probe call decides whether to
+    close it or reopen with twice the cooldown. Outcomes go to METRICS.
+    """
+
+    def __init__(self, governor: RateGovernor, attempts: int = 5, base: float = 1.0, cap: float = 30.0,
+                 window: int = 20, threshold: float = 0.5, cooldown: float = 15.0, max_cooldown: float = 120.0):
+        self.governor = governor
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=window)  # True for each failed call
+        self._open_until: Optional[float] = None
+        self._open_for = cooldown
+        self._probe: Optional[int] = None
+
+    def classify(self, status: int, body: str) -> Optional[str]:
+        """Why a failed attempt is worth retrying, or None when it is fatal."""
+        if status in RETRYABLE_STATUSES:
+            return "server error"
+        if status == 0 and NETWORK_ERROR.search(body):
+            return "network"
+        return None
+
+    @staticmethod
+    def uncertain(status: int, body: str) -> bool:
+        """Whether a failed attempt may still have been applied by GitHub."""
+        return status in RETRYABLE_STATUSES or (status == 0 and not NOT_SENT_ERROR.search(body))
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before the given retry: full jitter over a capped exponential."""
+        return random.uniform(0, min(self.cap, self.base * 2 ** (attempt - 1)))
+
+    def _wait_for_circuit(self):
+        """Block while the breaker is open; once its cooldown ends, let one probe call through."""
+        while True:
+            with self._lock:
+                if self._open_until is None:
+                    return
+                wait = self._open_until - time.monotonic()
+                if wait <= 0 and self._probe is None:
+                    self._probe = threading.get_ident()
+                    return
+            self.governor.sleep(max(wait, 0.1))
+
+    def _record(self, failed: Optional[bool]):
+        """Feed the breaker one call's result (None: the call was abandoned)."""
+        with self._lock:
+            if self._probe == threading.get_ident():
+                self._probe = None
+                if failed is None:
+                    return
+                if failed:
+                    self._open_for = min(self._open_for * 2, self.max_cooldown)
+                    self._open_until = time.monotonic() + self._open_for
+                    print(f"{YELLOW}⚡ GitHub still failing; circuit breaker stays open for {self._open_for:.0f}s{RESET}")
+                    return
+                self._open_until, self._open_for = None, self.cooldown
+                self._recent.clear()
+                METRICS.count("circuit_breaker", "closed")
+                print(f"{GREEN}✓ GitHub is answering again; circuit breaker closed{RESET}")
+                return
+            if failed is None:
+                return
+            self._recent.append(failed)
+            tripped = (self._open_until is None and len(self._recent) == self._recent.maxlen
+                       and sum(self._recent) >= self.threshold * len(self._recent))
+            if tripped:
+                self._open_until = time.monotonic() + self._open_for
+                METRICS.count("circuit_breaker", "opened")
+        if tripped:
+            print(f"{YELLOW}⚡ Too many failing GitHub calls; circuit breaker open, pausing {self._open_for:.0f}s{RESET}")
+
+    def call(self, attempt: Callable[[], Tuple], idempotent: bool = True) -> Tuple:
+        """Run attempt() until it succeeds, fails fatally or runs out of attempts.
+
+        attempt() sends one request and returns a tuple starting with the
+        HTTP status (0 when nothing came back), the response headers and
+        the body or error text; the last attempt's tuple is returned. With
+        idempotent=False an uncertain() failure is not sent again.
+        """
+        for number in range(1, self.attempts + 1):
+            self._wait_for_circuit()
+            try:
+                result = attempt()
+            except BaseException:
+                self._record(None)
+                raise
+            status, headers, body = result[:3]
+            if self.governor.observe(headers, status, body):
+                # Waited out by the governor; says nothing about GitHub's health
+                reason = "rate limit"
+                self._record(None)
+            else:
+                reason = self.classify(status, body) if status == 0 or status >= 500 else None
+                self._record(reason is not None)
+            if reason and reason != "rate limit" and not idempotent and self.uncertain(status, body):
+                METRICS.count("outcomes", "uncertain")
+                return result
+            if not reason:
+                if status == 0 or status >= 400:
+                    METRICS.count("outcomes", "fatal")
+                else:
+                    METRICS.count("outcomes", "ok" if number == 1 else "recovered")
+                return result
+            if number == self.attempts:
+                break
+            METRICS.count("retries", reason)
+            if reason != "rate limit":
+                self.governor.sleep(self.backoff(number))
+        METRICS.count("outcomes", "gave up")
+        return result
+
+
+def _is_mutation(query: str) -> bool:
+    return query.lstrip().startswith("mutation")
+
+
+def _with_rate_limit(query: str) -> str:
+    """Add rateLimit { cost remaining resetAt } to a GraphQL query document."""
+    if _is_mutation(query) or "rateLimit" in query:
+        return query
+    end = query.rstrip().rfind("}")
+    return query[:end] + "  rateLimit { cost remaining resetAt }\n" + query[end:]
+
+
+def _graphql_rate_limited(data: Dict) -> bool:
+    return any(error.get("type") == "RATE_LIMITED" for error in data.get("errors") or [])
+
+
+def _parse_included(output: str) -> Tuple[int, Dict[str, str], str]:
+    """Split `gh api --include` output into status, headers and body."""
+    output = output.replace("\r\n", "\n")
+    head, _, body = output.partition("\n\n")
+    lines = head.splitlines()
+    status = int(lines[0].split()[1]) if lines and lines[0].startswith("HTTP") else 0
+    headers = {}
+    for line in lines[1:]:
+        key, _, value = line.partition(":")
+        headers[key.strip()] = value.strip()
+    return status, headers, body
+
+
+class Transport:
+    """Base for the ways of reaching GitHub: rest(), paginate(), graphql() and cli()."""
+
+    name = ""
+
+    def cli(self, args: List[str], check: bool = True) -> subprocess.CompletedProcess:
+        """Run a gh command that has no API call in this script (e.g. gh repo view)."""
+        return self._run(["gh"] + args, check=check)
+
+    def _run(self, cmd: List[str], check: bool = True, input: Optional[str] = None) -> subprocess.CompletedProcess:
+        """Run a process; the async transports multiplex these on an event loop."""
+        return run_command(cmd, check=check, input=input)
+
+
+class GhTransport(Transport):
+    """Transport that spawns the gh CLI for every GitHub API call."""
+
+    name = "gh"
+
+    def __init__(self, governor: Optional[RateGovernor] = None, retry: Optional[RetryPolicy] = None):
+        self.governor = governor or RateGovernor()
+        self.retry = retry or RetryPolicy(self.governor)
+
+    def _api(self, args: List[str], resource: str, writes: int, payload: Optional[Dict],
+             idempotent: bool = True) -> Tuple[int, str]:
+        """Run `gh api` through the retry policy; return the HTTP status and body."""
+        stdin = json.dumps(payload) if payload is not None else None
+        
+        def attempt() -> Tuple[int, Dict[str, str], str]:
+            self.governor.acquire(resource, writes)
+            METRICS.count("calls", "graphql" if resource == "graphql" else "rest")
+            result = self._run(["gh", "api", "--include"] + args, check=False, input=stdin)
+            status, headers, body = _parse_included(result.stdout)
+            return status, headers, (body + result.stderr if status >= 400 or not status else body)
+        
+        status, _, body = self.retry.call(attempt, idempotent)
+        uncertain = not idempotent and self.retry.uncertain(status, body)
+        if not status:
+            raise GitHubError(f"gh api {' '.join(args)} failed: {body.strip()[:200]}", uncertain=uncertain)
+        if status >= 400:
+            raise GitHubError(f"gh api {' '.join(args)} failed: {status} {body.strip()[:200]}", status, uncertain)
+        return status, body
+
+    def rest(self, method: str, path: str, payload: Optional[Dict] = None, idempotent: bool = True) -> Any:
+        """Call a REST endpoint and return the decoded JSON response.
+
+        idempotent=False (creating an issue) sends the call again only when
+        it cannot have reached GitHub; see RetryPolicy.
+        """
+        args = ["-X", method, path]
+        if payload is not None:
+            args.extend(["--input", "-"])
+        _, body = self._api(args, "core", 0 if method == "GET" else 1, payload, idempotent)
+        return json.loads(body) if body.strip() else None
+
+    def paginate(self, path: str) -> Iterator[Dict]:
+        """Yield every item of a paginated REST list endpoint."""
+        def attempt() -> Tuple[int, Dict[str, str], str, subprocess.CompletedProcess]:
+            self.governor.acquire("core")
+            METRICS.count("calls", "rest")
+            result = self._run(["gh", "api", "--paginate", path, "--jq", ".[]"], check=False)
+            if result.returncode == 0:
+                return 200, {}, "", result
+            # Without --include the status is only in gh's error message ("... (HTTP 502)")
+            status = re.search(r"HTTP (\d{3})", result.stderr)
+            return int(status.group(1)) if status else 0, {}, result.stderr, result
+        
+        status, _, error, result = self.retry.call(attempt)
+        if status != 200:
+            raise GitHubError(f"GET {path} failed: {error.strip()}", status or None)
+        for line in result.stdout.splitlines():
+            if line.strip():
+                yield json.loads(line)
+
+    def graphql(self, query: str, variables: Optional[Dict] = None, writes: Optional[int] = None,
+                idempotent: bool = True) -> Dict:
+        """Run a GraphQL document and return the full response (data and errors).
+
+        writes is the number of content writes the document performs, used
+        for pacing; it defaults to 1 for mutations and 0 for queries.
+        idempotent is as for rest().
+        """
+        if writes is None:
+            writes = 1 if _is_mutation(query) else 0
+        payload = {"query": _with_rate_limit(query), "variables": variables or {}}
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            _, body = self._api(["graphql", "--input", "-"], "graphql", writes, payload, idempotent)
+            try:
+                data = json.loads(body)
+            except json.JSONDecodeError:
+                raise GitHubError(f"GraphQL request failed: {body.strip()[:200]}")
+            if _graphql_rate_limited(data) and attempt < RATE_LIMIT_RETRIES:
+                METRICS.count("retries", "graphql rate limited")
+                self.governor.block(60.0)
+                continue
+            return _take_rate_limit(data, self.governor)
+
+
+def _take_rate_limit(data: Dict, governor: RateGovernor) -> Dict:
+    """Strip the injected rateLimit field from a GraphQL response and record it."""
+    rate_limit = (data.get("data") or {}).pop("rateLimit", None)
+    if rate_limit:
+        governor.observe_graphql(rate_limit)
+    return data
+
+
+class HttpTransport(Transport):
+    """Transport that talks to the GitHub API over one pooled keep-alive requests.Session."""
+
+    name = "http"
+
+    def __init__(self, token: str, base_url: str = GITHUB_API_URL, pool_size: int = 10,
+                 governor: Optional[RateGovernor] = None, retry: Optional[RetryPolicy] = None):
+        self.governor = governor or RateGovernor()
+        self.retry = retry or RetryPolicy(self.governor)
+        self.base_url = base_url.rstrip("/")
+        self.http = self._open({
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }, pool_size)
+
+    def _open(self, headers: Dict[str, str], pool_size: int):
+        """Create the keep-alive client the requests go through."""
+        if requests is None:
+            raise RuntimeError("The http transport requires the 'requests' package (pip install -r requirements.txt)")
+        http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        http.mount("https://", adapter)
+        http.mount("http://", adapter)
+        http.headers.update(headers)
+        return http
+
+    def _send(self, method: str, url: str, payload: Optional[Dict] = None):
+        return self.http.request(method, url, json=payload, timeout=30)
+
+    def _request(self, method: str, url: str, payload: Optional[Dict] = None,
+                 resource: str = "core", writes: int = 0, idempotent: bool = True):
+        def attempt() -> Tuple[int, Dict[str, str], str, Any]:
+            self.governor.acquire(resource, writes)
+            METRICS.count("calls", "graphql" if resource == "graphql" else "rest")
+            try:
+                response = self._send(method, url, payload)
+            except NETWORK_EXCEPTIONS as e:
+                return 0, {}, f"network error: {type(e).__name__}: {e}", None
+            return (response.status_code, response.headers,
+                    response.text if response.status_code >= 400 else "", response)
+        
+        status, _, error, response = self.retry.call(attempt, idempotent)
+        uncertain = not idempotent and self.retry.uncertain(status, error)
+        if not status:
+            raise GitHubError(f"{method} {url} failed: {error[:200]}", uncertain=uncertain)
+        if status >= 400:
+            raise GitHubError(f"{method} {url} failed: {status} {error[:200]}", status, uncertain)
+        return response
+
+    def rest(self, method: str, path: str, payload: Optional[Dict] = None, idempotent: bool = True) -> Any:
+        """Call a REST endpoint and return the decoded JSON response.
+
+        idempotent=False (creating an issue) sends the call again only when
+        it cannot have reached GitHub; see RetryPolicy.
+        """
+        response = self._request(method, f"{self.base_url}/{path.lstrip('/')}", payload,
+                                 writes=0 if method == "GET" else 1, idempotent=idempotent)
+        return response.json() if response.content else None
+
+    def paginate(self, path: str) -> Iterator[Dict]:
+        """Yield every item of a paginated REST list endpoint."""
+        separator = "&" if "?" in path else "?"
+        url = f"{self.base_url}/{path.lstrip('/')}{separator}per_page=100"
+        while url:
+            response = self._request("GET", url)
+            yield from response.json()
+            url = response.links.get("next", {}).get("url")
+
+    def graphql(self, query: str, variables: Optional[Dict] = None, writes: Optional[int] = None,
+                idempotent: bool = True) -> Dict:
+        """Run a GraphQL document and return the full response (data and errors).
+
+        writes is the number of content writes the document performs, used
+        for pacing; it defaults to 1 for mutations and 0 for queries.
+        idempotent is as for rest().
+        """
+        if writes is None:
+            writes = 1 if _is_mutation(query) else 0
+        payload = {"query": _with_rate_limit(query), "variables": variables or {}}
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            response = self._request("POST", f"{self.base_url}/graphql", payload, "graphql", writes, idempotent)
+            data = response.json()
+            if _graphql_rate_limited(data) and attempt < RATE_LIMIT_RETRIES:
+                METRICS.count("retries", "graphql rate limited")
+                self.governor.block(60.0)
+                continue
+            return _take_rate_limit(data, self.governor)
+
+
+async def run_command_async(cmd: List[str], input: Optional[str] = None) -> subprocess.CompletedProcess:
+    """asyncio counterpart of run_command(check=False); a cancelled call kills the process."""
+    operation, started = f"spawn:{_spawned(cmd)}", time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await process.communicate(input.encode() if input is not None else None)
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+        raise
+    METRICS.observe(operation, time.perf_counter() - started)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout.decode(), stderr.decode())
+
+
+class AsyncRunner:
+    """Runs the transports' I/O on one asyncio event loop.
+
+    The pipeline's threads call in as before and wait for the result, but
+    every gh process and HTTP request is multiplexed on the loop owned by
+    asyncio.run() in main. A semaphore per pipeline stage (taken from
+    stage(), evaluated in the calling thread) bounds that stage's calls in
+    flight. cancel() refuses new calls, which then raise KeyboardInterrupt,
+    but lets the ones in flight finish: a create GitHub has already applied
+    still reaches its thread and gets journaled, as in the threaded path.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, in_flight: int = 32):
+        self.loop = loop
+        self.in_flight = in_flight
+        self.stage: Callable[[], str] = lambda: "setup"
+        self.cancelled = False
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._closers: List[Callable[[], Any]] = []
+
+    async def _in_stage(self, stage: str, function: Callable, args: Tuple, kwargs: Dict) -> Any:
+        # create:<kind> and relate:<kind> share their half of the pipeline's limit
+        semaphore = self._semaphores.setdefault(stage.split(":")[0], asyncio.Semaphore(self.in_flight))
+        async with semaphore:
+            # Calls still queued for a slot when Ctrl-C came are refused, not sent
+            if self.cancelled:
+                raise asyncio.CancelledError()
+            return await function(*args, **kwargs)
+
+    def call(self, function: Callable, *args, **kwargs) -> Any:
+        """Run the coroutine function on the loop from a worker thread and wait for its result."""
+        if self.cancelled:
+            raise KeyboardInterrupt
+        future = asyncio.run_coroutine_threadsafe(self._in_stage(self.stage(), function, args, kwargs), self.loop)
+        try:
+            return future.result()
+        except concurrent.futures.CancelledError:
+            raise KeyboardInterrupt from None
+
+    def run_command(self, cmd: List[str], check: bool = True, input: Optional[str] = None) -> subprocess.CompletedProcess:
+        """Blocking run_command() whose process runs on the event loop."""
+        result = self.call(run_command_async, cmd, input)
+        if check and result.returncode != 0:
+            print(f"{RED}Error running command: {' '.join(cmd)}{RESET}")
+            print(f"{RED}Error: {result.stderr}{RESET}")
+            raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+        return result
+
+    def on_close(self, closer: Callable[[], Any]):
+        """Register a coroutine function to await when the run ends (e.g. closing an HTTP client)."""
+        self._closers.append(closer)
+
+    def cancel(self):
+        """Refuse new calls; the ones in flight run to completion."""
+        self.cancelled = True
+
+    async def aclose(self):
+        for closer in self._closers:
+            await closer()
+
+
+class AsyncGhTransport(GhTransport):
+    """GhTransport whose gh processes are spawned with asyncio.create_subprocess_exec."""
+
+    name = "gh-async"
+
+    def __init__(self, runner: AsyncRunner, governor: Optional[RateGovernor] = None,
+                 retry: Optional[RetryPolicy] = None):
+        super().__init__(governor, retry)
+        self.runner = runner
+
+    def _run(self, cmd: List[str], check: bool = True, input: Optional[str] = None) -> subprocess.CompletedProcess:
+        return self.runner.run_command(cmd, check, input)
+
+
+class AsyncHttpTransport(HttpTransport):
+    """HttpTransport over an httpx.AsyncClient driven by the runner's event loop."""
+
+    name = "http-async"
+
+    def __init__(self, token: str, runner: AsyncRunner, base_url: str = GITHUB_API_URL,
+                 pool_size: int = 10, governor: Optional[RateGovernor] = None,
+                 retry: Optional[RetryPolicy] = None):
+        self.runner = runner
+        super().__init__(token, base_url, pool_size, governor, retry)
+
+    def _open(self, headers: Dict[str, str], pool_size: int):
+        if httpx is None:
+            raise RuntimeError("The async http transport requires the 'httpx' package (pip install httpx)")
+        http = httpx.AsyncClient(headers=headers, timeout=30, limits=httpx.Limits(max_connections=pool_size))
+        self.runner.on_close(http.aclose)
+        return http
+
+    def _send(self, method: str, url: str, payload: Optional[Dict] = None):
+        return self.runner.call(self.http.request, method, url, json=payload)
+
+    def _run(self, cmd: List[str], check: bool = True, input: Optional[str] = None) -> subprocess.CompletedProcess:
+        return self.runner.run_command(cmd, check, input)
+
+
+# Rough per-call latencies used by --dry-run to estimate wall time (seconds)
+DRY_RUN_LATENCY = {
+    "spawn": 0.25,        # gh process startup and auth loading
+    "rest": 0.35,
+    "graphql": 0.45,
+    "graphql_item": 0.12,  # each extra aliased mutation in a batched document
+}
+
+DRY_RUN_COUNTERS = ["spawns", "rest", "graphql", "points", "writes"]
+
+
+class DryRunTransport(Transport):
+    """Stand-in transport for --dry-run that answers like an empty repository.
+
+    The normal pipeline runs unchanged, nothing reaches GitHub, and every
+    call is tallied against the pipeline stage reported by stage(). backend
+    is the transport being estimated ("gh" spawns a process per call).
+    """
+
+    name = "dry-run"
+
+    def __init__(self, backend: str, stage: Callable[[], str]):
+        self.backend = backend
+        self.stage = stage
+        self._lock = threading.Lock()
+        self._next_number = 1
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _count(self, kind: str, writes: int = 0, items: int = 1):
+        """Tally one call; kind is "spawn" (a plain gh command), "rest" or "graphql"."""
+        with self._lock:
+            stats = self.stats.setdefault(self.stage(), {key: 0 for key in DRY_RUN_COUNTERS + ["latency"]})
+            latency = 0.0
+            if kind == "spawn" or self.backend == "gh":
+                stats["spawns"] += 1
+                latency += DRY_RUN_LATENCY["spawn"]
+            if kind != "spawn":
+                stats[kind] += 1
+                latency += DRY_RUN_LATENCY[kind] + DRY_RUN_LATENCY["graphql_item"] * (items - 1)
+            if kind == "graphql":
+                stats["points"] += 1
+            stats["writes"] += writes
+            stats["latency"] += latency
+
+    def _new_issue(self) -> Dict:
+        with self._lock:
+            number = self._next_number
+            self._next_number += 1
+        return {"number": number, "id": f"DRY_I_{number}", "url": f"https://github.com/dry-run/issues/{number}"}
+
+    def cli(self, args: List[str], check: bool = True) -> subprocess.CompletedProcess:
+        self._count("spawn")
+        if args[:2] == ["repo", "view"]:
+            stdout = json.dumps({"owner": {"login": "dry-run"}, "name": "repo", "id": "DRY_R"})
+            return subprocess.CompletedProcess(["gh"] + args, 0, stdout, "")
+        return subprocess.CompletedProcess(["gh"] + args, 1, "", "dry run")
+
+    def rest(self, method: str, path: str, payload: Optional[Dict] = None, idempotent: bool = True) -> Any:
+        self._count("rest", writes=0 if method == "GET" else 1)
+        if path.endswith("/labels"):
+            return {"name": payload["name"], "node_id": f"DRY_LA_{payload['name']}"}
+        if path.endswith("/issues") and method == "POST":
+            issue = self._new_issue()
+            return {"number": issue["number"], "node_id": issue["id"], "html_url": issue["url"], **payload}
+        if path.endswith("/milestones") and method == "POST":
+            number = self._new_issue()["number"]
+            return {"number": number, "node_id": f"DRY_MI_{number}", **payload}
+        return payload
+
+    def paginate(self, path: str) -> Iterator[Dict]:
+        self._count("rest")
+        return iter([])
+
+    def graphql(self, query: str, variables: Optional[Dict] = None, writes: Optional[int] = None,
+                idempotent: bool = True) -> Dict:
+        mutations = re.findall(r"(\w+): (\w+)\(input: ", query)
+        creates = [alias for alias, field in mutations if field == "createIssue"]
+        lookups = re.findall(r"(i(\d+)): issue\(number: \d+\)", query)
+        if writes is None:
+            writes = 1 if _is_mutation(query) else 0
+        self._count("graphql", writes=writes, items=max(len(mutations), 1))
+        if creates:
+            return {"data": {alias: {"issue": self._new_issue()} for alias in creates}}
+        if mutations:
+            return {"data": {alias: {"clientMutationId": None, "item": {"id": f"DRY_PVTI_{alias}"}}
+                             for alias, _ in mutations}}
+        if lookups:
+            return {"data": {"repository": {alias: {"id": f"DRY_I_{number}"} for alias, number in lookups}}}
+        if "repositoryOwner(" in query:
+            return {"data": {"repositoryOwner": {"id": "DRY_O", "projectsV2": {"nodes": []}}}}
+        if "createProjectV2Field(" in query:
+            field = (variables or {})["input"]
+            iterations = (field.get("iterationConfiguration") or {}).get("iterations") or []
+            return {"data": {"createProjectV2Field": {"projectV2Field": {
+                "id": f"DRY_F_{field['name']}", "name": field["name"], "dataType": field["dataType"],
+                "options": [{"id": f"DRY_O_{o['name']}", "name": o["name"]} for o in field.get("singleSelectOptions") or []],
+                "configuration": {"iterations": [{"id": f"DRY_IT_{i}", "title": it["title"]} for i, it in enumerate(iterations)]},
+            }}}}
+        if "createProjectV2(" in query:
+            return {"data": {"createProjectV2": {"projectV2": {
+                "id": "DRY_P", "number": 1, "url": "https://github.com/dry-run/projects/1", "fields": {"nodes": []}
+            }}}}
+        if "__type(" in query:
+            fields = [{"name": name} for name in ("issueId", "subIssueId", "subIssueUrl", "replaceParent")]
+            return {"data": {"__type": {"inputFields": fields}}}
+        if "issues(first:" in query:
+            return {"data": {"repository": {"issues": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": []
+            }}}}
+        if "labels(first:" in query:
+            return {"data": {"repository": {"labels": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": []
+            }}}}
+        if "viewer" in query:
+            return {"data": {"viewer": {"login": "dry-run"}}}
+        if "repository(" in query:
+            return {"data": {"repository": {"id": "DRY_R"}}}
+        return {"data": {}}
+
+
+def print_cost_report(transport: DryRunTransport, workers: int, writes_per_minute: float, burst: int = 10):
+    """Print the per-stage call counts and estimated wall time of a dry run.
+
+    The pipeline's create:<kind> and relate:<kind> stages run at the same
+    time, each on its own workers, so the total counts the longer of the
+    two halves (or their shared write pacing), not their sum.
+    """
+    rate = writes_per_minute / 60.0
+    header = f"  {'Stage':<14}{'Spawns':>8}{'REST':>7}{'GraphQL':>9}{'Points':>8}{'Writes':>8}{'Est. time':>11}"
+    print(f"\n{BLUE}{'='*60}{RESET}")
+    print(f"{BLUE}Dry-run cost estimate ({transport.backend} transport, {workers} worker(s), "
+          f"{writes_per_minute:g} writes/min){RESET}")
+    print(f"{BLUE}{'='*60}{RESET}")
+    print(header)
+    totals = {key: 0 for key in DRY_RUN_COUNTERS}
+    total_time = 0.0
+    tokens = float(burst)
+    pipeline = {"create": 0.0, "relate": 0.0, "paced": 0.0}
+    for stage, stats in transport.stats.items():
+        # A stage is bound either by call latency spread over the workers or by write pacing
+        paced = max(stats["writes"] - tokens, 0) / rate
+        tokens = max(tokens - stats["writes"], 0)
+        seconds = max(stats["latency"] / workers, paced)
+        half = stage.split(":")[0]
+        if ":" in stage and half in pipeline:
+            pipeline[half] += stats["latency"] / workers
+            pipeline["paced"] += paced
+        else:
+            total_time += seconds
+        for key in DRY_RUN_COUNTERS:
+            totals[key] += stats[key]
+        print(f"  {stage:<14}{stats['spawns']:>8}{stats['rest']:>7}{stats['graphql']:>9}"
+              f"{stats['points']:>8}{stats['writes']:>8}{format_duration(seconds):>11}")
+    total_time += max(pipeline.values())
+    print(f"  {'total':<14}{totals['spawns']:>8}{totals['rest']:>7}{totals['graphql']:>9}"
+          f"{totals['points']:>8}{totals['writes']:>8}{format_duration(total_time):>11}")
+    print(f"{YELLOW}Estimates assume an empty repository and typical API latency; "
+          f"nothing was sent to GitHub.{RESET}\n")
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as e.g. '42s' or '6m05s'."""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f"{minutes}m{seconds:02d}s" if minutes else f"{seconds}s"
+
+
+def get_repo_info(transport: Transport) -> Dict[str, str]:
+    """Get repository owner, name and node ID."""
+    result = transport.cli(["repo", "view", "--json", "owner,name,id"])
+    repo_data = json.loads(result.stdout)
+    return {
+        "owner": repo_data["owner"]["login"],
+        "name": repo_data["name"],
+        "id": repo_data["id"]
+    }
+
+
+class GitHubSession:
+    """Run-scoped GitHub context.
+
+    Holds the transport every API helper goes through. Repository metadata
+    and the sub-issue capability are resolved lazily, at most once per run.
+    The auth token belongs to the transport, which reads it once when it is
+    built. When repo ("owner/name") is not given it is taken from the
+    current checkout via `gh repo view`.
+    """
+
+    def __init__(self, transport, repo: Optional[str] = None):
+        self.transport = transport
+        self._lock = threading.Lock()
+        self._repo_arg = repo
+        self._repo: Optional[Dict[str, str]] = None
+        self._sub_issue_fields: Optional[List[str]] = None
+        # Label name -> node ID, filled in by ensure_labels()
+        self.label_ids: Dict[str, str] = {}
+        # Pipeline stage currently running, used to attribute call costs
+        self._stage = "setup"
+        self._thread_stage = threading.local()
+        self._owner = threading.current_thread()
+        # Issues this run may have created were updated no earlier than this
+        self.started = time.time()
+
+    def _repo_info(self) -> Dict[str, str]:
+        with self._lock:
+            if self._repo is None:
+                if self._repo_arg:
+                    owner, _, name = self._repo_arg.partition("/")
+                    data = self.transport.graphql(
+                        "query($owner: String!, $name: String!) { repository(owner: $owner, name: $name) { id } }",
+                        {"owner": owner, "name": name}
+                    )
+                    repository = (data.get("data") or {}).get("repository")
+                    if not repository:
+                        raise GitHubError(f"Repository {self._repo_arg} not found: {data.get('errors')}")
+                    self._repo = {"owner": owner, "name": name, "id": repository["id"]}
+                else:
+                    self._repo = get_repo_info(self.transport)
+            return self._repo
+
+    @property
+    def stage(self) -> str:
+        """Stage of the calling thread, else the stage last set by the thread running the session."""
+        return getattr(self._thread_stage, "stage", self._stage)
+
+    @stage.setter
+    def stage(self, value: str):
+        if threading.current_thread() is self._owner:
+            self._stage = value
+        else:
+            self._thread_stage.stage = value
+
+    def route(self, operation: str, costs: Dict[str, float]) -> str:
+        """Choose "core" (REST) or "graphql" for an operation both APIs can serve.
+
+        costs holds the operation's cost on each API (REST calls, GraphQL
+        points), the usual choice first; the transport's governor decides by
+        the live budgets. Every choice is counted under METRICS "routes".
+        """
+        governor = getattr(self.transport, "governor", None)
+        resource = governor.route(costs) if governor else next(iter(costs))
+        METRICS.count("routes", f"{operation}:{'rest' if resource == 'core' else resource}")
+        return resource
+    
+    @property
+    def retry(self) -> Optional["RetryPolicy"]:
+        """The transport's retry policy; None for --dry-run, whose calls never fail."""
+        return getattr(self.transport, "retry", None)
+    
+    @property
+    def owner(self) -> str:
+        return self._repo_info()["owner"]
+
+    @property
+    def name(self) -> str:
+        return self._repo_info()["name"]
+
+    @property
+    def repo_id(self) -> str:
+        return self._repo_info()["id"]
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.name}"
+
+    @property
+    def sub_issue_fields(self) -> List[str]:
+        """Input fields of addSubIssue, probed once per run; empty when sub-issues are unavailable."""
+        with self._lock:
+            if self._sub_issue_fields is None:
+                data = self.transport.graphql('query { __type(name: "AddSubIssueInput") { inputFields { name } } }')
+                input_type = (data.get("data") or {}).get("__type") or {}
+                self._sub_issue_fields = [field["name"] for field in input_type.get("inputFields") or []]
+            return self._sub_issue_fields
+
+
+def list_labels(session: GitHubSession) -> Iterator[Dict]:
+    """Yield every label of the repository as {"name": ..., "node_id": ...}.
+
+    Listed over REST or paginated GraphQL, whichever budget has more headroom.
+    """
+    if session.route("label", {"core": 1, "graphql": 1}) == "core":
+        yield from session.transport.paginate(f"repos/{session.full_name}/labels")
+        return
+    query = """
+    query($owner: String!, $name: String!, $after: String) {
+      repository(owner: $owner, name: $name) {
+        labels(first: 100, after: $after) {
+          pageInfo { hasNextPage endCursor }
+          nodes { name id }
+        }
+      }
+    }
+    """
+    after = None
+    while True:
+        data = session.transport.graphql(query, {"owner": session.owner, "name": session.name, "after": after})
+        if data.get("errors"):
+            raise GitHubError(f"Listing labels failed: {data['errors']}")
+        page = data["data"]["repository"]["labels"]
+        for node in page["nodes"]:
+            yield {"name": node["name"], "node_id": node["id"]}
+        if not page["pageInfo"]["hasNextPage"]:
+            return
+        after = page["pageInfo"]["endCursor"]
+
+
+def ensure_labels(session: GitHubSession, usage: Iterable[List[str]], workers: int = 1) -> Dict[str, str]:
+    """Create the labels missing from the repository and return all label node IDs.
+
+    usage yields the label list of every issue that will be created. Existing
+    labels are listed in a single paginated call; only the missing ones are
+    created, concurrently.
+    """
+    names: Dict[str, None] = {}
+    uses = 0
+    for labels in usage:
+        uses += len(labels)
+        names.update(dict.fromkeys(labels))
+    names = list(names)
+    existing = {}
+    with METRICS.timer("fetch"):
+        for label in list_labels(session):
+            existing[label["name"].lower()] = label["node_id"]
+    
+    missing = [name for name in names if name.lower() not in existing]
+    
+    def create_label(name: str) -> str:
+        try:
+            with METRICS.timer("label"):
+                label = session.transport.rest("POST", f"repos/{session.full_name}/labels", {
+                    "name": name,
+                    "color": LABEL_COLORS.get(name, "ededed")
+                })
+        except GitHubError as e:
+            # A retried create whose first response was lost finds its own label
+            if e.status != 422:
+                raise
+            label = next((label for label in list_labels(session) if label["name"].lower() == name.lower()), None)
+            if label is None:
+                raise
+        print(f"{GREEN}✓ Created label: {name}{RESET}")
+        return label["node_id"]
+    
+    for name, node_id in zip(missing, run_concurrently(create_label, missing, workers)):
+        existing[name.lower()] = node_id
+    
+    # The per-issue approach ran one `gh label create --force` per label per issue
+    calls = 1 + len(missing)
+    saved = uses - calls
+    print(f"{GREEN}✓ Labels ready: {len(names) - len(missing)} existing, {len(missing)} created "
+          f"({calls} API calls, {saved} saved){RESET}")
+    
+    session.label_ids.update({name: existing[name.lower()] for name in names})
+    return session.label_ids
+
+
+def _post_issue(
+    session: GitHubSession, title: str, body: str, labels: List[str], milestone: Optional[Milestone] = None
+) -> CreatedIssue:
+    """Create an issue over REST; the response may lack the node ID."""
+    payload = {"title": title, "body": body}
+    if labels:
+        # Labels are provisioned up front by ensure_labels()
+        payload["labels"] = labels
+    if milestone:
+        payload["milestone"] = milestone.number
+    issue = session.transport.rest("POST", f"repos/{session.full_name}/issues", payload, idempotent=False)
+    if not issue or not issue.get("number"):
+        raise GitHubError(f"Unexpected response while creating issue '{title[:50]}': {issue}")
+    return CreatedIssue(issue["number"], issue.get("node_id") or "", issue.get("html_url") or "")
+
+
+def _mutate_issue(
+    session: GitHubSession, title: str, body: str, labels: List[str], milestone: Optional[Milestone] = None
+) -> CreatedIssue:
+    """Create an issue with one GraphQL createIssue mutation."""
+    issue_input = {"repositoryId": session.repo_id, "title": title, "body": body,
+                   "labelIds": [session.label_ids[label] for label in labels]}
+    if milestone:
+        issue_input["milestoneId"] = milestone.id
+    data = session.transport.graphql(
+        "mutation($input: CreateIssueInput!) {\n  created: createIssue(input: $input) { issue { id number url } }\n}",
+        {"input": issue_input}, idempotent=False
+    )
+    issue = ((data.get("data") or {}).get("created") or {}).get("issue")
+    if not issue:
+        raise GitHubError(f"Creating issue '{title[:50]}' failed: {data.get('errors')}")
+    return CreatedIssue(issue["number"], issue["id"], issue["url"])
+
+
+def find_created(session: GitHubSession, titles: Iterable[str]) -> Dict[str, CreatedIssue]:
+    """Look up open issues created by requests whose response was lost, by title.
+
+    Only issues updated since the run started are listed, newest first, and
+    the listing stops once every title is found. Issues are matched by the
+    plan ID prefix of their title (the whole title without one); the newest
+    match wins. Used after an uncertain create failure, before the create is
+    sent again.
+    """
+    wanted = {plan_id(title) or title: title for title in titles}
+    found: Dict[str, CreatedIssue] = {}
+    # A few minutes' margin covers clock skew between this machine and GitHub
+    since = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(session.started - 300))
+    path = f"repos/{session.full_name}/issues?state=open&sort=created&direction=desc&since={since}"
+    with METRICS.timer("fetch"):
+        for issue in session.transport.paginate(path):
+            key = plan_id(issue["title"]) or issue["title"]
+            if "pull_request" in issue or key not in wanted or wanted[key] in found:
+                continue
+            found[wanted[key]] = CreatedIssue(issue["number"], issue["node_id"], issue["html_url"])
+            if len(found) == len(wanted):
+                break
+    return found
+
+
+def create_issue(
+    session: GitHubSession, title: str, body: str, labels: Optional[List[str]] = None,
+    milestone: Optional[Milestone] = None, attempts: Optional[int] = None
+) -> CreatedIssue:
+    """Create a GitHub issue, in milestone if given, and return its number, node ID and URL.
+
+    Everything comes from the create response itself, so no follow-up
+    lookup is needed. The call goes over REST or GraphQL, whichever budget
+    has more headroom; GraphQL needs the label node IDs from ensure_labels().
+    A GraphQL create refused inside its response (such as a secondary
+    limit's "was submitted too quickly") is sent again over REST, whose
+    rate limits the governor waits out. When the create may have happened
+    without an answer, the issue is looked up by title and, if missing, sent
+    again after the retry policy's backoff. Either way it is tried up to
+    attempts times, by default as often as the transport retries a call.
+    """
+    labels = labels or []
+    routable = all(label in session.label_ids for label in labels)
+    retry = session.retry
+    attempts = attempts or (retry.attempts if retry else 1)
+    for attempt in range(1, attempts + 1):
+        api = session.route("create", {"core": 1, "graphql": 1}) if routable else "core"
+        try:
+            with METRICS.timer("create"):
+                created = (_mutate_issue if api == "graphql" else _post_issue)(session, title, body, labels, milestone)
+            break
+        except GitHubError as e:
+            if e.uncertain:
+                found = find_created(session, [title]).get(title)
+                if found:
+                    print(f"{YELLOW}⚠ Create of '{title[:50]}' went unanswered but issue #{found.number} exists{RESET}")
+                    return found
+            elif api != "graphql":
+                raise
+            if attempt == attempts:
+                raise
+            if e.uncertain:
+                METRICS.count("retries", "uncertain create")
+                if retry:
+                    retry.governor.sleep(retry.backoff(attempt))
+            else:
+                METRICS.count("retries", "failed items")
+                print(f"{YELLOW}Retrying '{title[:50]}' over REST: {e}{RESET}")
+                routable = False
+    if created.id:
+        print(f"{GREEN}✓ Created issue #{created.number}: {title[:50]}...{RESET}")
+    else:
+        print(f"{YELLOW}⚠ Created issue #{created.number} but the response had no node ID: {title[:50]}...{RESET}")
+    return created
+
+
+def resolve_issue_ids(
+    session: GitHubSession, numbers: Iterable[int], chunk_size: int = 100, workers: int = 1
+) -> Dict[int, str]:
+    """Resolve issue numbers to node IDs.
+
+    Numbers are looked up in chunks of chunk_size aliased fields
+    (repository { i123: issue(number: 123) { id } ... }), one GraphQL query
+    per chunk, or with one REST call per number when the GraphQL budget is
+    the scarcer one. Numbers that do not resolve are left out of the result.
+    """
+    numbers = sorted(set(numbers))
+    chunks = [numbers[i:i + chunk_size] for i in range(0, len(numbers), chunk_size)]
+    
+    def get_chunk(chunk: List[int]) -> Dict[int, str]:
+        resolved = {}
+        for number in chunk:
+            try:
+                with METRICS.timer("resolve"):
+                    issue = session.transport.rest("GET", f"repos/{session.full_name}/issues/{number}")
+            except GitHubError:
+                continue
+            if (issue or {}).get("node_id"):
+                resolved[number] = issue["node_id"]
+        return resolved
+    
+    def resolve_chunk(chunk: List[int]) -> Dict[int, str]:
+        if session.route("fetch", {"graphql": 1, "core": len(chunk)}) == "core":
+            return get_chunk(chunk)
+        fields = "\n    ".join(f"i{number}: issue(number: {number}) {{ id }}" for number in chunk)
+        query = f"""query($owner: String!, $name: String!) {{
+  repository(owner: $owner, name: $name) {{
+    {fields}
+  }}
+}}"""
+        with METRICS.timer("resolve"):
+            data = session.transport.graphql(query, {"owner": session.owner, "name": session.name})
+        repository = (data.get("data") or {}).get("repository") or {}
+        return {
+            number: repository[f"i{number}"]["id"]
+            for number in chunk if (repository.get(f"i{number}") or {}).get("id")
+        }
+    
+    resolved: Dict[int, str] = {}
+    for part in run_concurrently(resolve_chunk, chunks, workers):
+        resolved.update(part)
+    return resolved
+
+
+def _alias_errors(errors: List[Dict], prefix: str) -> Dict[int, str]:
+    """Map GraphQL errors of an aliased document back to their alias index."""
+    by_alias = {}
+    for error in errors or []:
+        path = error.get("path") or []
+        if path and isinstance(path[0], str) and path[0].startswith(prefix) and path[0][len(prefix):].isdigit():
+            by_alias.setdefault(int(path[0][len(prefix):]), error.get("message", "unknown error"))
+    return by_alias
+
+
+def create_issues_batched(
+    session: GitHubSession,
+    specs: List[IssueSpec],
+    batch_size: int = 20,
+    workers: int = 1,
+    attempts: Optional[int] = None,
+    on_created: Optional[Callable[[int, CreatedIssue], None]] = None
+) -> List[Optional[CreatedIssue]]:
+    """Create issues with alias-batched GraphQL createIssue mutations.
+
+    Up to batch_size createIssue mutations are packed into one document
+    (c0: createIssue(...), c1: ...), each returning the node ID and number
+    directly; when the GraphQL budget runs short of the REST one a batch is
+    created over REST instead, one call per issue, and node IDs missing from
+    those responses are left empty. Errors are mapped back to the spec that
+    caused them and only the failed specs are resubmitted, after the retry
+    policy's backoff and up to attempts times (by default as often as the
+    transport retries a call); specs whose call failed without a clear
+    answer are first looked up by title, so an issue GitHub created anyway
+    is not created twice. Returns results in spec order; None marks an
+    issue that could not be created. on_created(index, issue) is called as
+    soon as each issue exists.
+    """
+    retry = session.retry
+    attempts = attempts or (retry.attempts if retry else 1)
+    results: List[Optional[CreatedIssue]] = [None] * len(specs)
+    last_error: Dict[int, str] = {}
+    pending = list(range(len(specs)))
+    uncertain: set = set()
+    
+    def settle(index: int, issue: CreatedIssue):
+        results[index] = issue
+        if on_created:
+            on_created(index, issue)
+        print(f"{GREEN}✓ Created issue #{issue.number}: {specs[index].title[:50]}...{RESET}")
+    
+    def recover_uncertain() -> List[int]:
+        """Settle the uncertain specs that exist after all; return the pending ones still to create."""
+        found = find_created(session, [specs[index].title for index in uncertain])
+        for index in sorted(uncertain):
+            if specs[index].title in found:
+                print(f"{YELLOW}⚠ Create of {specs[index].key} went unanswered but the issue exists{RESET}")
+                settle(index, found[specs[index].title])
+        uncertain.clear()
+        return [index for index in pending if results[index] is None]
+    
+    def post_batch(indexes: List[int]) -> Dict[int, Optional[Dict]]:
+        outcome = {}
+        for index in indexes:
+            try:
+                with METRICS.timer("create"):
+                    spec = specs[index]
+                    created = _post_issue(session, spec.title, spec.body, spec.labels, spec.milestone)
+            except GitHubError as e:
+                outcome[index] = {"error": str(e), "uncertain": e.uncertain}
+                continue
+            outcome[index] = {"number": created.number, "id": created.id, "url": created.url}
+        return outcome
+    
+    def run_batch(indexes: List[int]) -> Dict[int, Optional[Dict]]:
+        if session.route("create", {"graphql": 1, "core": len(indexes)}) == "core":
+            return post_batch(indexes)
+        declarations = ", ".join(f"$i{n}: CreateIssueInput!" for n in range(len(indexes)))
+        fields = "\n".join(
+            f"  c{n}: createIssue(input: $i{n}) {{ issue {{ id number url }} }}" for n in range(len(indexes))
+        )
+        variables = {}
+        for n, index in enumerate(indexes):
+            spec = specs[index]
+            variables[f"i{n}"] = {
+                "repositoryId": session.repo_id,
+                "title": spec.title,
+                "body": spec.body,
+                "labelIds": [session.label_ids[label] for label in spec.labels if label in session.label_ids],
+            }
+            if spec.milestone:
+                variables[f"i{n}"]["milestoneId"] = spec.milestone.id
+        try:
+            with METRICS.timer("create"):
+                data = session.transport.graphql(
+                    f"mutation({declarations}) {{\n{fields}\n}}", variables, writes=len(indexes), idempotent=False
+                )
+        except GitHubError as e:
+            return {index: {"error": str(e), "uncertain": e.uncertain} for index in indexes}
+        
+        errors = _alias_errors(data.get("errors"), "c")
+        payload = data.get("data") or {}
+        outcome = {}
+        for n, index in enumerate(indexes):
+            issue = (payload.get(f"c{n}") or {}).get("issue")
+            if issue:
+                outcome[index] = issue
+            else:
+                message = errors.get(n) or "; ".join(e.get("message", "") for e in data.get("errors") or [])
+                outcome[index] = {"error": message or "no issue returned"}
+        return outcome
+    
+    for attempt in range(1, attempts + 1):
+        if uncertain:
+            pending = recover_uncertain()
+        if not pending:
+            break
+        if attempt > 1:
+            METRICS.count("retries", "failed items", len(pending))
+            print(f"{YELLOW}Retrying {len(pending)} failed issue(s) (attempt {attempt}/{attempts})...{RESET}")
+            if retry:
+                retry.governor.sleep(retry.backoff(attempt - 1))
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        failed = []
+        for outcome in run_concurrently(run_batch, batches, workers):
+            for index, issue in outcome.items():
+                if "error" in issue:
+                    last_error[index] = issue["error"]
+                    failed.append(index)
+                    if issue.get("uncertain"):
+                        uncertain.add(index)
+                else:
+                    settle(index, CreatedIssue(issue["number"], issue["id"], issue["url"]))
+        pending = sorted(failed)
+    if uncertain:
+        pending = recover_uncertain()
+    
+    for index in pending:
+        print(f"{RED}✗ Failed to create {specs[index].key}: {last_error[index]}{RESET}")
+    
+    return results
+
+
+# Operation name, for metrics, of the mutations run through mutate_batched()
+MUTATION_OPERATIONS = {
+    "addSubIssue": "link",
+    "addBlockedBy": "block",
+    "addProjectV2ItemById": "project",
+    "updateProjectV2ItemFieldValue": "project",
+    "closeIssue": "close",
+    "deleteIssue": "delete",
+    "deleteProjectV2": "project",
+}
+
+
+def mutate_batched(
+    session: GitHubSession,
+    field: str,
+    input_type: str,
+    inputs: List[Dict],
+    batch_size: int = 25,
+    workers: int = 1,
+    attempts: int = 3,
+    on_done: Optional[Callable[[int, Dict], None]] = None,
+    selection: str = "clientMutationId"
+) -> Dict[int, str]:
+    """Run the GraphQL mutation field once per input, batch_size aliases per document.
+
+    Works like create_issues_batched for any mutation (addBlockedBy,
+    addSubIssue, addProjectV2ItemById, ...): errors are mapped back to their
+    input and only failed inputs are resubmitted, up to attempts times.
+    on_done(index, payload) is called as each mutation succeeds, with the
+    fields of selection. Returns the last error of every input that still
+    failed, keyed by input index.
+    """
+    last_error: Dict[int, str] = {}
+    pending = list(range(len(inputs)))
+    
+    def run_batch(indexes: List[int]) -> Dict[int, Tuple[Optional[str], Optional[Dict]]]:
+        declarations = ", ".join(f"$m{n}: {input_type}!" for n in range(len(indexes)))
+        fields = "\n".join(f"  m{n}: {field}(input: $m{n}) {{ {selection} }}" for n in range(len(indexes)))
+        variables = {f"m{n}": inputs[index] for n, index in enumerate(indexes)}
+        try:
+            with METRICS.timer(MUTATION_OPERATIONS.get(field, field)):
+                data = session.transport.graphql(
+                    f"mutation({declarations}) {{\n{fields}\n}}", variables, writes=len(indexes)
+                )
+        except GitHubError as e:
+            return {index: (str(e), None) for index in indexes}
+        
+        errors = _alias_errors(data.get("errors"), "m")
+        payload = data.get("data") or {}
+        outcome = {}
+        for n, index in enumerate(indexes):
+            if n in errors:
+                outcome[index] = (errors[n], None)
+            elif payload.get(f"m{n}") is None:
+                message = "; ".join(e.get("message", "") for e in data.get("errors") or [])
+                outcome[index] = (message or "no result", None)
+            else:
+                outcome[index] = (None, payload[f"m{n}"])
+        return outcome
+    
+    for attempt in range(1, attempts + 1):
+        if not pending:
+            break
+        if attempt > 1:
+            METRICS.count("retries", "failed items", len(pending))
+            print(f"{YELLOW}Retrying {len(pending)} failed {field} call(s) (attempt {attempt}/{attempts})...{RESET}")
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        failed = []
+        for outcome in run_concurrently(run_batch, batches, workers):
+            for index, (error, result) in outcome.items():
+                if error is None:
+                    last_error.pop(index, None)
+                    if on_done:
+                        on_done(index, result)
+                else:
+                    last_error[index] = error
+                    failed.append(index)
+        pending = sorted(failed)
+    
+    return last_error
+
+
+def add_sub_issues(
+    session: GitHubSession,
+    pairs: List[Tuple[str, str]],
+    replace_parent: bool = False,
+    workers: int = 1,
+    on_done: Optional[Callable[[int, Dict], None]] = None
+) -> Dict[int, str]:
+    """Make each (parent node ID, child node ID) pair a sub-issue link.
+
+    Links go out as alias-batched addSubIssue mutations, RELATION_BATCH_SIZE
+    per document. Returns the error of every pair that could not be linked,
+    keyed by pair index.
+    """
+    fields = session.sub_issue_fields
+    if "subIssueId" not in fields:
+        return {index: "addSubIssue is not available for this repository" for index in range(len(pairs))}
+    inputs = []
+    for parent_id, child_id in pairs:
+        link = {"issueId": parent_id, "subIssueId": child_id}
+        if replace_parent and "replaceParent" in fields:
+            link["replaceParent"] = True
+        inputs.append(link)
+    return mutate_batched(session, "addSubIssue", "AddSubIssueInput", inputs, RELATION_BATCH_SIZE, workers, on_done=on_done)
+
+
+def add_blocked_by(
+    session: GitHubSession,
+    pairs: List[Tuple[str, str]],
+    workers: int = 1,
+    on_done: Optional[Callable[[int, Dict], None]] = None
+) -> Dict[int, str]:
+    """Mark each (issue node ID, blocking issue node ID) pair as blocked-by.
+
+    Alias-batched addBlockedBy mutations, RELATION_BATCH_SIZE per document.
+    Returns the error of every pair that failed, keyed by pair index.
+    """
+    inputs = [{"issueId": issue_id, "blockingIssueId": blocker_id} for issue_id, blocker_id in pairs]
+    return mutate_batched(session, "addBlockedBy", "AddBlockedByInput", inputs, RELATION_BATCH_SIZE, workers, on_done=on_done)
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+class RunJournal:
+    """Append-only JSONL record of the issues and links a run has made.
+
+    Each line maps a plan ID (US-AUTH-01, TEST-009, "Sprint 3", ...) in one
+    repository to its issue number and node ID, marks a child as linked to
+    its parent, or marks a story as blocked by one of its dependencies. A
+    rerun loads the journal and skips everything already recorded, so an
+    interrupted seed resumes without duplicate writes. With no path the
+    journal is kept in memory only.
+    """
+
+    def __init__(self, path: Optional[str], repo: str):
+        self.path = path
+        self.repo = repo
+        self._lock = threading.Lock()
+        self.issues: Dict[str, CreatedIssue] = {}
+        self.links: Dict[str, str] = {}
+        self.blocked: set = set()
+        self._file = None
+        if not path:
+            return
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from a crash
+                    if entry.get("repo") != repo:
+                        continue
+                    if "number" in entry:
+                        self.issues[entry["key"]] = CreatedIssue(entry["number"], entry["id"], entry["url"])
+                    elif "parent" in entry:
+                        self.links[entry["key"]] = entry["parent"]
+                    elif "blocked_by" in entry:
+                        self.blocked.add((entry["key"], entry["blocked_by"]))
+        self._file = open(path, "a", encoding="utf-8")
+        if self._file.tell() and not _ends_with_newline(path):
+            self._file.write("\n")  # terminate a torn last line before appending
+
+    def _append(self, entry: Dict):
+        if self._file is None:
+            return
+        self._file.write(json.dumps({"repo": self.repo, **entry}) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def created(self, key: str) -> Optional[CreatedIssue]:
+        """Return the issue already created for a plan ID, if any."""
+        return self.issues.get(key)
+
+    def record_issue(self, key: str, issue: CreatedIssue):
+        with self._lock:
+            self.issues[key] = issue
+            self._append({"key": key, "number": issue.number, "id": issue.id, "url": issue.url})
+
+    def is_linked(self, child_key: str, parent_key: str) -> bool:
+        return self.links.get(child_key) == parent_key
+
+    def record_link(self, child_key: str, parent_key: str):
+        with self._lock:
+            self.links[child_key] = parent_key
+            self._append({"key": child_key, "parent": parent_key})
+
+    def is_blocked(self, key: str, blocker_key: str) -> bool:
+        return (key, blocker_key) in self.blocked
+
+    def record_blocked_by(self, key: str, blocker_key: str):
+        with self._lock:
+            self.blocked.add((key, blocker_key))
+            self._append({"key": key, "blocked_by": blocker_key})
+
+    def forget(self, keep: Iterable[str] = ()):
+        """Drop what is recorded for this repository, e.g. after a teardown removed it.
+
+        The issues of the plan IDs in keep (ones a teardown failed to
+        remove) stay recorded, with the links and dependencies among them.
+        """
+        keep = set(keep)
+        with self._lock:
+            self.issues = {key: issue for key, issue in self.issues.items() if key in keep}
+            self.links = {key: parent for key, parent in self.links.items() if key in keep and parent in keep}
+            self.blocked = {pair for pair in self.blocked if set(pair) <= keep}
+            if self._file is None:
+                return
+            self._file.close()
+            kept = []
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    related = {entry.get("key"), entry.get("parent", entry.get("key")),
+                               entry.get("blocked_by", entry.get("key"))}
+                    if entry.get("repo") != self.repo or related <= keep:
+                        kept.append(line if line.endswith("\n") else line + "\n")
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                f.writelines(kept)
+            os.replace(temporary, self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# Sprint plan document: the single source of the EPICs, User Stories, Sprints and Tasks
+DEFAULT_PLAN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs", "MVP_Sprint_Plan_with_Review.md")
+DEFAULT_PLAN_CACHE = ".github_project_plan_cache.json"
+PLAN_PARSER_VERSION = "1"  # bump when parse_plan output changes to invalidate caches
+
+EPIC_HEADING_RE = re.compile(r"^###\s+(Epic\s+\d+:\s*.+?)\s*\(Priority:\s*(P\d)\)\s*$")
+SPRINT_HEADING_RE = re.compile(r"^###\s+(Sprint\s+(\d+):\s*.+?)(?:\s*\([^)]*\))?\s*$")
+GOAL_RE = re.compile(r"^\*\*Goal:\*\*\s*(.+?)\s*$")
+
+
+class Plan(NamedTuple):
+    """The parsed sprint plan: EPICs with their user stories, Sprints with their tasks."""
+    epics: List[Dict]
+    sprints: List[Dict]
+
+
+def _table_cells(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def parse_plan(lines: Iterable[str]) -> Plan:
+    """Parse the "### Epic N" and "### Sprint N" sections of the sprint plan.
+
+    Single streaming pass over the lines. Prose between an epic heading and
+    its story table becomes the epic body (deeper headings are lifted one
+    level), "ID | User Story | Priority | Dependencies" rows become user
+    stories, and "Task | Description | Est" rows become sprint tasks.
+    """
+    epics: List[Dict] = []
+    sprints: List[Dict] = []
+    section: Optional[Dict] = None
+    prose: List[str] = []
+    columns: Optional[List[str]] = None
+    
+    def finish_epic():
+        if section is not None and "user_stories" in section:
+            text = "\n".join(prose).strip()
+            section["body"] = f"## Priority: {section.pop('priority')}\n" + (f"\n{text}\n" if text else "")
+    
+    for line in lines:
+        line = line.rstrip("\r\n")
+        in_epic_intro = section is not None and "user_stories" in section and not section["user_stories"]
+        if line.startswith("####") and in_epic_intro:
+            prose.append(line[1:])
+            continue
+        if line.startswith("#"):
+            finish_epic()
+            section, prose, columns = None, [], None
+            epic_match = EPIC_HEADING_RE.match(line)
+            sprint_match = SPRINT_HEADING_RE.match(line)
+            if epic_match:
+                section = {"title": epic_match.group(1), "priority": epic_match.group(2), "user_stories": []}
+                epics.append(section)
+            elif sprint_match:
+                section = {"number": int(sprint_match.group(2)), "title": sprint_match.group(1), "goal": "", "tasks": []}
+                sprints.append(section)
+            continue
+        if section is None:
+            continue
+        if not line.startswith("|"):
+            columns = None
+            goal = GOAL_RE.match(line)
+            if goal and "tasks" in section:
+                section["goal"] = goal.group(1)
+            elif in_epic_intro:
+                prose.append(line)
+            continue
+        cells = _table_cells(line)
+        if columns is None:
+            columns = [cell.lower() for cell in cells]
+            continue
+        if all(set(cell) <= set("-: ") for cell in cells):
+            continue  # header separator row
+        row = dict(zip(columns, cells))
+        if "user_stories" in section and "user story" in row:
+            section["user_stories"].append({
+                "id": row["id"],
+                "title": row["user story"],
+                "priority": row.get("priority", ""),
+                "dependencies": row.get("dependencies", ""),
+            })
+        elif "tasks" in section and "task" in row:
+            section["tasks"].append({"id": row["task"], "title": row.get("description", ""), "est": row.get("est", "")})
+    finish_epic()
+    return Plan(epics, sprints)
+
+
+def load_plan(path: str = DEFAULT_PLAN_FILE, cache_path: Optional[str] = DEFAULT_PLAN_CACHE) -> Plan:
+    """Load the sprint plan, reusing the compiled cache while the document is unchanged.
+
+    The cache is keyed on the SHA-256 of the document and the parser version,
+    so an edited document (or a newer parser) is always re-parsed. The
+    document is hashed in blocks and parsed line by line, never read whole.
+    """
+    hasher = hashlib.sha256(PLAN_PARSER_VERSION.encode() + b"\0")
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            hasher.update(block)
+    digest = hasher.hexdigest()
+    
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("sha256") == digest:
+                return Plan(cached["epics"], cached["sprints"])
+        except (OSError, ValueError, KeyError):
+            pass  # unreadable cache: re-parse and overwrite it
+    
+    with open(path, encoding="utf-8") as f:
+        plan = parse_plan(f)
+    if not plan.epics or not plan.sprints:
+        raise ValueError(f"{path} has no '### Epic N' or '### Sprint N' sections")
+    topological_order(story_dependencies(plan))  # unknown IDs and cycles fail here
+    
+    if cache_path:
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"sha256": digest, "epics": plan.epics, "sprints": plan.sprints}, f)
+        os.replace(tmp_path, cache_path)
+    return plan
+
+
+def plan_problems(plan: Plan) -> List[str]:
+    """Return consistency problems in the plan: duplicate IDs and empty sections."""
+    problems = []
+    seen = set()
+    keys = [epic["title"] for epic in plan.epics]
+    keys += [us["id"] for epic in plan.epics for us in epic["user_stories"]]
+    keys += [f"Sprint {sprint['number']}" for sprint in plan.sprints]
+    keys += [task["id"] for sprint in plan.sprints for task in sprint["tasks"]]
+    for key in keys:
+        if key in seen:
+            problems.append(f"duplicate plan ID {key}")
+        seen.add(key)
+    problems += [f"{epic['title']} has no user stories" for epic in plan.epics if not epic["user_stories"]]
+    problems += [f"{sprint['title']} has no tasks" for sprint in plan.sprints if not sprint["tasks"]]
+    return problems
+
+
+STORY_ID_RE = re.compile(r"^US-[A-Z]+-\d+$")
+
+
+def story_dependencies(plan: Plan) -> Dict[str, List[str]]:
+    """Map every user story ID to the story IDs it depends on, in plan order.
+
+    Entries of the "Dependencies" column that are not story IDs ("None",
+    "All services") carry no edge; a story ID missing from the plan is an
+    error.
+    """
+    stories = [us for epic in plan.epics for us in epic["user_stories"]]
+    known = {us["id"] for us in stories}
+    graph: Dict[str, List[str]] = {}
+    unknown = []
+    for us in stories:
+        deps = [dep.strip() for dep in us["dependencies"].split(",")]
+        deps = [dep for dep in deps if STORY_ID_RE.match(dep)]
+        unknown += [f"{us['id']} -> {dep}" for dep in deps if dep not in known]
+        graph[us["id"]] = list(dict.fromkeys(dep for dep in deps if dep in known))
+    if unknown:
+        raise ValueError(f"unknown user story dependencies: {', '.join(unknown)}")
+    return graph
+
+
+def topological_order(graph: Dict[str, List[str]]) -> List[str]:
+    """Order the nodes of a dependency graph so every node follows its dependencies.
+
+    Kahn's algorithm, O(V+E); nodes that become ready at the same time keep
+    their graph order. Raises ValueError naming a cycle if there is one.
+    """
+    pending = {node: len(deps) for node, deps in graph.items()}
+    dependents: Dict[str, List[str]] = {node: [] for node in graph}
+    for node, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(node)
+    
+    ready = deque(node for node, count in pending.items() if count == 0)
+    order = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for dependent in dependents[node]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+    if len(order) == len(graph):
+        return order
+    
+    # Every node left over waits on another left-over node: walk back to a cycle
+    node = next(node for node, count in pending.items() if count > 0)
+    seen: Dict[str, int] = {}
+    path: List[str] = []
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = next(dep for dep in graph[node] if pending[dep] > 0)
+    cycle = path[seen[node]:] + [node]
+    raise ValueError(f"dependency cycle: {' -> '.join(cycle)}")
+
+
+def epic_labels(epic: Dict) -> List[str]:
+    """Labels applied to an EPIC issue."""
+    return ["epic", "P0" if "P0" in epic["body"] else "P1"]
+
+
+def story_labels(us: Dict) -> List[str]:
+    """Labels applied to a user story issue."""
+    return ["user-story", us["priority"]]
+
+
+SPRINT_LABELS = ["sprint"]
+TASK_LABELS = ["task"]
+
+
+def plan_label_usage(plan: Plan, sprint_issues: bool = True) -> Iterator[List[str]]:
+    """Yield the label list of every issue in the plan, in creation order."""
+    for epic in plan.epics:
+        yield epic_labels(epic)
+        for us in epic["user_stories"]:
+            yield story_labels(us)
+    for sprint in plan.sprints:
+        if sprint_issues:
+            yield SPRINT_LABELS
+        for _ in sprint["tasks"]:
+            yield TASK_LABELS
+
+
+def build_user_story_body(us: Dict) -> str:
+    """Render the issue body for a user story."""
+    return f"""## {us['id']}
+
+**Priority:** {us['priority']}
+**Dependencies:** {us['dependencies']}
+
+{us['title']}
+"""
+
+
+def build_sprint_body(sprint: Dict) -> str:
+    """Render the issue body for a sprint."""
+    return f"""## Sprint {sprint['number']}: {sprint['title'].split(': ')[1]}
+
+**Goal:** {sprint['goal']}
+
+### Tasks
+This sprint contains {len(sprint['tasks'])} development tasks.
+"""
+
+
+def build_task_body(task: Dict) -> str:
+    """Render the issue body for a sprint task."""
+    return f"""## {task['id']}
+
+**Estimate:** {task['est']}
+
+{task['title']}
+"""
+
+
+def sprint_key(sprint: Dict) -> str:
+    """Plan key of a sprint ("Sprint 3")."""
+    return f"Sprint {sprint['number']}"
+
+
+def epic_spec(epic: Dict) -> IssueSpec:
+    """Build the issue spec for an EPIC."""
+    return IssueSpec(epic["title"], epic["title"], epic["body"], epic_labels(epic))
+
+
+def story_spec(us: Dict) -> IssueSpec:
+    """Build the issue spec for a user story."""
+    return IssueSpec(us["id"], f"{us['id']}: {us['title']}", build_user_story_body(us), story_labels(us))
+
+
+def sprint_spec(sprint: Dict) -> IssueSpec:
+    """Build the issue spec for a sprint."""
+    return IssueSpec(sprint_key(sprint), sprint["title"], build_sprint_body(sprint), SPRINT_LABELS)
+
+
+def task_spec(task: Dict) -> IssueSpec:
+    """Build the issue spec for a sprint task."""
+    return IssueSpec(task["id"], f"{task['id']}: {task['title']}", build_task_body(task), TASK_LABELS)
+
+
+def run_concurrently(func: Callable[[T], R], items: Iterable[T], workers: int) -> List[R]:
+    """Apply func to every item with a bounded worker pool, preserving input order.
+
+    items may be a generator: at most 2 * workers items are taken from it
+    ahead of the results, so it is never drained up front.
+    """
+    if workers <= 1:
+        return [func(item) for item in items]
+    results = []
+    window: "deque[concurrent.futures.Future]" = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for item in items:
+            if len(window) >= 2 * workers:
+                results.append(window.popleft().result())
+            window.append(pool.submit(func, item))
+        results.extend(future.result() for future in window)
+    return results
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Yield successive lists of up to size items."""
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def count_created(issues: Dict[Any, Optional[CreatedIssue]]) -> int:
+    """Count the entries that were actually created."""
+    return sum(1 for created in issues.values() if created)
+
+
+class PlanEntry(NamedTuple):
+    """An issue of the plan before it is rendered: its plan key, its parent's key and its plan item."""
+    key: str
+    parent: Optional[str]
+    kind: str
+    item: Dict
+    milestone: Optional[Milestone] = None
+    
+    def spec(self) -> IssueSpec:
+        """Render the issue spec, body included; done only when the issue is about to be sent."""
+        spec = ENTRY_SPECS[self.kind](self.item)
+        return spec._replace(milestone=self.milestone) if self.milestone else spec
+
+
+ENTRY_SPECS: Dict[str, Callable[[Dict], IssueSpec]] = {
+    "epic": epic_spec,
+    "story": story_spec,
+    "sprint": sprint_spec,
+    "task": task_spec,
+}
+
+
+def plan_entries(plan: Plan, milestones: Optional[Dict[str, Milestone]] = None) -> Iterator[PlanEntry]:
+    """Yield an entry for every issue in the plan, in creation order; nothing is rendered yet.
+
+    With milestones (sprint key -> milestone) sprints are milestones rather
+    than issues: no sprint entries are yielded and each task is created in
+    its sprint's milestone instead of as a sub-issue.
+    """
+    for epic in plan.epics:
+        yield PlanEntry(epic["title"], None, "epic", epic)
+    for epic in plan.epics:
+        for us in epic["user_stories"]:
+            yield PlanEntry(us["id"], epic["title"], "story", us)
+    if milestones is None:
+        for sprint in plan.sprints:
+            yield PlanEntry(sprint_key(sprint), None, "sprint", sprint)
+    for sprint in plan.sprints:
+        for task in sprint["tasks"]:
+            if milestones is None:
+                yield PlanEntry(task["id"], sprint_key(sprint), "task", task)
+            else:
+                yield PlanEntry(task["id"], None, "task", task, milestones[sprint_key(sprint)])
+
+
+class Project(NamedTuple):
+    """A Projects v2 board and the fields the plan fills in, by field name.
+
+    Each field is {"id": ..., "options": {name: option ID}, "iterations":
+    {plan ID: iteration ID}}; options and iterations are empty for fields
+    without them.
+    """
+    id: str
+    number: int
+    url: str
+    fields: Dict[str, Dict]
+
+
+PROJECT_FIELDS = """
+  fields(first: 50) {
+    nodes {
+      ... on ProjectV2Field { id name dataType }
+      ... on ProjectV2SingleSelectField { id name dataType options { id name } }
+      ... on ProjectV2IterationField { id name dataType configuration { iterations { id title } } }
+    }
+  }"""
+
+PROJECT_PRIORITIES = ["P0", "P1"]
+SPRINT_DAYS = 14
+
+
+def _project(node: Dict) -> Project:
+    fields = {}
+    for field in (node.get("fields") or {}).get("nodes") or []:
+        if not field.get("name"):
+            continue
+        iterations = ((field.get("configuration") or {}).get("iterations")) or []
+        fields[field["name"]] = {
+            "id": field["id"],
+            "options": {option["name"]: option["id"] for option in field.get("options") or []},
+            "iterations": {plan_id(f"{iteration['title']}:") or iteration["title"]: iteration["id"]
+                           for iteration in iterations},
+        }
+    return Project(node["id"], node.get("number") or 0, node.get("url") or "", fields)
+
+
+def find_project(session: GitHubSession, title: str) -> Tuple[str, Optional[Project]]:
+    """Return the repository owner's node ID and its open Projects v2 board titled title, if any."""
+    query = f"""query($owner: String!, $title: String!) {{
+  repositoryOwner(login: $owner) {{
+    id
+    ... on ProjectV2Owner {{
+      projectsV2(first: 20, query: $title) {{ nodes {{ id number url title closed {PROJECT_FIELDS} }} }}
+    }}
+  }}
+}}"""
+    with METRICS.timer("project"):
+        data = session.transport.graphql(query, {"owner": session.owner, "title": title})
+    owner = (data.get("data") or {}).get("repositoryOwner")
+    if not owner:
+        raise GitHubError(f"owner {session.owner} not found: {data.get('errors')}")
+    found = [
+        node for node in ((owner.get("projectsV2") or {}).get("nodes") or [])
+        if node and node["title"] == title and not node.get("closed")
+    ]
+    return owner["id"], _project(found[0]) if found else None
+
+
+def ensure_project(session: GitHubSession, title: str, plan: Plan, sprint_start: str) -> Optional[Project]:
+    """Find the owner's Projects v2 board titled title, or create it linked to the repository.
+
+    The Sprint (iteration, one per plan sprint from sprint_start),
+    Priority (single select) and Estimate (number) fields are created when
+    missing. Returns None when the token cannot manage projects.
+    """
+    print(f"{BLUE}Looking for GitHub project: {title}...{RESET}")
+    try:
+        owner_id, project = find_project(session, title)
+        if project:
+            print(f"{GREEN}✓ Found project #{project.number}: {project.url}{RESET}")
+        else:
+            with METRICS.timer("project"):
+                data = session.transport.graphql(
+                    f"""mutation($input: CreateProjectV2Input!) {{
+  createProjectV2(input: $input) {{ projectV2 {{ id number url {PROJECT_FIELDS} }} }}
+}}""",
+                    {"input": {"ownerId": owner_id, "title": title, "repositoryId": session.repo_id}}
+                )
+            node = ((data.get("data") or {}).get("createProjectV2") or {}).get("projectV2")
+            if not node:
+                raise GitHubError(f"createProjectV2 failed: {data.get('errors')}")
+            project = _project(node)
+            print(f"{GREEN}✓ Created project #{project.number}: {project.url}{RESET}")
+    except GitHubError as e:
+        print(f"{YELLOW}⚠ Project unavailable ({e}); issues will be created without project assignment.{RESET}")
+        print(f"{YELLOW}  The token needs the 'project' scope (gh auth refresh -s project).{RESET}")
+        return None
+    
+    start = datetime.strptime(sprint_start, "%Y-%m-%d")
+    wanted = {
+        "Sprint": {"dataType": "ITERATION", "iterationConfiguration": {
+            "startDate": sprint_start,
+            "duration": SPRINT_DAYS,
+            "iterations": [
+                {
+                    "title": sprint["title"],
+                    "startDate": (start + timedelta(days=SPRINT_DAYS * i)).strftime("%Y-%m-%d"),
+                    "duration": SPRINT_DAYS,
+                }
+                for i, sprint in enumerate(plan.sprints)
+            ],
+        }},
+        "Priority": {"dataType": "SINGLE_SELECT", "singleSelectOptions": [
+            {"name": name, "color": color, "description": ""}
+            for name, color in zip(PROJECT_PRIORITIES, ["RED", "ORANGE"])
+        ]},
+        "Estimate": {"dataType": "NUMBER"},
+    }
+    for name, config in wanted.items():
+        if name in project.fields:
+            continue
+        with METRICS.timer("project"):
+            data = session.transport.graphql(
+                """mutation($input: CreateProjectV2FieldInput!) {
+  createProjectV2Field(input: $input) {
+    projectV2Field {
+      ... on ProjectV2Field { id name dataType }
+      ... on ProjectV2SingleSelectField { id name dataType options { id name } }
+      ... on ProjectV2IterationField { id name dataType configuration { iterations { id title } } }
+    }
+  }
+}""",
+                {"input": {"projectId": project.id, "name": name, **config}}
+            )
+        field = ((data.get("data") or {}).get("createProjectV2Field") or {}).get("projectV2Field")
+        if not field:
+            print(f"{YELLOW}⚠ Could not create the {name} field: {data.get('errors')}{RESET}")
+            continue
+        project.fields.update(_project({"id": project.id, "fields": {"nodes": [field]}}).fields)
+        print(f"{GREEN}✓ Created project field: {name}{RESET}")
+    return project
+
+
+def task_estimate(est: str) -> Optional[float]:
+    """Parse a task estimate such as "4h" or "1.5d" (8h days) into hours."""
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([hd]?)\s*$", est or "", re.IGNORECASE)
+    if not match:
+        return None
+    hours = float(match.group(1))
+    return hours * 8 if match.group(2).lower() == "d" else hours
+
+
+def project_field_values(project: Project, plan: Plan) -> List[Tuple[str, str, Dict]]:
+    """Return (plan ID, field ID, value) for every field the plan sets on project items.
+
+    Sprints and their tasks get their Sprint iteration, EPICs and user
+    stories their Priority, and tasks their Estimate in hours.
+    """
+    sprint = project.fields.get("Sprint")
+    priority = project.fields.get("Priority")
+    estimate = project.fields.get("Estimate")
+    values = []
+    if priority:
+        ranked = [(epic["title"], epic_labels(epic)[1]) for epic in plan.epics]
+        ranked += [(us["id"], us["priority"]) for epic in plan.epics for us in epic["user_stories"]]
+        values += [
+            (key, priority["id"], {"singleSelectOptionId": priority["options"][level]})
+            for key, level in ranked if level in priority["options"]
+        ]
+    for plan_sprint in plan.sprints:
+        key = sprint_key(plan_sprint)
+        iteration = sprint and sprint["iterations"].get(key)
+        if iteration:
+            values.append((key, sprint["id"], {"iterationId": iteration}))
+            values += [(task["id"], sprint["id"], {"iterationId": iteration}) for task in plan_sprint["tasks"]]
+        if estimate:
+            values += [
+                (task["id"], estimate["id"], {"number": task_estimate(task["est"])})
+                for task in plan_sprint["tasks"] if task_estimate(task["est"]) is not None
+            ]
+    return values
+
+
+def populate_project(
+    session: GitHubSession,
+    project: Project,
+    plan: Plan,
+    issues: Dict[str, Optional[CreatedIssue]],
+    workers: int = 1
+) -> Tuple[int, int]:
+    """Add every created issue to the project and set its plan fields.
+
+    Items are added with alias-batched addProjectV2ItemById (which returns
+    the existing item for issues already on the board), then the Sprint,
+    Priority and Estimate values go out as alias-batched
+    updateProjectV2ItemFieldValue calls. Returns (items, values set).
+    """
+    keys = [key for key, created in issues.items() if created and created.id]
+    items: Dict[str, str] = {}
+    failed = mutate_batched(
+        session, "addProjectV2ItemById", "AddProjectV2ItemByIdInput",
+        [{"projectId": project.id, "contentId": issues[key].id} for key in keys], RELATION_BATCH_SIZE, workers,
+        on_done=lambda index, result: items.__setitem__(keys[index], result["item"]["id"]),
+        selection="item { id }"
+    )
+    for index, error in sorted(failed.items()):
+        print(f"{RED}✗ Failed to add {keys[index]} to the project: {error}{RESET}")
+    print(f"{GREEN}✓ Added {len(items)}/{len(keys)} issue(s) to project #{project.number}{RESET}")
+    
+    values = [(key, field, value) for key, field, value in project_field_values(project, plan) if key in items]
+    failed = mutate_batched(
+        session, "updateProjectV2ItemFieldValue", "UpdateProjectV2ItemFieldValueInput",
+        [{"projectId": project.id, "itemId": items[key], "fieldId": field, "value": value}
+         for key, field, value in values],
+        RELATION_BATCH_SIZE, workers
+    )
+    for index, error in sorted(failed.items()):
+        print(f"{RED}✗ Failed to set a project field on {values[index][0]}: {error}{RESET}")
+    print(f"{GREEN}✓ Set {len(values) - len(failed)}/{len(values)} project field value(s){RESET}")
+    return len(items), len(values) - len(failed)
+
+
+def create_specs(
+    session: GitHubSession,
+    entries: List[PlanEntry],
+    journal: RunJournal,
+    args: argparse.Namespace
+) -> Dict[str, Optional[CreatedIssue]]:
+    """Create the entries not in the journal yet and return every entry's issue by plan ID.
+
+    Entries are rendered as the workers take them, so only the bodies of
+    the calls in flight are held at once.
+    """
+    results = {entry.key: journal.created(entry.key) for entry in entries}
+    todo = [entry for entry in entries if results[entry.key] is None]
+    if len(todo) < len(entries):
+        print(f"{YELLOW}Skipping {len(entries) - len(todo)} already created{RESET}")
+    
+    def record(spec: IssueSpec, created: CreatedIssue):
+        results[spec.key] = created
+        journal.record_issue(spec.key, created)
+    
+    if args.batch_size > 1:
+        def create_batch(batch: List[PlanEntry]):
+            specs = [entry.spec() for entry in batch]
+            create_issues_batched(
+                session, specs, args.batch_size,
+                on_created=lambda index, created: record(specs[index], created)
+            )
+        
+        run_concurrently(create_batch, chunked(todo, args.batch_size), args.workers)
+    else:
+        def create_one(entry: PlanEntry):
+            spec = entry.spec()
+            try:
+                record(spec, create_issue(session, spec.title, spec.body, spec.labels, spec.milestone))
+            except GitHubError as e:
+                print(f"{RED}✗ Failed to create {spec.key}: {e}{RESET}")
+        
+        run_concurrently(create_one, todo, args.workers)
+    return results
+
 
-def run_command(cmd: List[str], check: bool = True) -> subprocess.CompletedProcess:
-    """Run a shell command and return the result."""
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=check)
-        return result
-    except subprocess.CalledProcessError as e:
-        print(f"{RED}Error running command: {' '.join(cmd)}{RESET}")
-        print(f"{RED}Error: {e.stderr}{RESET}")
-        raise
+def repair_missing_ids(
+    session: GitHubSession, issues: Dict[str, Optional[CreatedIssue]], journal: RunJournal, workers: int
+):
+    """Resolve, in one pass, the node IDs of issues whose create response had none."""
+    missing = [created.number for created in issues.values() if created and not created.id]
+    if not missing:
+        return
+    print(f"\n{BLUE}Resolving node IDs for {len(missing)} issue(s)...{RESET}")
+    resolved = resolve_issue_ids(session, missing, workers=workers)
+    for key, created in issues.items():
+        if created and not created.id and created.number in resolved:
+            issues[key] = created._replace(id=resolved[created.number])
+            journal.record_issue(key, issues[key])
+    print(f"{GREEN}✓ Resolved {len(resolved)}/{len(missing)} node IDs{RESET}")
 
 
-def get_repo_info() -> Dict[str, str]:
-    """Get repository owner and name."""
-    result = run_command(["gh", "repo", "view", "--json", "owner,name"])
-    repo_data = json.loads(result.stdout)
-    return {
-        "owner": repo_data["owner"]["login"],
-        "name": repo_data["name"]
-    }
+def link_specs(
+    session: GitHubSession,
+    pairs: List[Tuple[str, str]],
+    issues: Dict[str, Optional[CreatedIssue]],
+    journal: RunJournal,
+    workers: int,
+    replace_parent: bool = False
+) -> int:
+    """Link (parent plan ID, child plan ID) pairs not linked yet; return how many were linked."""
+    todo = [
+        (parent_key, child_key) for parent_key, child_key in pairs
+        if issues.get(parent_key) and issues.get(child_key)
+        and issues[parent_key].id and issues[child_key].id
+        and not journal.is_linked(child_key, parent_key)
+    ]
+    
+    failed = add_sub_issues(
+        session, [(issues[parent_key].id, issues[child_key].id) for parent_key, child_key in todo],
+        replace_parent, workers, on_done=lambda index, _: journal.record_link(todo[index][1], todo[index][0])
+    )
+    if todo and len(failed) == len(todo) and "subIssueId" not in session.sub_issue_fields:
+        print(f"{RED}✗ Sub-issues are not available for {session.full_name}; {len(todo)} link(s) not made{RESET}")
+        print(f"{YELLOW}Link them manually in the GitHub UI, or rerun once sub-issues are enabled.{RESET}")
+        return 0
+    for index, error in sorted(failed.items()):
+        print(f"{RED}✗ Failed to link {todo[index][1]} to {todo[index][0]}: {error}{RESET}")
+    print(f"{GREEN}✓ Linked {len(todo) - len(failed)}/{len(todo)} sub-issue(s){RESET}")
+    return len(todo) - len(failed)
+
+
+def block_specs(
+    session: GitHubSession,
+    pairs: List[Tuple[str, str]],
+    issues: Dict[str, Optional[CreatedIssue]],
+    journal: RunJournal,
+    workers: int
+) -> int:
+    """Mark (plan ID, blocking plan ID) pairs as blocked-by relations; return how many were added.
+
+    Runs once every node ID is known, in alias-batched addBlockedBy
+    documents. Pairs already in the journal or missing an issue are skipped.
+    """
+    todo = [
+        (key, blocker_key) for key, blocker_key in pairs
+        if issues.get(key) and issues.get(blocker_key)
+        and issues[key].id and issues[blocker_key].id
+        and not journal.is_blocked(key, blocker_key)
+    ]
+    failed = add_blocked_by(
+        session, [(issues[key].id, issues[blocker].id) for key, blocker in todo], workers,
+        on_done=lambda index, _: journal.record_blocked_by(*todo[index])
+    )
+    for index, error in sorted(failed.items()):
+        print(f"{RED}✗ Failed to mark {todo[index][0]} as blocked by {todo[index][1]}: {error}{RESET}")
+    print(f"{GREEN}✓ Added {len(todo) - len(failed)}/{len(todo)} blocked-by relation(s){RESET}")
+    return len(todo) - len(failed)
+
+
+def _take_batch(source: "queue.Queue", size: int, timeout: float) -> List:
+    """Wait up to timeout for one item, then gather up to size items arriving within PIPELINE_LINGER."""
+    try:
+        batch = [source.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+    deadline = time.monotonic() + PIPELINE_LINGER
+    while len(batch) < size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(source.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
 
 
-def create_github_project(title: str, template: str = "scrum") -> str:
-    """Create a GitHub project and return its ID."""
-    print(f"{BLUE}Creating GitHub project: {title}...{RESET}")
+def run_pipeline(
+    session: GitHubSession,
+    entries: Callable[[], Iterator[PlanEntry]],
+    dependencies: Dict[str, List[str]],
+    journal: RunJournal,
+    args: argparse.Namespace,
+    link_children: bool = True
+) -> Tuple[Dict[str, Optional[CreatedIssue]], int, int]:
+    """Create every entry and its relations in one streaming create → relate pipeline.
+
+    An entry is released for creation as soon as what it needs exists: its
+    parent, and for a user story the stories it depends on. Each created
+    issue immediately releases its waiting entries, and every sub-issue link
+    or blocked-by relation whose two ends now exist flows on to the relate
+    stage, which batches relations as they arrive. Create and relate workers
+    run side by side, each stage fed through its own bounded queue, so
+    relations go out while issues are still being created; this thread
+    schedules. It never blocks on a full queue: released work waits in a
+    local backlog per stage while the thread keeps watching for worker
+    events, so a crashed or interrupted worker stops the run instead of
+    hanging it. entries() streams the plan's entries afresh on each call:
+    one pass keeps only per-key scheduling state (kind, parent, counters),
+    and a second is read just far enough to render the entries released so
+    far, when they are fed into the create queue. Returns (issue by plan
+    ID, links made, blocked-by relations made).
+    """
+    kind_of: Dict[str, str] = {}
+    parent_of: Dict[str, str] = {}
+    for entry in entries():
+        kind_of[entry.key] = entry.kind
+        if entry.parent:
+            parent_of[entry.key] = entry.parent
+    needs = {key: ([parent_of[key]] if key in parent_of else []) + dependencies.get(key, []) for key in kind_of}
+    topological_order(needs)  # a cycle would stall the pipeline: fail before starting
+    waiting = {key: len(keys) for key, keys in needs.items()}
+    dependents: Dict[str, List[str]] = {key: [] for key in kind_of}
+    for key, keys in needs.items():
+        for need in keys:
+            dependents[need].append(key)
+    
+    # Relations are (kind, key, other key): ("link", parent, child) or ("block", story, blocking story)
+    relations = [("link", parent, child) for child, parent in parent_of.items()] if link_children else []
+    relations += [("block", key, dep) for key, deps in dependencies.items() for dep in deps]
+    relations_of: Dict[str, List[Tuple[str, str, str]]] = {key: [] for key in kind_of}
+    for relation in relations:
+        relations_of[relation[1]].append(relation)
+        relations_of[relation[2]].append(relation)
+    
+    batch_size = args.batch_size if args.batch_size > 1 else 1
+    create_queue: "queue.Queue[IssueSpec]" = queue.Queue(maxsize=max(2 * args.workers * batch_size, 16))
+    relate_queue: "queue.Queue[Tuple]" = queue.Queue(maxsize=2 * args.workers * RELATION_BATCH_SIZE)
+    events: "queue.Queue[Tuple]" = queue.Queue()  # unbounded so workers never block reporting back
+    stop = threading.Event()
     
-    repo_info = get_repo_info()
+    def guarded(worker: Callable[[], None]) -> Callable[[], None]:
+        def run():
+            try:
+                worker()
+            except BaseException as e:
+                events.put(("crashed", e))
+        return run
+    
+    def create_worker():
+        while not stop.is_set():
+            batch = _take_batch(create_queue, batch_size, 0.1)
+            if not batch:
+                continue
+            # Costs are attributed per entry kind; a mixed batch goes to its most common kind
+            kinds = [kind_of[spec.key] for spec in batch]
+            session.stage = f"create:{max(set(kinds), key=kinds.count)}"
+            # Each issue is journaled as soon as it exists, so an interrupt later
+            # in the batch cannot lose it; a blank ID is looked up again on resume
+            if batch_size > 1:
+                results = create_issues_batched(
+                    session, batch, batch_size,
+                    on_created=lambda index, created: journal.record_issue(batch[index].key, created)
+                )
+            else:
+                results = []
+                for spec in batch:
+                    try:
+                        results.append(create_issue(session, spec.title, spec.body, spec.labels, spec.milestone))
+                    except GitHubError as e:
+                        print(f"{RED}✗ Failed to create {spec.key}: {e}{RESET}")
+                        results.append(None)
+                        continue
+                    journal.record_issue(spec.key, results[-1])
+            missing = [created.number for created in results if created and not created.id]
+            if missing:
+                resolved = resolve_issue_ids(session, missing)
+                results = [
+                    created._replace(id=resolved.get(created.number, "")) if created and not created.id else created
+                    for created in results
+                ]
+                for spec, created in zip(batch, results):
+                    if created and created.number in resolved:
+                        journal.record_issue(spec.key, created)
+            for spec, created in zip(batch, results):
+                events.put(("created", spec.key, created))
+    
+    def relate_worker():
+        while not stop.is_set():
+            batch = _take_batch(relate_queue, RELATION_BATCH_SIZE, 0.1)
+            if not batch:
+                continue
+            links = [(key, other, ids) for kind, key, other, ids in batch if kind == "link"]
+            blocks = [(key, other, ids) for kind, key, other, ids in batch if kind == "block"]
+            # A child kept from an earlier run may still hang under a parent since closed
+            session.stage = "relate:link"
+            failed_links = add_sub_issues(
+                session, [ids for _, _, ids in links], replace_parent=True,
+                on_done=lambda index, _: journal.record_link(links[index][1], links[index][0])
+            ) if links else {}
+            for index, error in sorted(failed_links.items()):
+                print(f"{RED}✗ Failed to link {links[index][1]} to {links[index][0]}: {error}{RESET}")
+            session.stage = "relate:block"
+            failed_blocks = add_blocked_by(
+                session, [ids for _, _, ids in blocks],
+                on_done=lambda index, _: journal.record_blocked_by(blocks[index][0], blocks[index][1])
+            ) if blocks else {}
+            for index, error in sorted(failed_blocks.items()):
+                print(f"{RED}✗ Failed to mark {blocks[index][0]} as blocked by {blocks[index][1]}: {error}{RESET}")
+            events.put(("related", len(links) - len(failed_links), len(blocks) - len(failed_blocks), len(batch)))
+    
+    threads = [threading.Thread(target=guarded(create_worker), daemon=True) for _ in range(args.workers)]
+    threads += [threading.Thread(target=guarded(relate_worker), daemon=True) for _ in range(args.workers)]
+    for thread in threads:
+        thread.start()
+    
+    issues: Dict[str, Optional[CreatedIssue]] = {}
+    counts = {"link": 0, "block": 0, "emitted": 0, "finished": 0}
+    resolved: List[Tuple[str, Optional[CreatedIssue]]] = []
+    unresolved: List[Tuple[str, CreatedIssue]] = []
+    to_create: "deque[str]" = deque()
+    to_relate: "deque[Tuple]" = deque()
+    # Entries read from the second pass ahead of their release, until they are rendered
+    stream = entries()
+    read_ahead: Dict[str, PlanEntry] = {}
+    
+    def render(key: str) -> IssueSpec:
+        while key not in read_ahead:
+            entry = next(stream)
+            read_ahead[entry.key] = entry
+        return read_ahead.pop(key).spec()
+    
+    def release(key: str):
+        created = journal.created(key)
+        if created and created.id:
+            resolved.append((key, created))  # made by an earlier run: no call needed
+        elif created:
+            unresolved.append((key, created))  # made by an earlier run without its node ID: never recreate it
+        else:
+            to_create.append(key)
+    
+    def resolve_journaled():
+        ids = resolve_issue_ids(session, [created.number for _, created in unresolved])
+        for key, created in unresolved:
+            if created.number in ids:
+                created = created._replace(id=ids[created.number])
+                journal.record_issue(key, created)
+            resolved.append((key, created))
+        unresolved.clear()
+    
+    def settle(key: str, created: Optional[CreatedIssue]):
+        issues[key] = created
+        read_ahead.pop(key, None)  # journaled by an earlier run: never rendered
+        for kind, first, second in relations_of[key]:
+            ends = [issues.get(first), issues.get(second)]
+            if not all(end and end.id for end in ends):
+                continue
+            done = journal.is_linked(second, first) if kind == "link" else journal.is_blocked(first, second)
+            if not done:
+                counts["emitted"] += 1
+                to_relate.append((kind, first, second, (ends[0].id, ends[1].id)))
+        for dependent in dependents[key]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                release(dependent)
+    
+    def feed():
+        """Move backlog into each worker queue while it has room; only this thread puts."""
+        while to_create and not create_queue.full():
+            create_queue.put_nowait(render(to_create.popleft()))
+        while to_relate and not relate_queue.full():
+            relate_queue.put_nowait(to_relate.popleft())
     
-    # Try using gh project create (for Projects v2)
     try:
-        result = run_command(
-            ["gh", "project", "create", title, "--format", "json"],
-            check=False
-        )
-        if result.returncode == 0:
+        for key in kind_of:
+            if waiting[key] == 0:
+                release(key)
+        while len(issues) < len(kind_of) or counts["finished"] < counts["emitted"]:
+            while resolved or unresolved:
+                if unresolved:
+                    resolve_journaled()
+                settle(*resolved.pop())
+            if len(issues) == len(kind_of) and counts["finished"] == counts["emitted"]:
+                break
+            feed()
             try:
-                project_data = json.loads(result.stdout)
-                project_id = project_data.get("id") or project_data.get("number")
-                if project_id:
-                    print(f"{GREEN}✓ Created project: {title} (ID: {project_id}){RESET}")
-                    return str(project_id)
-            except json.JSONDecodeError:
-                pass
-    except:
-        pass
+                event = events.get(timeout=PIPELINE_LINGER if to_create or to_relate else None)
+            except queue.Empty:
+                continue
+            if event[0] == "crashed":
+                raise event[1]
+            if event[0] == "created":
+                resolved.append(event[1:])
+            else:
+                counts["link"] += event[1]
+                counts["block"] += event[2]
+                counts["finished"] += event[3]
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return issues, counts["link"], counts["block"]
+
+
+def ensure_milestones(session: GitHubSession, plan: Plan, sprint_start: str, workers: int = 1) -> Dict[str, Milestone]:
+    """Create the sprint milestones missing from the repository and return every sprint's, by plan key.
+
+    A sprint's milestone carries its title, its goal as description and a
+    due date at the end of its SPRINT_DAYS window from sprint_start (the
+    windows of the project's Sprint iterations). Existing milestones are
+    listed in one paginated call and matched by title; only the missing
+    ones are created, concurrently.
+    """
+    existing: Dict[str, Milestone] = {}
+    with METRICS.timer("fetch"):
+        for milestone in session.transport.paginate(f"repos/{session.full_name}/milestones?state=all"):
+            existing[milestone["title"]] = Milestone(milestone["number"], milestone["node_id"])
+    
+    start = datetime.strptime(sprint_start, "%Y-%m-%d")
+    missing = [(i, sprint) for i, sprint in enumerate(plan.sprints) if sprint["title"] not in existing]
+    
+    def create_milestone(item: Tuple[int, Dict]) -> Milestone:
+        i, sprint = item
+        due = start + timedelta(days=SPRINT_DAYS * (i + 1) - 1)
+        with METRICS.timer("milestone"):
+            milestone = session.transport.rest("POST", f"repos/{session.full_name}/milestones", {
+                "title": sprint["title"],
+                "description": f"Goal: {sprint['goal']}" if sprint["goal"] else "",
+                "due_on": due.strftime("%Y-%m-%dT23:59:59Z"),
+            })
+        print(f"{GREEN}✓ Created milestone: {sprint['title']} (due {due:%Y-%m-%d}){RESET}")
+        return Milestone(milestone["number"], milestone["node_id"])
     
-    # Fallback: Use GraphQL API
-    print(f"{YELLOW}Using GraphQL API to create project...{RESET}")
-    # Note: This requires getting the owner's node ID first
-    # For simplicity, we'll just create issues and link them manually
-    print(f"{YELLOW}Project creation skipped. Issues will be created without project assignment.{RESET}")
-    return ""
+    for (_, sprint), milestone in zip(missing, run_concurrently(create_milestone, missing, workers)):
+        existing[sprint["title"]] = milestone
+    print(f"{GREEN}✓ Sprint milestones ready: {len(plan.sprints) - len(missing)} existing, "
+          f"{len(missing)} created{RESET}")
+    return {sprint_key(sprint): existing[sprint["title"]] for sprint in plan.sprints}
+
+
+def sprint_milestones(session: GitHubSession, args: argparse.Namespace, plan: Plan) -> Optional[Dict[str, Milestone]]:
+    """Set up the sprint milestones with --sprint-mode milestones; None when sprints are issues."""
+    if args.sprint_mode != "milestones":
+        return None
+    session.stage = "milestones"
+    print(f"\n{BLUE}Setting up sprint milestones...{RESET}")
+    return ensure_milestones(session, plan, args.sprint_start, args.workers)
+
+
+def setup_project(session: GitHubSession, args: argparse.Namespace, plan: Plan) -> Optional[Project]:
+    """Step 1 of a seed: find or create the project board, unless --no-project."""
+    if args.no_project:
+        return None
+    session.stage = "project"
+    print(f"\n{BLUE}Step 1: Setting up GitHub Project...{RESET}")
+    return ensure_project(session, PROJECT_TITLE, plan, args.sprint_start)
 
 
-def create_issue(title: str, body: str, labels: Optional[List[str]] = None) -> str:
-    """Create a GitHub issue and return its node ID."""
-    repo_info = get_repo_info()
+def seed(
+    session: GitHubSession,
+    args: argparse.Namespace,
+    journal: RunJournal,
+    plan: Plan,
+    project: Optional[Project],
+    dependencies: Optional[Dict[str, List[str]]] = None
+) -> Dict[str, Optional[CreatedIssue]]:
+    """Create the whole plan: EPICs, User Stories, Sprints and Tasks, linked as they are created.
+
+    project is the board from setup_project(), set up first so a token
+    without the project scope shows before any issue is written.
+    dependencies defaults to story_dependencies(plan). Returns every
+    issue by plan ID.
+    """
+    link_children = "subIssueId" in session.sub_issue_fields
+    if not link_children:
+        print(f"{YELLOW}⚠ Sub-issues are not available for {session.full_name}; issues will be created "
+              f"without parent links. Link them manually in the GitHub UI.{RESET}")
     
-    # Create issue using gh CLI
-    cmd = ["gh", "issue", "create", "--title", title, "--body", body]
-    if labels:
-        # Create labels if they don't exist (ignore errors)
-        for label in labels:
-            try:
-                run_command(["gh", "label", "create", label, "--force"], check=False)
-            except:
-                pass
-        cmd.extend(["--label", ",".join(labels)])
-    
-    result = run_command(cmd)
-    
-    # Extract issue number from output
-    output = result.stdout.strip()
-    issue_number = None
-    
-    # Try different patterns to extract issue number
-    if "#" in output:
-        parts = output.split("#")
-        for part in parts:
-            if part.strip().isdigit():
-                issue_number = part.strip()
-                break
+    # Provision labels once instead of upserting them for every issue
+    milestones = sprint_milestones(session, args, plan)
+    session.stage = "labels"
+    print(f"\n{BLUE}Provisioning labels...{RESET}")
+    ensure_labels(session, plan_label_usage(plan, milestones is None), args.workers)
     
-    if not issue_number:
-        # Try parsing from stderr or different format
-        if "created" in output.lower():
-            words = output.split()
-            for word in words:
-                if word.startswith("#") and word[1:].isdigit():
-                    issue_number = word[1:]
-                    break
+    # Entries are streamed rather than held: this pass only counts them by kind
+    totals: Dict[str, int] = {}
+    already = 0
+    for entry in plan_entries(plan, milestones):
+        totals[entry.kind] = totals.get(entry.kind, 0) + 1
+        already += bool(journal.created(entry.key))
     
-    if not issue_number:
-        print(f"{RED}Failed to extract issue number from: {output}{RESET}")
-        print(f"{YELLOW}Issue may have been created. Check manually.{RESET}")
-        return ""
+    # Parents release their children, and created issues flow straight into linking
+    mode = f"batches of {args.batch_size}" if args.batch_size > 1 else "one call per issue"
+    print(f"\n{BLUE}Step 2: Creating and linking {sum(totals.values())} issues "
+          f"({args.workers} worker(s) per stage, {mode})...{RESET}")
+    if already:
+        print(f"{YELLOW}Skipping {already} already created{RESET}")
+    if dependencies is None:
+        dependencies = story_dependencies(plan)
+    issues, linked, blocked = run_pipeline(
+        session, lambda: plan_entries(plan, milestones), dependencies, journal, args, link_children
+    )
     
-    # Get issue node ID using GraphQL
-    query = """
-    query GetIssue($owner: String!, $repo: String!, $number: Int!) {
-      repository(owner: $owner, name: $repo) {
-        issue(number: $number) {
-          id
-          number
-        }
-      }
-    }
+    if project:
+        session.stage = "project"
+        print(f"\n{BLUE}Step 3: Adding issues to project #{project.number} and setting "
+              f"Sprint, Priority and Estimate...{RESET}")
+        items, values = populate_project(session, project, plan, issues, args.workers)
+    
+    made: Dict[str, int] = {}
+    for entry in plan_entries(plan, milestones):
+        made[entry.kind] = made.get(entry.kind, 0) + bool(issues.get(entry.key))
+    
+    def created(kind: str) -> str:
+        return f"{made.get(kind, 0)}/{totals.get(kind, 0)}"
+    
+    # Summary
+    print(f"\n{GREEN}{'='*60}{RESET}")
+    print(f"{GREEN}✓ Creation Complete!{RESET}")
+    print(f"{GREEN}{'='*60}{RESET}")
+    print(f"{GREEN}Summary for {session.full_name}:{RESET}")
+    print(f"  {GREEN}✓ EPICs created: {created('epic')}{RESET}")
+    print(f"  {GREEN}✓ User Stories created: {created('story')}{RESET}")
+    if milestones is None:
+        print(f"  {GREEN}✓ Sprints created: {created('sprint')}{RESET}")
+    else:
+        print(f"  {GREEN}✓ Sprint milestones: {len(milestones)}{RESET}")
+    print(f"  {GREEN}✓ Tasks created: {created('task')}{RESET}")
+    print(f"  {GREEN}✓ Sub-issues linked: {linked}{RESET}")
+    print(f"  {GREEN}✓ Dependencies recorded: {blocked}{RESET}")
+    if project:
+        print(f"  {GREEN}✓ Project items: {items}, field values set: {values} ({project.url}){RESET}")
+    print(f"{GREEN}{'='*60}{RESET}\n")
+    return issues
+
+
+def load_repo_map(path: str) -> Dict[str, str]:
+    """Read a --repo-map file: a JSON object of plan ID (or "default") to OWNER/NAME."""
+    with open(path, encoding="utf-8") as f:
+        repo_map = json.load(f)
+    if not isinstance(repo_map, dict):
+        raise ValueError("expected a JSON object")
+    bad = [key for key, repo in repo_map.items() if not isinstance(repo, str) or "/" not in repo]
+    if bad:
+        raise ValueError(f"not OWNER/NAME for {', '.join(bad)}")
+    return repo_map
+
+
+def split_plan(plan: Plan, repo_map: Dict[str, str], default: Optional[str] = None) -> Dict[str, Plan]:
+    """Split the plan into one sub-plan per target repository, in plan order.
+
+    An EPIC goes to repo_map["Epic N"] with its user stories and a sprint to
+    repo_map["Sprint N"] with its tasks, so every sub-issue stays next to
+    its parent. Everything unmapped goes to repo_map["default"], else default.
     """
+    default = repo_map.get("default", default)
+    epic_ids = [plan_id(epic["title"]) or epic["title"] for epic in plan.epics]
+    sprint_ids = [sprint_key(sprint) for sprint in plan.sprints]
+    unknown = sorted(set(repo_map) - set(epic_ids) - set(sprint_ids) - {"default"})
+    if unknown:
+        raise ValueError(f"plan IDs not in the plan: {', '.join(unknown)}")
     
-    variables = {
-        "owner": repo_info["owner"],
-        "repo": repo_info["name"],
-        "number": int(issue_number)
-    }
+    targets: Dict[str, Plan] = {}
     
+    def target(key: str) -> Plan:
+        repo = repo_map.get(key, default)
+        if not repo:
+            raise ValueError(f'{key} has no repository; add it or "default" to the map, or pass --repo')
+        return targets.setdefault(repo, Plan([], []))
+    
+    for key, epic in zip(epic_ids, plan.epics):
+        target(key).epics.append(epic)
+    for key, sprint in zip(sprint_ids, plan.sprints):
+        target(key).sprints.append(sprint)
+    return targets
+
+
+def seed_repositories(transport: Transport, args: argparse.Namespace, plan: Plan, targets: Dict[str, Plan]):
+    """Seed every target repository of a split plan concurrently.
+
+    All repositories share the transport, so one rate governor, one retry
+    policy and one run report cover the whole fan-out, and gh and auth are
+    checked once. The project board is set up once and shared. Dependencies
+    between stories in the same repository are recorded by its pipeline;
+    the ones that cross repositories once every repository is seeded. On
+    Ctrl-C the shared rate governor is cancelled, so every repository's
+    pipeline stops after its calls in flight instead of running to the end.
+    """
+    repos = list(targets)
+    graph = story_dependencies(plan)
+    home = {us["id"]: repo for repo, part in targets.items() for epic in part.epics for us in epic["user_stories"]}
+    project = setup_project(GitHubSession(transport, repo=repos[0]), args, plan)
+    journals = {repo: RunJournal(None if args.no_journal or args.dry_run else args.journal, repo) for repo in repos}
+    sessions: Dict[str, GitHubSession] = {}
+    
+    def seed_one(repo: str) -> Optional[Dict[str, Optional[CreatedIssue]]]:
+        # Created in the seeding thread, which then owns the session's stage
+        session = sessions[repo] = GitHubSession(transport, repo=repo)
+        local = {us: [dep for dep in deps if home[dep] == repo] for us, deps in graph.items() if home[us] == repo}
+        try:
+            return seed(session, args, journals[repo], targets[repo], project, local)
+        except GitHubError as e:
+            print(f"{RED}✗ Seeding {repo} failed: {e}{RESET}")
+            return None
+    
+    pool = ThreadPoolExecutor(max_workers=len(repos))
     try:
-        cmd = [
-            "gh", "api", "graphql",
-            "-f", f"query={query}",
-            "-f", f"variables={json.dumps(variables)}"
-        ]
+        futures = [pool.submit(seed_one, repo) for repo in repos]
+        try:
+            results = {repo: future.result() for repo, future in zip(repos, futures)}
+        except KeyboardInterrupt:
+            if getattr(transport, "governor", None):
+                transport.governor.cancel()
+            raise
+        finally:
+            pool.shutdown(cancel_futures=True)
         
-        result = run_command(cmd)
-        data = json.loads(result.stdout)
-        issue_id = data.get("data", {}).get("repository", {}).get("issue", {}).get("id", "")
-        
-        if issue_id:
-            print(f"{GREEN}✓ Created issue #{issue_number}: {title[:50]}...{RESET}")
-            return issue_id
+        # Stories blocked by a story in another repository, once both exist
+        cross: Dict[str, List[Tuple[str, str]]] = {}
+        for us, deps in graph.items():
+            for dep in deps:
+                if home[dep] != home[us] and not journals[home[us]].is_blocked(us, dep):
+                    cross.setdefault(home[us], []).append((us, dep))
+        blocked = 0
+        for repo, edges in cross.items():
+            issue = {us: (results[repo] or {}).get(us) for us, _ in edges}
+            blocker = {dep: (results[home[dep]] or {}).get(dep) for _, dep in edges}
+            ready = [(us, dep) for us, dep in edges if issue[us] and issue[us].id and blocker[dep] and blocker[dep].id]
+            sessions[repo].stage = "dependencies"
+            failed = add_blocked_by(
+                sessions[repo], [(issue[us].id, blocker[dep].id) for us, dep in ready], args.workers,
+                on_done=lambda index, _, ready=ready, repo=repo: journals[repo].record_blocked_by(*ready[index])
+            )
+            for index, error in sorted(failed.items()):
+                print(f"{RED}✗ Failed to mark {ready[index][0]} blocked by {ready[index][1]}: {error}{RESET}")
+            blocked += len(ready) - len(failed)
+    finally:
+        for journal in journals.values():
+            journal.close()
+    
+    print(f"\n{GREEN}{'='*60}{RESET}")
+    print(f"{GREEN}✓ Fan-out Complete: {len(repos)} repositories{RESET}")
+    for repo in repos:
+        total = sum(1 for entry in plan_entries(targets[repo])
+                    if entry.kind != "sprint" or args.sprint_mode == "issues")
+        if results[repo] is None:
+            print(f"  {RED}✗ {repo}: failed{RESET}")
         else:
-            print(f"{YELLOW}⚠ Created issue #{issue_number} but couldn't get node ID: {title[:50]}...{RESET}")
-            return f"ISSUE_{issue_number}"  # Fallback identifier
-    except Exception as e:
-        print(f"{YELLOW}⚠ Created issue #{issue_number} but error getting node ID: {e}{RESET}")
-        return f"ISSUE_{issue_number}"  # Fallback identifier
+            print(f"  {GREEN}✓ {repo}: {count_created(results[repo])}/{total} issues{RESET}")
+    if cross:
+        print(f"  {GREEN}✓ Cross-repository dependencies recorded: {blocked}/"
+              f"{sum(len(edges) for edges in cross.values())}{RESET}")
+    print(f"{GREEN}{'='*60}{RESET}\n")
 
 
-def add_sub_issue(parent_id: str, child_id: str) -> bool:
-    """Link a child issue to a parent issue using GitHub's sub-issue feature."""
-    # Skip if IDs are not valid node IDs
-    if not parent_id or not child_id or parent_id.startswith("ISSUE_") or child_id.startswith("ISSUE_"):
-        return False
-    
-    # Try using updateIssue mutation with parentId
-    mutation = """
-    mutation UpdateIssue($input: UpdateIssueInput!) {
-      updateIssue(input: $input) {
-        issue {
-          id
+# Plan IDs lead every title: "Epic 3:", "Sprint 3:", "US-CAT-03:", "[Front]-065:"
+PLAN_ID_RE = re.compile(r"^\s*(Epic \d+|Sprint \d+|\[?[A-Za-z]+\]?(?:-[A-Za-z0-9]+)+)\s*:")
+
+
+def plan_id(title: str) -> Optional[str]:
+    """Return the plan ID prefix of an issue title, if it has one."""
+    match = PLAN_ID_RE.match(title)
+    return match.group(1) if match else None
+
+
+def content_hash(title: str, body: str, labels: Iterable[str]) -> str:
+    """Hash the fields sync compares, normalized the way GitHub stores them."""
+    normalized = "\x00".join([
+        title.strip(),
+        (body or "").replace("\r\n", "\n").strip(),
+        ",".join(sorted(labels)),
+    ])
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def fetch_existing_issues(session: GitHubSession, page_size: int = 100) -> Iterator[Dict]:
+    """Yield every issue in the repository using cursor-paginated GraphQL."""
+    query = """
+    query($owner: String!, $name: String!, $first: Int!, $after: String) {
+      repository(owner: $owner, name: $name) {
+        issues(first: $first, after: $after, states: [OPEN, CLOSED], orderBy: {field: CREATED_AT, direction: ASC}) {
+          pageInfo { hasNextPage endCursor }
+          nodes {
+            id
+            number
+            url
+            title
+            body
+            state
+            stateReason
+            labels(first: 50) { nodes { name } }
+            milestone { number }
+            parent { id }
+            blockedBy(first: 50) { nodes { id } }
+          }
         }
       }
     }
     """
-    
-    variables = {
-        "input": {
-            "id": child_id,
-            "parentId": parent_id
+    after = None
+    while True:
+        with METRICS.timer("fetch"):
+            data = session.transport.graphql(query, {
+                "owner": session.owner, "name": session.name, "first": page_size, "after": after
+            })
+        if data.get("errors"):
+            raise GitHubError(f"Listing issues failed: {data['errors']}")
+        page = data["data"]["repository"]["issues"]
+        yield from page["nodes"]
+        if not page["pageInfo"]["hasNextPage"]:
+            return
+        after = page["pageInfo"]["endCursor"]
+
+
+def list_issues(session: GitHubSession) -> Iterator[Dict]:
+    """Yield every issue in the repository like fetch_existing_issues(), without parent and blockedBy.
+
+    Listed over REST (pull requests skipped) or GraphQL, whichever budget
+    has more headroom for it.
+    """
+    if session.route("fetch", {"core": 1, "graphql": 2}) == "graphql":
+        yield from fetch_existing_issues(session)
+        return
+    for issue in session.transport.paginate(f"repos/{session.full_name}/issues?state=all"):
+        if "pull_request" in issue:
+            continue
+        yield {
+            "id": issue["node_id"],
+            "number": issue["number"],
+            "url": issue["html_url"],
+            "title": issue["title"],
+            "body": issue.get("body") or "",
+            "state": issue["state"].upper(),
+            "stateReason": (issue.get("state_reason") or "").upper() or None,
+            "labels": {"nodes": [{"name": label["name"]} for label in issue["labels"]]},
         }
+
+
+def closed_as_not_planned(node: Dict) -> bool:
+    """Whether a fetched issue was closed as not planned, as teardown closes the plan's issues."""
+    return node["state"] == "CLOSED" and node.get("stateReason") == "NOT_PLANNED"
+
+
+def issue_summary(node: Dict, plan_labels: Iterable[str]) -> Dict:
+    """Reduce a fetched issue to what sync compares and writes, dropping its body.
+
+    hash is the content_hash() of its title, body and the labels among
+    plan_labels; milestone is its milestone's number, parent and blocked_by
+    hold node IDs.
+    """
+    labels = [label["name"] for label in node["labels"]["nodes"]]
+    managed = [label for label in labels if label in plan_labels]
+    return {
+        "id": node["id"],
+        "number": node["number"],
+        "url": node["url"],
+        "state": node["state"],
+        "labels": labels,
+        "hash": content_hash(node["title"], node["body"], managed),
+        "milestone": (node.get("milestone") or {}).get("number"),
+        "parent": (node.get("parent") or {}).get("id"),
+        "blocked_by": {blocker["id"] for blocker in ((node.get("blockedBy") or {}).get("nodes") or [])},
     }
+
+
+def update_issue(
+    session: GitHubSession, number: int, title: str, body: str, labels: List[str],
+    milestone: Optional[Milestone] = None
+):
+    """Overwrite an issue's title, body and labels, and its milestone if given."""
+    payload: Dict[str, Any] = {"title": title, "body": body, "labels": labels}
+    if milestone:
+        payload["milestone"] = milestone.number
+    with METRICS.timer("update"):
+        session.transport.rest("PATCH", f"repos/{session.full_name}/issues/{number}", payload)
+    print(f"{GREEN}✓ Updated issue #{number}: {title[:50]}...{RESET}")
+
+
+def sync(session: GitHubSession, args: argparse.Namespace, journal: RunJournal, plan: Plan):
+    """Bring the repository in line with the plan, writing only what differs.
+
+    Existing issues are fetched once, page by page, and matched to plan
+    entries by the plan ID prefix of their title; only a summary of each
+    matched issue is kept, never its body. Issues closed as not planned (by
+    a teardown, or by hand) are not matched, so their entries are created
+    again. Missing entries are created, entries whose title, body or plan
+    labels changed are updated, children whose parent differs are re-linked
+    and missing story dependencies are added. With --sprint-mode
+    milestones, tasks outside their sprint's milestone are updated too.
+    Labels the plan does not manage are kept.
+    """
+    milestones = sprint_milestones(session, args, plan)
+    session.stage = "labels"
+    print(f"\n{BLUE}Provisioning labels...{RESET}")
+    ensure_labels(session, plan_label_usage(plan, milestones is None), args.workers)
+    plan_labels = set(session.label_ids)
     
-    cmd = [
-        "gh", "api", "graphql",
-        "-f", f"query={mutation}",
-        "-f", f"variables={json.dumps(variables)}"
-    ]
+    session.stage = "fetch"
+    print(f"\n{BLUE}Fetching existing issues...{RESET}")
+    existing: Dict[str, Dict] = {}
+    fetched = 0
+    for node in fetch_existing_issues(session):
+        fetched += 1
+        key = plan_id(node["title"])
+        if closed_as_not_planned(node):
+            continue
+        # The oldest open issue wins on duplicates, over one closed as completed
+        if key and (key not in existing or existing[key]["state"] == "CLOSED" and node["state"] == "OPEN"):
+            existing[key] = issue_summary(node, plan_labels)
+    print(f"{GREEN}✓ Fetched {fetched} issue(s), {len(existing)} with a plan ID{RESET}")
     
-    try:
-        result = run_command(cmd, check=False)
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            if data.get("data", {}).get("updateIssue", {}).get("issue"):
-                return True
+    # Each entry is rendered once to compare it, then only the entry itself is kept
+    entries = list(plan_entries(plan, milestones))
+    issues: Dict[str, Optional[CreatedIssue]] = {}
+    found: Dict[str, Dict] = {}
+    planned_ids = set()
+    to_create: List[PlanEntry] = []
+    to_update: List[Tuple[PlanEntry, Dict]] = []
+    for entry in entries:
+        spec = entry.spec()
+        planned_ids.add(plan_id(spec.title))
+        current = existing.get(plan_id(spec.title))
+        if current is None:
+            to_create.append(entry)
+            continue
+        found[entry.key] = current
+        issues[entry.key] = CreatedIssue(current["number"], current["id"], current["url"])
+        if journal.created(entry.key) != issues[entry.key]:
+            journal.record_issue(entry.key, issues[entry.key])
+        if current["hash"] != content_hash(spec.title, spec.body, spec.labels) or (
+            entry.milestone and current["milestone"] != entry.milestone.number
+        ):
+            to_update.append((entry, current))
+    
+    stale = sorted(key for key in existing if key not in planned_ids)
+    print(f"{BLUE}Plan diff: {len(to_create)} to create, {len(to_update)} to update, "
+          f"{len(entries) - len(to_create) - len(to_update)} unchanged{RESET}")
+    
+    if to_create:
+        session.stage = "create"
+        print(f"\n{BLUE}Creating {len(to_create)} issue(s)...{RESET}")
+        issues.update(create_specs(session, to_create, journal, args))
+    
+    if to_update:
+        session.stage = "update"
+        print(f"\n{BLUE}Updating {len(to_update)} issue(s)...{RESET}")
         
-        # Try alternative: use addSubIssue mutation (if available)
-        mutation = """
-        mutation AddSubIssue($input: AddSubIssueInput!) {
-          addSubIssue(input: $input) {
-            issue {
-              id
-            }
-          }
-        }
-        """
-        variables = {
-            "input": {
-                "parentId": parent_id,
-                "childId": child_id
-            }
-        }
-        cmd = [
-            "gh", "api", "graphql",
-            "-f", f"query={mutation}",
-            "-f", f"variables={json.dumps(variables)}"
-        ]
-        result = run_command(cmd, check=False)
-        if result.returncode == 0:
-            return True
+        def update(item: Tuple[PlanEntry, Dict]):
+            entry, current = item
+            spec = entry.spec()
+            keep = [label for label in current["labels"] if label not in plan_labels]
+            try:
+                update_issue(session, current["number"], spec.title, spec.body, keep + spec.labels, spec.milestone)
+            except GitHubError as e:
+                print(f"{RED}✗ Failed to update #{current['number']} ({spec.key}): {e}{RESET}")
         
+        run_concurrently(update, to_update, args.workers)
+    
+    session.stage = "resolve"
+    repair_missing_ids(session, issues, journal, args.workers)
+    
+    # Only children whose current parent differs from the planned one are linked
+    relink = []
+    for entry in entries:
+        if entry.parent is None or not issues.get(entry.parent):
+            continue
+        if (found.get(entry.key) or {}).get("parent") != issues[entry.parent].id:
+            relink.append((entry.parent, entry.key))
+            journal.links.pop(entry.key, None)
+    linked = 0
+    if relink:
+        session.stage = "links"
+        print(f"\n{BLUE}Linking {len(relink)} sub-issue(s)...{RESET}")
+        linked = link_specs(session, relink, issues, journal, args.workers, replace_parent=True)
+    
+    # Dependencies are added where the fetched blocked-by list lacks them
+    unblocked = []
+    for key, deps in story_dependencies(plan).items():
+        current = (found.get(key) or {}).get("blocked_by") or set()
+        for dep in deps:
+            if issues.get(dep) and issues[dep].id not in current:
+                unblocked.append((key, dep))
+                journal.blocked.discard((key, dep))
+    blocked = 0
+    if unblocked:
+        session.stage = "dependencies"
+        print(f"\n{BLUE}Recording {len(unblocked)} story dependency(ies)...{RESET}")
+        blocked = block_specs(session, unblocked, issues, journal, args.workers)
+    
+    print(f"\n{GREEN}{'='*60}{RESET}")
+    print(f"{GREEN}✓ Sync Complete!{RESET}")
+    print(f"  {GREEN}✓ Created: {count_created({entry.key: issues.get(entry.key) for entry in to_create})}/{len(to_create)}{RESET}")
+    print(f"  {GREEN}✓ Updated: {len(to_update)}{RESET}")
+    print(f"  {GREEN}✓ Links changed: {linked}/{len(relink)}{RESET}")
+    print(f"  {GREEN}✓ Dependencies added: {blocked}/{len(unblocked)}{RESET}")
+    if stale:
+        print(f"  {YELLOW}⚠ {len(stale)} issue(s) no longer in the plan: {', '.join(stale[:10])}"
+              f"{' ...' if len(stale) > 10 else ''}{RESET}")
+    print(f"{GREEN}{'='*60}{RESET}\n")
+
+
+def confirm(question: str) -> bool:
+    """Ask a yes/no question on the terminal; anything but yes, or no terminal, is a no."""
+    if not sys.stdin.isatty():
+        print(f"{RED}Error: {question} Pass --yes to confirm without a terminal.{RESET}")
         return False
-    except Exception as e:
-        # Silently fail - sub-issues might not be supported in this GitHub plan
-        return False
+    return input(f"{YELLOW}{question} [y/N] {RESET}").strip().lower() in ("y", "yes")
 
 
-# EPICs Data
-EPICS = [
-    {
-        "title": "Epic 1: Identity & Access Management",
-        "body": """## Priority: P0
-
-Complete identity and access management system for users, restaurants, and drivers.
-
-### Scope
-- User registration and authentication
-- Profile management
-- Delivery address management
-- Payment method management
-""",
-        "user_stories": [
-            {
-                "id": "US-AUTH-01",
-                "title": "As a user, I can register with email/phone + OTP",
-                "priority": "P0",
-                "dependencies": "None"
-            },
-            {
-                "id": "US-AUTH-02",
-                "title": "As a user, I can login and receive JWT tokens",
-                "priority": "P0",
-                "dependencies": "US-AUTH-01"
-            },
-            {
-                "id": "US-AUTH-03",
-                "title": "As a user, I can reset my password",
-                "priority": "P1",
-                "dependencies": "US-AUTH-01"
-            },
-            {
-                "id": "US-AUTH-04",
-                "title": "As a user, I can manage my profile",
-                "priority": "P1",
-                "dependencies": "US-AUTH-02"
-            },
-            {
-                "id": "US-AUTH-05",
-                "title": "As a user, I can manage delivery addresses",
-                "priority": "P0",
-                "dependencies": "US-AUTH-02"
-            },
-            {
-                "id": "US-AUTH-06",
-                "title": "As a user, I can add payment methods",
-                "priority": "P0",
-                "dependencies": "US-AUTH-02"
-            }
-        ]
-    },
-    {
-        "title": "Epic 2: Restaurant & Menu Catalog",
-        "body": """## Priority: P0
-
-Restaurant registration and menu management system.
-
-### Scope
-- Restaurant registration
-- Menu category management
-- Menu item management with variants
-- Restaurant status management
-""",
-        "user_stories": [
-            {
-                "id": "US-CAT-01",
-                "title": "As a restaurant owner, I can register my restaurant",
-                "priority": "P0",
-                "dependencies": "US-AUTH-01"
-            },
-            {
-                "id": "US-CAT-02",
-                "title": "As a restaurant owner, I can manage menu categories",
-                "priority": "P0",
-                "dependencies": "US-CAT-01"
-            },
-            {
-                "id": "US-CAT-03",
-                "title": "As a restaurant owner, I can manage menu items with variants",
-                "priority": "P0",
-                "dependencies": "US-CAT-02"
-            },
-            {
-                "id": "US-CAT-04",
-                "title": "As a restaurant owner, I can toggle accepting orders",
-                "priority": "P0",
-                "dependencies": "US-CAT-01"
-            },
-            {
-                "id": "US-CAT-05",
-                "title": "As a customer, I can view restaurant details and menu",
-                "priority": "P0",
-                "dependencies": "US-CAT-03"
-            }
-        ]
-    },
-    {
-        "title": "Epic 3: Search & Discovery",
-        "body": """## Priority: P0
-
-Restaurant search and discovery features.
-
-### Scope
-- Geo-based restaurant search
-- Filtering and sorting
-- Search result pagination
-""",
-        "user_stories": [
-            {
-                "id": "US-SEARCH-01",
-                "title": "As a customer, I can search restaurants by location",
-                "priority": "P0",
-                "dependencies": "US-CAT-01"
-            },
-            {
-                "id": "US-SEARCH-02",
-                "title": "As a customer, I can filter by rating, distance, open status",
-                "priority": "P0",
-                "dependencies": "US-SEARCH-01"
-            },
-            {
-                "id": "US-SEARCH-03",
-                "title": "As a customer, I can see search results with pagination",
-                "priority": "P1",
-                "dependencies": "US-SEARCH-01"
-            }
-        ]
-    },
-    {
-        "title": "Epic 4: Order Management",
-        "body": """## Priority: P0
-
-Complete order management system for customers and restaurants.
-
-### Scope
-- Cart management
-- Order placement
-- Order status management
-- Order history
-- Order cancellation
-""",
-        "user_stories": [
-            {
-                "id": "US-ORD-01",
-                "title": "As a customer, I can add items to cart",
-                "priority": "P0",
-                "dependencies": "US-CAT-05"
-            },
-            {
-                "id": "US-ORD-02",
-                "title": "As a customer, I can apply coupon codes",
-                "priority": "P0",
-                "dependencies": "US-ORD-01"
-            },
-            {
-                "id": "US-ORD-03",
-                "title": "As a customer, I can place an order",
-                "priority": "P0",
-                "dependencies": "US-ORD-01, US-AUTH-05"
-            },
-            {
-                "id": "US-ORD-04",
-                "title": "As a customer, I can view order history",
-                "priority": "P1",
-                "dependencies": "US-ORD-03"
-            },
-            {
-                "id": "US-ORD-05",
-                "title": "As a customer, I can cancel order before restaurant accepts",
-                "priority": "P0",
-                "dependencies": "US-ORD-03"
-            },
-            {
-                "id": "US-ORD-06",
-                "title": "As a customer, I can reorder from history",
-                "priority": "P1",
-                "dependencies": "US-ORD-04"
-            },
-            {
-                "id": "US-ORD-07",
-                "title": "As a restaurant, I can view and accept/reject orders",
-                "priority": "P0",
-                "dependencies": "US-ORD-03"
-            },
-            {
-                "id": "US-ORD-08",
-                "title": "As a restaurant, I can update order status (preparing, ready)",
-                "priority": "P0",
-                "dependencies": "US-ORD-07"
-            }
-        ]
-    },
-    {
-        "title": "Epic 5: Payment Processing",
-        "body": """## Priority: P0
-
-Secure payment processing system.
-
-### Scope
-- COD payment
-- Card payment integration
-- Refund handling
-- Idempotency
-""",
-        "user_stories": [
-            {
-                "id": "US-PAY-01",
-                "title": "As a customer, I can pay with COD",
-                "priority": "P0",
-                "dependencies": "US-ORD-03"
-            },
-            {
-                "id": "US-PAY-02",
-                "title": "As a customer, I can pay with card (Stripe/VNPay)",
-                "priority": "P0",
-                "dependencies": "US-ORD-03, US-AUTH-06"
-            },
-            {
-                "id": "US-PAY-03",
-                "title": "As a system, I handle refunds on cancellation",
-                "priority": "P0",
-                "dependencies": "US-ORD-05"
-            },
-            {
-                "id": "US-PAY-04",
-                "title": "As a system, I prevent double-charges with idempotency",
-                "priority": "P0",
-                "dependencies": "US-PAY-02"
-            }
-        ]
-    },
-    {
-        "title": "Epic 6: Delivery & Tracking",
-        "body": """## Priority: P0
-
-Driver management and real-time order tracking.
-
-### Scope
-- Driver registration
-- Driver status management
-- Delivery task assignment
-- Real-time tracking
-""",
-        "user_stories": [
-            {
-                "id": "US-DEL-01",
-                "title": "As a driver, I can register with documents",
-                "priority": "P0",
-                "dependencies": "US-AUTH-01"
-            },
-            {
-                "id": "US-DEL-02",
-                "title": "As a driver, I can go online/offline",
-                "priority": "P0",
-                "dependencies": "US-DEL-01"
-            },
-            {
-                "id": "US-DEL-03",
-                "title": "As a driver, I can receive and accept delivery tasks",
-                "priority": "P0",
-                "dependencies": "US-DEL-02"
-            },
-            {
-                "id": "US-DEL-04",
-                "title": "As a driver, I can update delivery status",
-                "priority": "P0",
-                "dependencies": "US-DEL-03"
-            },
-            {
-                "id": "US-DEL-05",
-                "title": "As a customer, I can track order status in real-time",
-                "priority": "P0",
-                "dependencies": "US-DEL-04"
-            },
-            {
-                "id": "US-DEL-06",
-                "title": "As a customer, I can see driver location on map",
-                "priority": "P0",
-                "dependencies": "US-DEL-05"
-            },
-            {
-                "id": "US-DEL-07",
-                "title": "As a driver, I can view my earnings",
-                "priority": "P1",
-                "dependencies": "US-DEL-04"
-            }
-        ]
-    },
-    {
-        "title": "Epic 7: Notifications",
-        "body": """## Priority: P0
-
-Notification system for all user types.
-
-### Scope
-- Push notifications
-- SMS notifications
-- Notification preferences
-""",
-        "user_stories": [
-            {
-                "id": "US-NOTIF-01",
-                "title": "As a user, I receive push notifications on status changes",
-                "priority": "P0",
-                "dependencies": "US-ORD-03"
-            },
-            {
-                "id": "US-NOTIF-02",
-                "title": "As a user, I receive SMS for critical events",
-                "priority": "P1",
-                "dependencies": "US-NOTIF-01"
-            }
-        ]
-    },
-    {
-        "title": "Epic 8: Rating & Review",
-        "body": """## Priority: P1
-
-Rating and review system for restaurants and drivers.
-
-### Scope
-- Restaurant ratings
-- Driver ratings
-- Review display
-""",
-        "user_stories": [
-            {
-                "id": "US-RATE-01",
-                "title": "As a customer, I can rate restaurant after delivery",
-                "priority": "P1",
-                "dependencies": "US-ORD-03"
-            },
-            {
-                "id": "US-RATE-02",
-                "title": "As a customer, I can rate driver after delivery",
-                "priority": "P1",
-                "dependencies": "US-DEL-04"
-            }
-        ]
-    },
-    {
-        "title": "Epic 9: Admin Portal",
-        "body": """## Priority: P1
-
-Admin dashboard and management features.
-
-### Scope
-- Dashboard KPIs
-- Restaurant approval
-- Driver approval
-- Coupon management
-""",
-        "user_stories": [
-            {
-                "id": "US-ADM-01",
-                "title": "As an admin, I can view dashboard KPIs",
-                "priority": "P1",
-                "dependencies": "All services"
-            },
-            {
-                "id": "US-ADM-02",
-                "title": "As an admin, I can approve/reject restaurants",
-                "priority": "P0",
-                "dependencies": "US-CAT-01"
-            },
-            {
-                "id": "US-ADM-03",
-                "title": "As an admin, I can approve/reject drivers",
-                "priority": "P0",
-                "dependencies": "US-DEL-01"
-            },
-            {
-                "id": "US-ADM-04",
-                "title": "As an admin, I can manage coupons",
-                "priority": "P1",
-                "dependencies": "US-ORD-02"
-            }
-        ]
-    },
-    {
-        "title": "Epic 10: Dispute Management",
-        "body": """## Priority: P0
-
-Dispute handling system for order issues.
-
-### Scope
-- Dispute creation
-- Photo evidence upload
-- Admin dispute resolution
-""",
-        "user_stories": [
-            {
-                "id": "US-DISPUTE-01",
-                "title": "As a customer, I can create a dispute ticket within 24h of delivery",
-                "priority": "P0",
-                "dependencies": "US-ORD-03"
-            },
-            {
-                "id": "US-DISPUTE-02",
-                "title": "As a customer, I can upload photo evidence for disputes",
-                "priority": "P0",
-                "dependencies": "US-DISPUTE-01"
-            },
-            {
-                "id": "US-DISPUTE-03",
-                "title": "As an admin, I can review and resolve disputes",
-                "priority": "P0",
-                "dependencies": "US-DISPUTE-01"
-            }
-        ]
-    },
-    {
-        "title": "Epic 11: Exception Flows",
-        "body": """## Priority: P0
-
-Exception handling for edge cases in delivery flow.
-
-### Scope
-- Customer unreachable handling
-- Address mismatch handling
-- SLA miss auto-cancellation
-- Emergency reassignment
-""",
-        "user_stories": [
-            {
-                "id": "US-EXC-01",
-                "title": "As a driver, I can mark customer unreachable after 3 call attempts",
-                "priority": "P0",
-                "dependencies": "US-DEL-04"
-            },
-            {
-                "id": "US-EXC-02",
-                "title": "As a driver, I can report address mismatch and request correction",
-                "priority": "P0",
-                "dependencies": "US-DEL-04"
-            },
-            {
-                "id": "US-EXC-03",
-                "title": "As a system, I auto-cancel orders when SLA miss >60min",
-                "priority": "P0",
-                "dependencies": "US-ORD-03"
-            },
-            {
-                "id": "US-EXC-04",
-                "title": "As a driver, I can report emergency and trigger reassignment",
-                "priority": "P1",
-                "dependencies": "US-DEL-03"
-            }
-        ]
-    }
-]
-
-
-# Sprints Data
-SPRINTS = [
-    {
-        "number": 0,
-        "title": "Sprint 0: Foundation",
-        "goal": "Setup infrastructure and development environment",
-        "tasks": [
-            {"id": "INFRA-001", "title": "Setup Git repository with branching strategy", "est": "2h"},
-            {"id": "INFRA-002", "title": "Setup Docker Compose for local development (PostgreSQL, Redis, Kafka)", "est": "4h"},
-            {"id": "INFRA-003", "title": "Create Kubernetes manifests (Helm charts)", "est": "8h"},
-            {"id": "INFRA-004", "title": "Setup CI/CD pipeline (GitHub Actions → Docker Hub → AWS)", "est": "8h"},
-            {"id": "INFRA-005", "title": "Database migration framework setup (golang-migrate)", "est": "4h"},
-            {"id": "INFRA-006", "title": "Create base project structure for microservices", "est": "6h"},
-            {"id": "INFRA-007", "title": "Setup API Gateway (Nginx/Envoy) with basic routing", "est": "6h"},
-            {"id": "INFRA-008", "title": "Configure observability stack (Prometheus, Grafana, ELK)", "est": "8h"},
-            {"id": "INFRA-009", "title": "Create shared Go libraries (logging, errors, middleware)", "est": "8h"},
-            {"id": "INFRA-010", "title": "Setup JWKS endpoint for JWT RS256 verification", "est": "4h"},
-            {"id": "SEC-001", "title": "Security headers middleware (X-Content-Type-Options, HSTS, CSP)", "est": "4h"},
-            {"id": "INFRA-011", "title": "Audit logging infrastructure setup", "est": "4h"},
-            {"id": "INFRA-012", "title": "Redis Pub/Sub verification for WebSocket scaling", "est": "4h"},
-            {"id": "DB-000", "title": "Create `cities` and `audit_logs` base tables", "est": "3h"},
-            {"id": "[Front]-001", "title": "Setup React Native monorepo (Customer, Restaurant, Driver apps)", "est": "8h"},
-            {"id": "[Front]-002", "title": "Setup React Admin Dashboard project with Vite", "est": "4h"},
-            {"id": "[Front]-003", "title": "Configure shared component library (design tokens, themes)", "est": "6h"},
-            {"id": "[Front]-004", "title": "Setup navigation structure for all mobile apps", "est": "6h"},
-            {"id": "[Front]-005", "title": "Configure API client with Axios/React Query + interceptors", "est": "4h"},
-            {"id": "[Front]-006", "title": "Setup CI/CD for mobile builds (EAS Build / Fastlane)", "est": "8h"},
-            {"id": "[Front]-007", "title": "Create base UI components (Button, Input, Card, Badge)", "est": "8h"},
-        ]
-    },
-    {
-        "number": 1,
-        "title": "Sprint 1: User Service",
-        "goal": "Complete identity and access management",
-        "tasks": [
-            {"id": "DB-001", "title": "Create `users`, `user_addresses`, `user_payment_methods`, `refresh_tokens` tables", "est": "4h"},
-            {"id": "API-001", "title": "POST `/api/v1/auth/register` - Email/phone registration", "est": "8h"},
-            {"id": "API-002", "title": "POST `/api/v1/auth/login` - JWT RS256 token generation", "est": "8h"},
-            {"id": "API-003", "title": "POST `/api/v1/auth/refresh` - Refresh token rotation", "est": "4h"},
-            {"id": "API-004", "title": "CRUD `/api/v1/users/addresses` - Delivery addresses", "est": "6h"},
-            {"id": "API-005", "title": "CRUD `/api/v1/users/payment-methods` - Tokenized payment", "est": "6h"},
-            {"id": "API-006", "title": "POST `/api/v1/auth/password-reset` - Password reset with OTP", "est": "4h"},
-            {"id": "INT-001", "title": "OTP service integration (Twilio SMS)", "est": "4h"},
-            {"id": "INT-002", "title": "Redis integration for JWT blacklist", "est": "4h"},
-            {"id": "TEST-001", "title": "Unit tests for auth logic (80% coverage)", "est": "8h"},
-            {"id": "TEST-002", "title": "Integration tests for auth flow", "est": "4h"},
-            {"id": "[Front]-008", "title": "Customer: Splash + Onboarding screens (4 screens)", "est": "6h"},
-            {"id": "[Front]-009", "title": "Customer: Login screen with form validation", "est": "4h"},
-            {"id": "[Front]-010", "title": "Customer: Registration screen with OTP verification", "est": "6h"},
-            {"id": "[Front]-011", "title": "Customer: Profile screen", "est": "4h"},
-            {"id": "[Front]-012", "title": "Customer: Saved Addresses screen (CRUD)", "est": "6h"},
-            {"id": "[Front]-013", "title": "Customer: Payment Methods screen (tokenized cards)", "est": "6h"},
-            {"id": "[Front]-014", "title": "Restaurant: Login/Registration screens", "est": "4h"},
-            {"id": "[Front]-015", "title": "Driver: Login/Registration screens", "est": "4h"},
-            {"id": "[Front]-016", "title": "Shared: Auth state management (Zustand/Redux)", "est": "4h"},
-            {"id": "[Front]-017", "title": "Shared: Secure token storage (AsyncStorage/SecureStore)", "est": "4h"},
-        ]
-    },
-    {
-        "number": 2,
-        "title": "Sprint 2: Catalog Service",
-        "goal": "Restaurant registration and menu management",
-        "tasks": [
-            {"id": "DB-002", "title": "Create `restaurants`, `menu_categories`, `menu_items`, `menu_item_variants` tables", "est": "4h"},
-            {"id": "API-007", "title": "POST `/api/v1/restaurants` - Restaurant registration", "est": "6h"},
-            {"id": "API-008", "title": "GET `/api/v1/restaurants/{id}` - Restaurant detail", "est": "4h"},
-            {"id": "API-009", "title": "CRUD `/api/v1/restaurants/{id}/menu-categories`", "est": "6h"},
-            {"id": "API-010", "title": "CRUD `/api/v1/restaurants/{id}/menu-items` with variants", "est": "8h"},
-            {"id": "API-011", "title": "PUT `/api/v1/restaurants/{id}/status` - Toggle accepting orders", "est": "3h"},
-            {"id": "API-012", "title": "GET `/api/v1/restaurants/{id}/menu` - Full menu view", "est": "4h"},
-            {"id": "API-013", "title": "Admin restaurant approval endpoints (PENDING → APPROVED/REJECTED)", "est": "6h"},
-            {"id": "INT-003", "title": "S3/MinIO integration for image upload", "est": "6h"},
-            {"id": "CACHE-001", "title": "Redis cache for restaurant/menu data", "est": "4h"},
-            {"id": "TEST-003", "title": "Unit + integration tests", "est": "8h"},
-            {"id": "[Front]-018", "title": "Customer: Home screen with featured restaurants", "est": "8h"},
-            {"id": "[Front]-019", "title": "Customer: Restaurant Detail screen with tabs", "est": "8h"},
-            {"id": "[Front]-020", "title": "Customer: Food Item Detail modal/bottom sheet", "est": "4h"},
-            {"id": "[Front]-021", "title": "Restaurant: Dashboard screen", "est": "6h"},
-            {"id": "[Front]-022", "title": "Restaurant: Menu List screen", "est": "6h"},
-            {"id": "[Front]-023", "title": "Restaurant: Add/Edit Menu Item modal with variants", "est": "8h"},
-            {"id": "[Front]-024", "title": "Restaurant: Category Management modal", "est": "4h"},
-            {"id": "[Front]-025", "title": "Restaurant: Settings screen (toggle accepting orders)", "est": "4h"},
-            {"id": "[Front]-026", "title": "Admin: Restaurant Management screen (approve/reject)", "est": "8h"},
-            {"id": "[Front]-027", "title": "Shared: Image upload component with S3", "est": "4h"},
-        ]
-    },
-    {
-        "number": 3,
-        "title": "Sprint 3: Search Service + Order Part 1",
-        "goal": "Search restaurants and cart management",
-        "tasks": [
-            {"id": "DB-003", "title": "Create `coupons`, `coupon_usages` tables", "est": "3h"},
-            {"id": "API-014", "title": "GET `/api/v1/restaurants` - Geo-search with filters", "est": "10h"},
-            {"id": "API-015", "title": "GET `/api/v1/search` - Full-text search", "est": "6h"},
-            {"id": "CACHE-002", "title": "Redis caching for search results", "est": "4h"},
-            {"id": "API-016", "title": "Cart management (in-memory/Redis per user)", "est": "8h"},
-            {"id": "API-017", "title": "POST `/api/v1/coupons/validate` - Coupon validation", "est": "6h"},
-            {"id": "API-018", "title": "Pricing engine (subtotal + tax + delivery fee - discount)", "est": "6h"},
-            {"id": "INDEX-001", "title": "PostgreSQL GiST index for geo-queries", "est": "4h"},
-            {"id": "TEST-004", "title": "Unit + integration tests", "est": "8h"},
-            {"id": "[Front]-028", "title": "Customer: Search screen with autocomplete", "est": "6h"},
-            {"id": "[Front]-029", "title": "Customer: Search Results with filters (distance, rating, open)", "est": "8h"},
-            {"id": "[Front]-030", "title": "Customer: Filter Modal", "est": "4h"},
-            {"id": "[Front]-031", "title": "Customer: Category View screen", "est": "4h"},
-            {"id": "[Front]-032", "title": "Customer: Cart screen with item management", "est": "8h"},
-            {"id": "[Front]-033", "title": "Customer: Coupon input + validation UI", "est": "4h"},
-            {"id": "[Front]-034", "title": "Customer: Pricing breakdown component", "est": "3h"},
-            {"id": "[Front]-035", "title": "Shared: Map integration (Google Maps / Mapbox)", "est": "8h"},
-        ]
-    },
-    {
-        "number": 4,
-        "title": "Sprint 4: Order Part 2 + Payment Service",
-        "goal": "Complete order placement and payment processing",
-        "tasks": [
-            {"id": "DB-004", "title": "Create `orders`, `order_items`, `order_item_variants`, `payments`, `payment_refunds` tables", "est": "6h"},
-            {"id": "API-019", "title": "POST `/api/v1/orders` - Create order with validation", "est": "12h"},
-            {"id": "API-020", "title": "Order state machine implementation", "est": "8h"},
-            {"id": "API-021", "title": "PUT `/api/v1/orders/{id}/cancel` - Cancellation with refund", "est": "6h"},
-            {"id": "API-022", "title": "POST `/api/v1/payments/authorize` - Payment authorization", "est": "8h"},
-            {"id": "API-023", "title": "POST `/api/v1/payments/{id}/capture` - Payment capture", "est": "6h"},
-            {"id": "API-024", "title": "POST `/api/v1/payments/{id}/refund` - Refund processing", "est": "6h"},
-            {"id": "INT-004", "title": "Stripe/VNPay gateway integration", "est": "12h"},
-            {"id": "INT-005", "title": "Idempotency key implementation", "est": "4h"},
-            {"id": "KAFKA-001", "title": "Kafka producer for order events", "est": "6h"},
-            {"id": "KAFKA-002", "title": "Kafka consumer stubs for notification events", "est": "4h"},
-            {"id": "TEST-005", "title": "Payment idempotency tests (critical)", "est": "8h"},
-            {"id": "[Front]-036", "title": "Customer: Checkout Step 1 - Delivery address selection", "est": "6h"},
-            {"id": "[Front]-037", "title": "Customer: Checkout Step 2 - Payment method selection", "est": "6h"},
-            {"id": "[Front]-038", "title": "Customer: Checkout Step 3 - Order review + place order", "est": "6h"},
-            {"id": "[Front]-039", "title": "Customer: Order Confirmation screen", "est": "4h"},
-            {"id": "[Front]-040", "title": "Customer: Order History screen", "est": "6h"},
-            {"id": "[Front]-041", "title": "Customer: Order Detail screen", "est": "4h"},
-            {"id": "[Front]-042", "title": "Restaurant: Incoming Orders screen with accept/reject", "est": "8h"},
-            {"id": "[Front]-043", "title": "Restaurant: Order Detail (restaurant view)", "est": "4h"},
-            {"id": "[Front]-044", "title": "Restaurant: Preparing Orders screen with status updates", "est": "6h"},
-            {"id": "[Front]-045", "title": "Shared: Stripe/VNPay payment integration", "est": "8h"},
-        ]
-    },
-    {
-        "number": 5,
-        "title": "Sprint 5: Delivery Service + WebSocket",
-        "goal": "Driver management and real-time tracking",
-        "tasks": [
-            {"id": "DB-005", "title": "Create `drivers`, `delivery_tasks`, `delivery_task_events`, `driver_location_history` tables", "est": "6h"},
-            {"id": "DB-006", "title": "Configure `driver_location_history` table partitioning for performance", "est": "4h"},
-            {"id": "API-025", "title": "POST `/api/v1/drivers/register` - Driver registration", "est": "6h"},
-            {"id": "API-026", "title": "PUT `/api/v1/drivers/{id}/status` - Online/offline toggle", "est": "4h"},
-            {"id": "API-027", "title": "Driver assignment algorithm (nearest available)", "est": "10h"},
-            {"id": "API-028", "title": "PUT `/api/v1/delivery-tasks/{id}/status` - Status updates", "est": "6h"},
-            {"id": "API-029", "title": "PUT `/api/v1/drivers/{id}/location` - GPS location updates (every 5s)", "est": "4h"},
-            {"id": "API-030", "title": "Admin driver approval endpoints (PENDING → APPROVED/REJECTED)", "est": "6h"},
-            {"id": "WS-001", "title": "WebSocket gateway setup (gorilla/websocket)", "est": "10h"},
-            {"id": "WS-002", "title": "Order status subscription (order:{id} channel)", "est": "6h"},
-            {"id": "WS-003", "title": "Driver location subscription (driver:location:{id})", "est": "6h"},
-            {"id": "INT-006", "title": "Redis Pub/Sub for WebSocket scaling", "est": "6h"},
-            {"id": "API-031", "title": "Restaurant order management (accept/reject, status update)", "est": "8h"},
-            {"id": "TEST-006", "title": "WebSocket integration tests", "est": "6h"},
-            {"id": "[Front]-046", "title": "Customer: Order Tracking - Live Map screen", "est": "10h"},
-            {"id": "[Front]-047", "title": "Customer: WebSocket integration for real-time updates", "est": "6h"},
-            {"id": "[Front]-048", "title": "Driver: Home screen (Online/Offline toggle)", "est": "6h"},
-            {"id": "[Front]-049", "title": "Driver: Available Deliveries list", "est": "4h"},
-            {"id": "[Front]-050", "title": "Driver: Active Delivery - Pickup screen with navigation", "est": "8h"},
-            {"id": "[Front]-051", "title": "Driver: Active Delivery - Dropoff screen", "est": "6h"},
-            {"id": "[Front]-052", "title": "Driver: Delivery Complete screen", "est": "3h"},
-            {"id": "[Front]-053", "title": "Driver: GPS location tracking service (background)", "est": "8h"},
-            {"id": "[Front]-054", "title": "Driver: WebSocket integration for task assignment", "est": "6h"},
-            {"id": "[Front]-055", "title": "Admin: Driver Management screen (approve/reject)", "est": "6h"},
-        ]
-    },
-    {
-        "number": 6,
-        "title": "Sprint 6: Notifications + Saga + Exception Flows",
-        "goal": "Push notifications, distributed transaction handling, and exception flows",
-        "tasks": [
-            {"id": "DB-007", "title": "Create `disputes` table", "est": "3h"},
-            {"id": "API-032", "title": "Notification service setup", "est": "6h"},
-            {"id": "API-033", "title": "Notification preference APIs", "est": "4h"},
-            {"id": "INT-007", "title": "FCM integration for push notifications", "est": "8h"},
-            {"id": "INT-008", "title": "Twilio SMS integration", "est": "4h"},
-            {"id": "KAFKA-003", "title": "Kafka consumers for notification events", "est": "8h"},
-            {"id": "SAGA-001", "title": "Order creation saga implementation", "est": "12h"},
-            {"id": "SAGA-002", "title": "Compensation handlers for each saga step", "est": "10h"},
-            {"id": "EXC-001", "title": "FR-ORD-11: Customer unreachable flow (mark after 3 attempts)", "est": "6h"},
-            {"id": "EXC-002", "title": "FR-ORD-12: Address correction flow (driver reports mismatch)", "est": "6h"},
-            {"id": "EXC-003", "title": "FR-ORD-14: SLA miss auto-cancellation scheduler (>60min)", "est": "6h"},
-            {"id": "EXC-004", "title": "FR-DEL-10: Driver emergency and reassignment flow", "est": "6h"},
-            {"id": "API-034", "title": "POST `/api/v1/disputes` - Create dispute ticket", "est": "6h"},
-            {"id": "API-035", "title": "GET `/api/v1/disputes` - List user disputes", "est": "4h"},
-            {"id": "TEST-007", "title": "Saga compensation tests", "est": "8h"},
-            {"id": "[Front]-056", "title": "Customer: Push notification integration (FCM)", "est": "6h"},
-            {"id": "[Front]-057", "title": "Customer: Notification Settings screen", "est": "3h"},
-            {"id": "[Front]-058", "title": "Customer: Create Dispute screen with photo upload", "est": "6h"},
-            {"id": "[Front]-059", "title": "Driver: Push notification for new delivery tasks", "est": "4h"},
-            {"id": "[Front]-060", "title": "Driver: Customer unreachable flow UI (3 call attempts)", "est": "4h"},
-            {"id": "[Front]-061", "title": "Driver: Address mismatch report modal", "est": "3h"},
-            {"id": "[Front]-062", "title": "Driver: Emergency report flow", "est": "3h"},
-            {"id": "[Front]-063", "title": "Restaurant: Push notification for new orders", "est": "4h"},
-            {"id": "[Front]-064", "title": "Admin: Dispute Management screen", "est": "6h"},
-        ]
-    },
-    {
-        "number": 7,
-        "title": "Sprint 7: Rating + Admin + Disputes + Polish",
-        "goal": "Rating system, admin dashboard, dispute resolution, bug fixes",
-        "tasks": [
-            {"id": "DB-008", "title": "Create `ratings` table", "est": "3h"},
-            {"id": "API-036", "title": "POST `/api/v1/restaurants/{id}/ratings`", "est": "4h"},
-            {"id": "API-037", "title": "POST `/api/v1/drivers/{id}/ratings`", "est": "4h"},
-            {"id": "API-038", "title": "Aggregate rating calculation", "est": "4h"},
-            {"id": "API-039", "title": "GET `/api/v1/admin/dashboard` - KPI metrics", "est": "8h"},
-            {"id": "API-040", "title": "PUT `/api/v1/disputes/{id}/resolve` - Admin resolution", "est": "6h"},
-            {"id": "API-041", "title": "Admin coupon management APIs", "est": "6h"},
-            {"id": "API-042", "title": "Dispute metrics in admin dashboard", "est": "4h"},
-            {"id": "SEC-002", "title": "Security headers implementation verification", "est": "4h"},
-            {"id": "SEC-003", "title": "Rate limiting configuration", "est": "4h"},
-            {"id": "OPS-001", "title": "Monitoring dashboards (Grafana)", "est": "8h"},
-            {"id": "OPS-002", "title": "Alerting rules (P0 incidents)", "est": "4h"},
-            {"id": "BUG-XXX", "title": "Bug fixes and performance optimization", "est": "16h"},
-            {"id": "TEST-008", "title": "E2E tests for critical paths", "est": "12h"},
-            {"id": "[Front]-065", "title": "Customer: Rate Order modal (restaurant + driver)", "est": "6h"},
-            {"id": "[Front]-066", "title": "Customer: Restaurant Reviews Tab", "est": "4h"},
-            {"id": "[Front]-067", "title": "Driver: Driver Profile screen", "est": "4h"},
-            {"id": "[Front]-068", "title": "Driver: Delivery History + Earnings screen", "est": "6h"},
-            {"id": "[Front]-069", "title": "Restaurant: Analytics View screen", "est": "6h"},
-            {"id": "[Front]-070", "title": "Restaurant: Order History screen", "est": "4h"},
-            {"id": "[Front]-071", "title": "Admin: Dashboard screen with KPIs", "est": "8h"},
-            {"id": "[Front]-072", "title": "Admin: User Management screen", "est": "6h"},
-            {"id": "[Front]-073", "title": "Admin: Order Management screen", "est": "6h"},
-            {"id": "[Front]-074", "title": "Admin: Payment Management screen", "est": "4h"},
-            {"id": "[Front]-075", "title": "Admin: Coupon Management screen", "est": "6h"},
-            {"id": "[Front]-076", "title": "All Apps: Bug fixes and UI polish", "est": "16h"},
-        ]
-    },
-    {
-        "number": 8,
-        "title": "Sprint 8: Integration Testing + UAT + Launch Prep",
-        "goal": "Final testing, security audit, production deployment",
-        "tasks": [
-            {"id": "TEST-009", "title": "Full E2E testing of all user journeys", "est": "16h"},
-            {"id": "TEST-010", "title": "Load testing (target: 5k concurrent users)", "est": "12h"},
-            {"id": "SEC-004", "title": "Security penetration testing", "est": "12h"},
-            {"id": "PERF-001", "title": "Performance optimization based on test results", "est": "12h"},
-            {"id": "OPS-003", "title": "Production environment setup (AWS EKS)", "est": "8h"},
-            {"id": "OPS-004", "title": "Database migration to production", "est": "4h"},
-            {"id": "OPS-005", "title": "SSL/TLS certificate setup", "est": "2h"},
-            {"id": "OPS-006", "title": "DNS configuration", "est": "2h"},
-            {"id": "OPS-007", "title": "Monitoring and alerting verification", "est": "4h"},
-            {"id": "DOC-001", "title": "Runbook documentation", "est": "8h"},
-            {"id": "OPS-008", "title": "On-call rotation setup", "est": "2h"},
-            {"id": "LAUNCH-01", "title": "Go-live checklist completion", "est": "4h"},
-            {"id": "[Front]-077", "title": "Admin: Revenue Reports screen", "est": "6h"},
-            {"id": "[Front]-078", "title": "Admin: Performance Reports screen", "est": "4h"},
-            {"id": "[Front]-079", "title": "Admin: User Analytics screen", "est": "4h"},
-            {"id": "[Front]-080", "title": "All Apps: E2E testing with Detox (mobile) / Cypress (web)", "est": "16h"},
-            {"id": "[Front]-081", "title": "All Apps: Accessibility audit and fixes", "est": "8h"},
-            {"id": "[Front]-082", "title": "Mobile: App Store / Play Store submission preparation", "est": "8h"},
-            {"id": "[Front]-083", "title": "Admin: Production deployment (Vercel/AWS)", "est": "4h"},
-            {"id": "[Front]-084", "title": "All Apps: Performance optimization", "est": "8h"},
-        ]
-    }
-]
+def close_issues(session: GitHubSession, issues: List[Dict], workers: int = 1) -> Dict[int, str]:
+    """Close issues ({"id": ..., "number": ...}) as not planned; return the errors of those left open, by index.
 
+    Every RELATION_BATCH_SIZE issues go out as one alias-batched closeIssue
+    document, or as one REST update each when the GraphQL budget is the
+    scarcer one.
+    """
+    def close_chunk(indexes: List[int]) -> Dict[int, str]:
+        if session.route("close", {"graphql": 1, "core": len(indexes)}) == "graphql":
+            failed = mutate_batched(
+                session, "closeIssue", "CloseIssueInput",
+                [{"issueId": issues[index]["id"], "stateReason": "NOT_PLANNED"} for index in indexes],
+                RELATION_BATCH_SIZE
+            )
+            return {indexes[n]: error for n, error in failed.items()}
+        failed = {}
+        for index in indexes:
+            try:
+                with METRICS.timer("close"):
+                    session.transport.rest("PATCH", f"repos/{session.full_name}/issues/{issues[index]['number']}",
+                                           {"state": "closed", "state_reason": "not_planned"})
+            except GitHubError as e:
+                failed[index] = str(e)
+        return failed
+    
+    failed: Dict[int, str] = {}
+    for part in run_concurrently(close_chunk, chunked(range(len(issues)), RELATION_BATCH_SIZE), workers):
+        failed.update(part)
+    return failed
 
-def main():
-    """Main function to create GitHub project structure."""
+
+def delete_labels(session: GitHubSession, names: List[str], workers: int = 1) -> int:
+    """Delete the named labels that exist in the repository, concurrently; return how many were deleted."""
+    existing = {}
+    with METRICS.timer("fetch"):
+        for label in list_labels(session):
+            existing[label["name"].lower()] = label["name"]
+    present = [existing[name.lower()] for name in names if name.lower() in existing]
+    
+    def delete_label(name: str) -> bool:
+        try:
+            with METRICS.timer("label"):
+                session.transport.rest("DELETE", f"repos/{session.full_name}/labels/{quote(name)}")
+        except GitHubError as e:
+            print(f"{RED}✗ Failed to delete label {name}: {e}{RESET}")
+            return False
+        print(f"{GREEN}✓ Deleted label: {name}{RESET}")
+        return True
+    
+    return sum(run_concurrently(delete_label, present, workers))
+
+
+def delete_milestones(session: GitHubSession, titles: List[str], workers: int = 1) -> int:
+    """Delete the repository's milestones titled like titles, concurrently; return how many were deleted."""
+    with METRICS.timer("fetch"):
+        present = [milestone for milestone in session.transport.paginate(f"repos/{session.full_name}/milestones?state=all")
+                   if milestone["title"] in titles]
+    
+    def delete_milestone(milestone: Dict) -> bool:
+        try:
+            with METRICS.timer("milestone"):
+                session.transport.rest("DELETE", f"repos/{session.full_name}/milestones/{milestone['number']}")
+        except GitHubError as e:
+            print(f"{RED}✗ Failed to delete milestone {milestone['title']}: {e}{RESET}")
+            return False
+        print(f"{GREEN}✓ Deleted milestone: {milestone['title']}{RESET}")
+        return True
+    
+    return sum(run_concurrently(delete_milestone, present, workers))
+
+
+def delete_project(session: GitHubSession, title: str) -> Optional[Project]:
+    """Delete the owner's open Projects v2 board titled title; return it, or None if there was none."""
+    _, project = find_project(session, title)
+    if project is None:
+        return None
+    failed = mutate_batched(session, "deleteProjectV2", "DeleteProjectV2Input", [{"projectId": project.id}])
+    if failed:
+        raise GitHubError(f"Deleting project #{project.number} failed: {failed[0]}")
+    return project
+
+
+def teardown(session: GitHubSession, args: argparse.Namespace, journal: RunJournal, plan: Plan):
+    """Remove what a seed created, so the plan can be seeded again from scratch.
+
+    Issues are matched like sync does: by the plan ID prefix of their title,
+    and only if they also carry one of the plan's labels, so hand-written
+    issues that merely share a prefix are left alone. They are closed as not
+    planned (or deleted with --delete) in alias-batched mutations paced by
+    the rate governor, closing over REST instead while GraphQL is the
+    scarcer budget. --remove-labels, --remove-milestones and --remove-project
+    also delete the plan's labels, its sprint milestones and the project
+    board. The repository's journal entries are dropped, except for issues
+    that could not be removed.
+    """
+    session.stage = "fetch"
+    print(f"\n{BLUE}Fetching existing issues...{RESET}")
+    planned_ids = {plan_id(entry.spec().title): entry.key for entry in plan_entries(plan)}
+    plan_labels = {label.lower() for labels in plan_label_usage(plan) for label in labels}
+    targets: List[Dict] = []
+    fetched = 0
+    for node in list_issues(session):
+        fetched += 1
+        if args.delete or node["state"] != "CLOSED":
+            labels = {label["name"].lower() for label in node["labels"]["nodes"]}
+            if plan_id(node["title"]) in planned_ids and labels & plan_labels:
+                key = planned_ids[plan_id(node["title"])]
+                targets.append({"id": node["id"], "number": node["number"], "key": key})
+    action = "delete" if args.delete else "close"
+    extras = [what for what, wanted in (("the plan's labels", args.remove_labels),
+                                        ("the sprint milestones", args.remove_milestones),
+                                        (f"the '{PROJECT_TITLE}' project", args.remove_project)) if wanted]
+    print(f"{GREEN}✓ Fetched {fetched} issue(s), {len(targets)} to {action}{RESET}")
+    
+    if not args.yes and not args.dry_run and (targets or extras):
+        question = f"{action.capitalize()} {len(targets)} issue(s)"
+        question += f" and remove {' and '.join(extras)}" if extras else ""
+        if not confirm(f"{question} in {session.full_name}?"):
+            print(f"{YELLOW}Teardown cancelled; nothing was changed.{RESET}")
+            sys.exit(1)
+    
+    failed: Dict[int, str] = {}
+    if targets:
+        session.stage = action
+        print(f"\n{BLUE}{'Deleting' if args.delete else 'Closing'} {len(targets)} issue(s)...{RESET}")
+        if args.delete:
+            inputs = [{"issueId": node["id"]} for node in targets]
+            failed = mutate_batched(session, "deleteIssue", "DeleteIssueInput", inputs, RELATION_BATCH_SIZE, args.workers)
+        else:
+            failed = close_issues(session, targets, args.workers)
+        for index, error in sorted(failed.items()):
+            print(f"{RED}✗ Failed to {action} #{targets[index]['number']}: {error}{RESET}")
+    journal.forget(keep=[targets[index]["key"] for index in failed])
+    
+    labels_removed = 0
+    if args.remove_labels:
+        session.stage = "labels"
+        print(f"\n{BLUE}Removing labels...{RESET}")
+        labels_removed = delete_labels(session, sorted(plan_labels), args.workers)
+    
+    milestones_removed = 0
+    if args.remove_milestones:
+        session.stage = "milestones"
+        print(f"\n{BLUE}Removing sprint milestones...{RESET}")
+        milestones_removed = delete_milestones(session, [sprint["title"] for sprint in plan.sprints], args.workers)
+    
+    project = None
+    if args.remove_project:
+        session.stage = "project"
+        print(f"\n{BLUE}Removing project...{RESET}")
+        project = delete_project(session, PROJECT_TITLE)
+        if project is None:
+            print(f"{YELLOW}⚠ No open project titled '{PROJECT_TITLE}' found{RESET}")
+    
+    print(f"\n{GREEN}{'='*60}{RESET}")
+    print(f"{GREEN}✓ Teardown Complete!{RESET}")
+    print(f"  {GREEN}✓ Issues {'deleted' if args.delete else 'closed'}: {len(targets) - len(failed)}/{len(targets)}{RESET}")
+    if args.remove_labels:
+        print(f"  {GREEN}✓ Labels removed: {labels_removed}{RESET}")
+    if args.remove_milestones:
+        print(f"  {GREEN}✓ Milestones removed: {milestones_removed}{RESET}")
+    if project:
+        print(f"  {GREEN}✓ Project removed: #{project.number} ({project.url}){RESET}")
+    print(f"{GREEN}{'='*60}{RESET}\n")
+
+
+def next_monday() -> str:
+    """Return the date of the coming Monday as YYYY-MM-DD."""
+    today = datetime.now()
+    return (today + timedelta(days=7 - today.weekday())).strftime("%Y-%m-%d")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Create the MVP GitHub project structure.")
+    parser.add_argument(
+        "command", nargs="?", choices=["seed", "sync", "teardown", "validate"], default="seed",
+        help="seed: create the whole plan (default); sync: create, update and re-link "
+             "only what differs from the existing issues; teardown: close the plan's "
+             "issues again; validate: parse the plan document and check it without "
+             "contacting GitHub"
+    )
+    parser.add_argument(
+        "--plan-file", default=DEFAULT_PLAN_FILE, metavar="PATH",
+        help="Sprint plan document to seed from (default: docs/MVP_Sprint_Plan_with_Review.md)"
+    )
+    parser.add_argument(
+        "--plan-cache", default=DEFAULT_PLAN_CACHE, metavar="PATH",
+        help=f"Compiled plan cache, reused while the document is unchanged (default: {DEFAULT_PLAN_CACHE})"
+    )
+    parser.add_argument(
+        "--no-plan-cache", action="store_true",
+        help="Always parse the plan document and do not write the cache"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of issues to create in parallel (default: 1, sequential)"
+    )
+    parser.add_argument(
+        "--write-rate", type=float, default=80.0, metavar="PER_MINUTE",
+        help="Maximum content-creating writes per minute across all workers (default: 80, "
+             "GitHub's secondary limit)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=0, metavar="K",
+        help="Create issues K at a time with alias-batched GraphQL mutations "
+             "(default: 0, one call per issue over REST or GraphQL, whichever budget has more headroom)"
+    )
+    parser.add_argument(
+        "--max-retries", type=int, default=4, metavar="N",
+        help="Times a call failing with a server, network or rate-limit error is retried, with "
+             "exponential backoff (default: 4)"
+    )
+    parser.add_argument(
+        "--dry-run", "--plan", dest="dry_run", action="store_true",
+        help="Walk the plan through the pipeline without contacting GitHub and print "
+             "the estimated API calls, writes and run time per stage"
+    )
+    parser.add_argument(
+        "--journal", default=DEFAULT_JOURNAL, metavar="PATH",
+        help=f"Run journal used to resume interrupted runs without duplicates (default: {DEFAULT_JOURNAL})"
+    )
+    parser.add_argument(
+        "--no-journal", action="store_true",
+        help="Do not read or write the run journal"
+    )
+    parser.add_argument(
+        "--transport", choices=["gh", "http"], default="gh",
+        help="How to reach the GitHub API: spawn the gh CLI per call, or use a pooled "
+             "keep-alive HTTP session (default: gh)"
+    )
+    parser.add_argument(
+        "--no-project", action="store_true",
+        help=f"Do not create or fill the '{PROJECT_TITLE}' Projects v2 board"
+    )
+    parser.add_argument(
+        "--sprint-start", default=next_monday(), metavar="YYYY-MM-DD",
+        help="Start date of Sprint 0 when the project's Sprint iterations are created "
+             "(default: next Monday)"
+    )
+    parser.add_argument(
+        "--sprint-mode", choices=["issues", "milestones"], default="issues",
+        help="With seed, sync or teardown --reseed, track sprints as issues with their tasks as sub-issues (default), "
+             "or as repository milestones due at the end of each sprint, set on each task as it is "
+             "created so tasks need no link call"
+    )
+    parser.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="Multiplex every gh process (asyncio subprocesses) or HTTP request (httpx) on one "
+             "asyncio event loop instead of blocking a thread per call"
+    )
+    parser.add_argument(
+        "--max-in-flight", type=int, default=32, metavar="N",
+        help="With --async, the most calls each pipeline stage may have in flight; this, not "
+             "--workers, bounds the concurrency (default: 32)"
+    )
+    parser.add_argument(
+        "--repo", metavar="OWNER/NAME",
+        help="Target repository (default: the repository of the current directory)"
+    )
+    parser.add_argument(
+        "--repo-map", metavar="PATH",
+        help='Seed several repositories at once: a JSON object mapping plan IDs ("Epic 3", "Sprint 2") '
+             'to OWNER/NAME, plus an optional "default" (else --repo) for everything unmapped. '
+             "An EPIC takes its user stories and a sprint its tasks along"
+    )
+    parser.add_argument(
+        "--delete", action="store_true",
+        help="With teardown, delete the plan's issues instead of closing them as not planned "
+             "(needs admin rights on the repository)"
+    )
+    parser.add_argument(
+        "--remove-labels", action="store_true",
+        help="With teardown, also delete the labels the plan uses"
+    )
+    parser.add_argument(
+        "--remove-project", action="store_true",
+        help=f"With teardown, also delete the '{PROJECT_TITLE}' project board"
+    )
+    parser.add_argument(
+        "--remove-milestones", action="store_true",
+        help="With teardown, also delete the milestones named like the plan's sprints"
+    )
+    parser.add_argument(
+        "--reseed", action="store_true",
+        help="With teardown, seed the plan again once the old issues are gone"
+    )
+    parser.add_argument(
+        "-y", "--yes", action="store_true",
+        help="With teardown, do not ask for confirmation"
+    )
+    parser.add_argument(
+        "--stats", action="store_true",
+        help="Print a breakdown of calls, retries, rate-limit waits and operation latencies at the end"
+    )
+    parser.add_argument(
+        "--metrics-json", default=DEFAULT_METRICS_JSON, metavar="PATH",
+        help=f"Where to write the run report as JSON (default: {DEFAULT_METRICS_JSON})"
+    )
+    parser.add_argument(
+        "--metrics-textfile", default=DEFAULT_METRICS_TEXTFILE, metavar="PATH",
+        help=f"Where to write the run report in Prometheus text format (default: {DEFAULT_METRICS_TEXTFILE})"
+    )
+    parser.add_argument(
+        "--no-metrics", action="store_true",
+        help="Do not write the run report files"
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.write_rate <= 0:
+        parser.error("--write-rate must be positive")
+    try:
+        datetime.strptime(args.sprint_start, "%Y-%m-%d")
+    except ValueError:
+        parser.error("--sprint-start must look like YYYY-MM-DD")
+    if args.max_in_flight < 1:
+        parser.error("--max-in-flight must be at least 1")
+    if args.batch_size < 0:
+        parser.error("--batch-size must not be negative")
+    if args.max_retries < 0:
+        parser.error("--max-retries must not be negative")
+    if args.repo and "/" not in args.repo:
+        parser.error("--repo must look like OWNER/NAME")
+    if args.repo_map and args.command != "seed":
+        parser.error("--repo-map only works with seed")
+    if args.sprint_mode != "issues" and args.command not in ("seed", "sync") and not args.reseed:
+        parser.error("--sprint-mode only works with seed, sync and teardown --reseed")
+    for flag in ("delete", "remove_labels", "remove_milestones", "remove_project", "reseed", "yes"):
+        if getattr(args, flag) and args.command != "teardown":
+            parser.error(f"--{flag.replace('_', '-')} only works with teardown")
+    return args
+
+
+def run(args: argparse.Namespace, runner: Optional[AsyncRunner] = None):
+    """Run the selected command; with a runner every call goes through its event loop."""
     print(f"{BLUE}{'='*60}{RESET}")
     print(f"{BLUE}GitHub Project MVP Creation Script{RESET}")
     print(f"{BLUE}{'='*60}{RESET}\n")
     
-    # Check if gh CLI is installed
+    # Parse the plan before touching GitHub so a broken document fails fast
     try:
-        run_command(["gh", "--version"])
-    except:
-        print(f"{RED}Error: GitHub CLI (gh) is not installed or not in PATH{RESET}")
-        print(f"{YELLOW}Please install it from: https://cli.github.com/{RESET}")
+        plan = load_plan(args.plan_file, None if args.no_plan_cache else args.plan_cache)
+    except (OSError, ValueError) as e:
+        print(f"{RED}Error: cannot load plan {args.plan_file}: {e}{RESET}")
         sys.exit(1)
+    stories = sum(len(epic["user_stories"]) for epic in plan.epics)
+    tasks = sum(len(sprint["tasks"]) for sprint in plan.sprints)
+    print(f"{BLUE}Plan: {len(plan.epics)} EPICs, {stories} user stories, "
+          f"{len(plan.sprints)} sprints, {tasks} tasks{RESET}")
+    
+    if args.command == "validate":
+        problems = plan_problems(plan)
+        for problem in problems:
+            print(f"{RED}✗ {problem}{RESET}")
+        if problems:
+            sys.exit(1)
+        print(f"{GREEN}✓ Plan is valid{RESET}")
+        return
+    
+    # A repository map splits the plan up front, so a bad map fails before any call too
+    targets: Dict[str, Plan] = {}
+    if args.repo_map:
+        try:
+            targets = split_plan(plan, load_repo_map(args.repo_map), args.repo)
+        except (OSError, ValueError) as e:
+            print(f"{RED}Error: cannot use repository map {args.repo_map}: {e}{RESET}")
+            sys.exit(1)
+        for repo, part in targets.items():
+            print(f"{BLUE}  {repo}: {len(part.epics)} EPIC(s), {len(part.sprints)} sprint(s){RESET}")
+    
+    # The http transport can run without gh given a token and explicit repositories
+    has_env_token = bool(os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN"))
+    if args.dry_run:
+        print(f"{YELLOW}DRY RUN: nothing will be sent to GitHub{RESET}")
+    elif args.transport == "gh" or not ((args.repo or targets) and has_env_token):
+        # Check if gh CLI is installed
+        try:
+            run_command(["gh", "--version"])
+        except:
+            print(f"{RED}Error: GitHub CLI (gh) is not installed or not in PATH{RESET}")
+            print(f"{YELLOW}Please install it from: https://cli.github.com/{RESET}")
+            sys.exit(1)
+        
+        # Check authentication
+        try:
+            run_command(["gh", "auth", "status"])
+        except:
+            print(f"{RED}Error: Not authenticated with GitHub{RESET}")
+            print(f"{YELLOW}Please run: gh auth login{RESET}")
+            sys.exit(1)
+    
+    # Every call goes through one governor, which replaces fixed sleeps, and one retry policy
+    governor = RateGovernor(writes_per_minute=args.write_rate)
+    retry = RetryPolicy(governor, attempts=args.max_retries + 1)
+    session: Optional[GitHubSession] = None
+    
+    def stage() -> str:
+        # A fan-out has a session per repository; their calls share one stage
+        return session.stage if session else "fan-out"
     
-    # Check authentication
+    if args.dry_run:
+        transport = DryRunTransport(args.transport, stage)
+    elif args.transport == "http" and runner:
+        transport = AsyncHttpTransport(get_auth_token(), runner, pool_size=args.max_in_flight,
+                                       governor=governor, retry=retry)
+    elif args.transport == "http":
+        transport = HttpTransport(get_auth_token(), pool_size=max(args.workers, 1), governor=governor, retry=retry)
+    elif runner:
+        transport = AsyncGhTransport(runner, governor, retry)
+    else:
+        transport = GhTransport(governor, retry)
+    
+    if runner:
+        runner.stage = stage
+        # Threads only wait on the loop here, so the stages get one per call the
+        # runner allows in flight and its semaphores, not --workers, set the limit
+        args.workers = max(args.workers, args.max_in_flight)
+    METRICS.run.update(transport=transport.name, workers=args.workers, batch_size=args.batch_size)
     try:
-        run_command(["gh", "auth", "status"])
-    except:
-        print(f"{RED}Error: Not authenticated with GitHub{RESET}")
-        print(f"{YELLOW}Please run: gh auth login{RESET}")
-        sys.exit(1)
+        if targets:
+            print(f"{BLUE}Repositories: {', '.join(targets)} (transport: {transport.name}){RESET}")
+            METRICS.run.update(repos=list(targets))
+            seed_repositories(transport, args, plan, targets)
+        else:
+            # Resolve repository metadata once for the whole run
+            session = GitHubSession(transport, repo=args.repo)
+            print(f"{BLUE}Repository: {session.full_name} (transport: {transport.name}){RESET}")
+            METRICS.run.update(repo=session.full_name)
+            
+            journal = RunJournal(None if args.no_journal or args.dry_run else args.journal, session.full_name)
+            if journal.issues and args.command != "teardown":
+                print(f"{YELLOW}Resuming from {args.journal}: {len(journal.issues)} issue(s) and "
+                      f"{len(journal.links)} link(s) already done{RESET}")
+            try:
+                if args.command == "sync":
+                    sync(session, args, journal, plan)
+                elif args.command == "teardown":
+                    teardown(session, args, journal, plan)
+                    if args.reseed:
+                        seed(session, args, journal, plan, setup_project(session, args, plan))
+                else:
+                    seed(session, args, journal, plan, setup_project(session, args, plan))
+            finally:
+                journal.close()
+    finally:
+        METRICS.run.update(graphql_points=governor.graphql_cost, rate_limit_budgets=governor.budgets)
     
-    # Create project
-    project_title = "Online Food Ordering System MVP"
-    print(f"\n{BLUE}Step 1: Creating GitHub Project...{RESET}")
-    project_id = create_github_project(project_title, "scrum")
-    
-    # Store issue IDs
-    epic_ids = {}
-    us_ids = {}
-    sprint_ids = {}
-    task_ids = {}
-    
-    # Create EPICs
-    print(f"\n{BLUE}Step 2: Creating EPICs ({len(EPICS)} total)...{RESET}")
-    for i, epic in enumerate(EPICS, 1):
-        print(f"{BLUE}[{i}/{len(EPICS)}] Creating EPIC: {epic['title']}{RESET}")
-        epic_id = create_issue(
-            title=epic["title"],
-            body=epic["body"],
-            labels=["epic", "P0" if "P0" in epic["body"] else "P1"]
-        )
-        epic_ids[epic["title"]] = epic_id
-        time.sleep(1)  # Rate limiting
-    
-    # Create User Stories
-    total_us = sum(len(epic["user_stories"]) for epic in EPICS)
-    print(f"\n{BLUE}Step 3: Creating User Stories ({total_us} total)...{RESET}")
-    us_count = 0
-    for epic in EPICS:
-        epic_id = epic_ids[epic["title"]]
-        for us in epic["user_stories"]:
-            us_count += 1
-            print(f"{BLUE}[{us_count}/{total_us}] Creating US: {us['id']}{RESET}")
-            us_body = f"""## {us['id']}
+    if args.dry_run:
+        print_cost_report(transport, args.workers, args.write_rate, governor.burst)
 
-**Priority:** {us['priority']}
-**Dependencies:** {us['dependencies']}
 
-{us['title']}
-"""
-            us_id = create_issue(
-                title=f"{us['id']}: {us['title']}",
-                body=us_body,
-                labels=["user-story", us['priority']]
-            )
-            us_ids[us['id']] = us_id
-            
-            # Link to EPIC
-            if epic_id and us_id:
-                add_sub_issue(epic_id, us_id)
-            
-            time.sleep(1)
-    
-    # Create Sprints
-    print(f"\n{BLUE}Step 4: Creating Sprint Issues ({len(SPRINTS)} total)...{RESET}")
-    for sprint in SPRINTS:
-        print(f"{BLUE}Creating Sprint {sprint['number']}: {sprint['title'].split(': ')[1]}{RESET}")
-        sprint_body = f"""## Sprint {sprint['number']}: {sprint['title'].split(': ')[1]}
+async def main_async(args: argparse.Namespace):
+    """Run the script with every gh process and HTTP request on this event loop.
 
-**Goal:** {sprint['goal']}
+    The pipeline itself runs in a worker thread. On Ctrl-C, new calls are
+    refused while those in flight finish and are journaled, and the pipeline
+    is allowed to unwind, so the journal is closed cleanly before the loop
+    exits.
+    """
+    runner = AsyncRunner(asyncio.get_running_loop(), args.max_in_flight)
+    engine = asyncio.ensure_future(asyncio.to_thread(run, args, runner))
+    try:
+        await asyncio.shield(engine)
+    except asyncio.CancelledError:
+        runner.cancel()
+        try:
+            await engine
+        except BaseException:
+            pass
+        raise
+    finally:
+        await runner.aclose()
 
-### Tasks
-This sprint contains {len(sprint['tasks'])} development tasks.
-"""
-        sprint_id = create_issue(
-            title=sprint['title'],
-            body=sprint_body,
-            labels=["sprint"]
-        )
-        sprint_ids[sprint['number']] = sprint_id
-        time.sleep(1)
-    
-    # Create Tasks
-    total_tasks = sum(len(sprint['tasks']) for sprint in SPRINTS)
-    print(f"\n{BLUE}Step 5: Creating Tasks ({total_tasks} total)...{RESET}")
-    task_count = 0
-    for sprint in SPRINTS:
-        sprint_id = sprint_ids[sprint['number']]
-        for task in sprint['tasks']:
-            task_count += 1
-            if task_count % 10 == 0:
-                print(f"{BLUE}[{task_count}/{total_tasks}] Creating tasks...{RESET}")
-            task_body = f"""## {task['id']}
 
-**Estimate:** {task['est']}
+def finish_metrics(args: argparse.Namespace, status: str):
+    """Write the run report files and print --stats."""
+    METRICS.run.update(command=args.command, status=status)
+    report = METRICS.report()
+    if not args.no_metrics:
+        try:
+            METRICS.write_json(args.metrics_json, report)
+            METRICS.write_textfile(args.metrics_textfile, report)
+        except OSError as e:
+            print(f"{YELLOW}⚠ Could not write the run report: {e}{RESET}")
+    if args.stats:
+        print_metrics(report)
 
-{task['title']}
-"""
-            task_id = create_issue(
-                title=f"{task['id']}: {task['title']}",
-                body=task_body,
-                labels=["task"]
-            )
-            task_ids[task['id']] = task_id
-            
-            # Link to Sprint
-            if sprint_id and task_id:
-                add_sub_issue(sprint_id, task_id)
-            
-            time.sleep(1)
-    
-    # Summary
-    print(f"\n{GREEN}{'='*60}{RESET}")
-    print(f"{GREEN}✓ Creation Complete!{RESET}")
-    print(f"{GREEN}{'='*60}{RESET}")
-    print(f"{GREEN}Summary:{RESET}")
-    print(f"  {GREEN}✓ EPICs created: {len(epic_ids)}/{len(EPICS)}{RESET}")
-    print(f"  {GREEN}✓ User Stories created: {len(us_ids)}/{sum(len(e['user_stories']) for e in EPICS)}{RESET}")
-    print(f"  {GREEN}✓ Sprints created: {len(sprint_ids)}/{len(SPRINTS)}{RESET}")
-    print(f"  {GREEN}✓ Tasks created: {len(task_ids)}/{sum(len(s['tasks']) for s in SPRINTS)}{RESET}")
-    print(f"{GREEN}{'='*60}{RESET}\n")
-    
-    print(f"{YELLOW}Note: Parent-child relationships (sub-issues) may need to be set up manually{RESET}")
-    print(f"{YELLOW}if your GitHub plan doesn't support the sub-issue API feature.{RESET}")
-    print(f"{YELLOW}You can link them manually in the GitHub UI by editing issues.{RESET}\n")
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to create GitHub project structure."""
+    args = parse_args(argv)
+    status = "failed"
+    try:
+        if args.use_async and not args.dry_run and args.command != "validate":
+            asyncio.run(main_async(args))
+        else:
+            run(args)
+        status = "ok"
+    except KeyboardInterrupt:
+        status = "interrupted"
+        resume = "" if args.no_journal or args.dry_run else f" Progress is saved in {args.journal}; rerun to resume."
+        print(f"\n{YELLOW}Interrupted.{resume}{RESET}")
+        sys.exit(130)
+    finally:
+        # A dry run answers offline, so its timings would only overwrite a real report
+        if args.command != "validate" and not args.dry_run:
+            finish_metrics(args, status)
 
 
 if __name__ == "__main__":